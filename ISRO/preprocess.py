@@ -5,7 +5,7 @@ from cosmic_dance.TLEs import *
 
 
 def clean_up(filename: str) -> None:
-    '''Remove nan values and format the date and time
+    '''Remove nan values and write the canonical date and time format
 
     Params
     ------
@@ -17,9 +17,7 @@ def clean_up(filename: str) -> None:
     df = read_CSV(filename)
 
     # For consistent date and time formating
-    df[TLE.EPOCH] = pd.to_datetime(df[TLE.EPOCH])
-
-    export_as_csv(df, filename)
+    write_TLEs_to_CSV(df, filename)
 
 
 if __name__ == "__main__":
@@ -32,6 +30,9 @@ if __name__ == "__main__":
 
     TLE_CSV_DIR = "artifacts/OUTPUT/ISRO/TLEs"
 
+    # Parquet TLE dataset (partitioned by constellation and epoch year)
+    DATASET_DIR = "artifacts/OUTPUT/TLE_dataset"
+
     # ------------------------------------------------------------------
     # INPUT FILE(s)
     # ------------------------------------------------------------------
@@ -63,4 +64,7 @@ if __name__ == "__main__":
 
             clean_up(file_path)
 
+    # Rebuild the dataset from the altered CSV files
+    build_TLE_dataset(TLE_CSV_DIR, DATASET_DIR, "ISRO")
+
     print(f'|\n|- Complete.')
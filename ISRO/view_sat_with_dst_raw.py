@@ -50,6 +50,7 @@ if __name__ == '__main__':
 
     # TLEs and DST files
     TLE_CSV_DIR = "artifacts/OUTPUT/ISRO/TLEs"
+    TLE_DATASET_DIR = "artifacts/OUTPUT/TLE_dataset"
     DST_CSV = "artifacts/DST/Dst_index.csv"
 
     START_DATE = pd.to_datetime("2024-04-01 00:00:00")
@@ -64,14 +65,17 @@ if __name__ == '__main__':
 
     # Reading CSVs
     df_nt = read_dst_index_CSV(DST_CSV)
-    df_tles = get_merged_TLEs_from_all_CSVs(
-        TLE_CSV_DIR,
-        epoch_mixed_format=False
+    # Only the plotted columns within the time window (compact dtypes)
+    df_tles = load_TLEs(
+        TLE_CSV_DIR, TLE_DATASET_DIR, "ISRO",
+        columns=[TLE.NORAD_CAT_ID, TLE.LAUNCH_DATE, TLE.EPOCH, TLE.ALTITUDE_KM, TLE.DRAG],
+        start=START_DATE,
+        end=END_DATE,
+        compact=True
     )
 
     # Filtering
     if START_DATE is not None or END_DATE is not None:
-        df_tles = get_all_TLE_between_two_date(df_tles, START_DATE, END_DATE)
         df_nt = df_nt[df_nt[DST.TIMESTAMP].between(START_DATE, END_DATE)]
 
     for cat_id in get_unique_cat_ids(df_tles):
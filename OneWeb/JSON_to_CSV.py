@@ -1,10 +1,12 @@
-import concurrent.futures
-
 from cosmic_dance.io import *
 from cosmic_dance.TLEs import *
 
+# Process pool over byte size balanced groups of files
 PARALLEL_MODE = False
 
+# Convert only the files that failed in the last run (see REPORT_FILE)
+RETRY_FAILED = False
+
 
 # ------------------------------------------------------------------
 # OUTPUT FILE(s)
@@ -13,6 +15,13 @@ PARALLEL_MODE = False
 # CSV file Directory
 CSV_DIR = "artifacts/OUTPUT/OneWeb/TLEs"
 
+# Parquet TLE dataset (partitioned by constellation and epoch year)
+DATASET_DIR = "artifacts/OUTPUT/TLE_dataset"
+CONSTELLATION = "OneWeb"
+
+# Outcome (STATUS, ERROR, ...) of each JSON file
+REPORT_FILE = "artifacts/OUTPUT/OneWeb/JSON_to_CSV_report.csv"
+
 
 # ------------------------------------------------------------------
 # INPUT FILE(s)
@@ -21,39 +30,24 @@ CSV_DIR = "artifacts/OUTPUT/OneWeb/TLEs"
 # JSON file Directory
 JSON_DIR = "artifacts/OUTPUT/OneWeb/RAW_TLEs"
 
-
 # ------------------------------------------------------------------
 
 
-recreate_directories(CSV_DIR)
-
-_count = 0
-if PARALLEL_MODE:
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-
-        # for each JSON file in input dir
-        for file in get_file_names(JSON_DIR):
-            input_file_path = f"{JSON_DIR}/{file}"
-            output_file_path = f"{CSV_DIR}/{file.split('.')[0]}.csv"
-            _count += 1
-            print(f"|- Processing {file}")
-
-            executor.submit(
-                convert_from_JSON_to_CSV, input_file_path, output_file_path
-            )
-
-        executor.shutdown()
-
-# Serial mode
+if RETRY_FAILED:
+    file_names = failed_conversions(REPORT_FILE)
 else:
+    recreate_directories(CSV_DIR, constellation_dir(DATASET_DIR, CONSTELLATION))
+    if os.path.isfile(REPORT_FILE):
+        remove_file(REPORT_FILE)
+    file_names = get_file_names(JSON_DIR, RAW_TLE_SUFFIXES)
 
-    # for each JSON file in input dir
-    for file in get_file_names(JSON_DIR):
-        input_file_path = f"{JSON_DIR}/{file}"
-        output_file_path = f"{CSV_DIR}/{file.split('.')[0]}.csv"
-        _count += 1
-        print(f"|- Processing {file}")
+df_report = convert_JSON_files(
+    JSON_DIR, file_names, CSV_DIR, DATASET_DIR, CONSTELLATION, PARALLEL_MODE
+)
+df_report = update_conversion_report(df_report, REPORT_FILE)
 
-        convert_from_JSON_to_CSV(input_file_path, output_file_path)
+# Merge the per satellite files of the dataset
+compact_TLE_dataset(DATASET_DIR, CONSTELLATION)
 
-print(f"|\n|- Complete processing {_count} JSON file(s).")
+print(f"|\n|- Complete processing {len(file_names)} JSON file(s), "
+      f"{(df_report['STATUS'] != 'ok').sum()} failed in total.")
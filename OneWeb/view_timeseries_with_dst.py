@@ -91,6 +91,7 @@ if __name__ == '__main__':
 
     # TLEs and DST files
     TLE_CSV_DIR = "artifacts/OUTPUT/OneWeb/TLEs"
+    TLE_DATASET_DIR = "artifacts/OUTPUT/TLE_dataset"
     DST_CSV = "artifacts/DST/Dst_index.csv"
 
     # Start & end time marking interval
@@ -110,11 +111,17 @@ if __name__ == '__main__':
 
     # Reading CSVs
     df_nt = read_dst_index_CSV(DST_CSV)
-    df_tles = get_merged_TLEs_from_all_CSVs(TLE_CSV_DIR)
+    # Only the plotted columns within the time window (compact dtypes)
+    df_tles = load_TLEs(
+        TLE_CSV_DIR, TLE_DATASET_DIR, "OneWeb",
+        columns=[TLE.NORAD_CAT_ID, TLE.LAUNCH_DATE, TLE.EPOCH, TLE.ALTITUDE_KM, TLE.DRAG],
+        start=START_DATE,
+        end=END_DATE,
+        compact=True
+    )
 
     # Filtering
     if START_DATE is not None or END_DATE is not None:
-        df_tles = get_all_TLE_between_two_date(df_tles, START_DATE, END_DATE)
         df_nt = df_nt[df_nt[DST.TIMESTAMP].between(START_DATE, END_DATE)]
 
     if PARALLEL_MODE:
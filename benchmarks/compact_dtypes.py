@@ -0,0 +1,69 @@
+'''Memory report of the compact TLE schema
+
+Loads all TLE CSV files of a directory (the Starlink directory by default,
+synthetic files when it does not exist) in the default and the compact
+schema (COMPACT_DTYPES), prints the memory per column and the largest
+rounding error of every float32 column.
+
+Run from the repository root:
+    PYTHONPATH=. python benchmarks/compact_dtypes.py [TLE_CSV_DIR]
+'''
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from cosmic_dance.io import *
+from cosmic_dance.TLEs import *
+
+TLE_CSV_DIR = "artifacts/OUTPUT/Starlink/TLEs"
+
+
+def synthetic_TLE_files(directory: str, satellites: int = 400, tles: int = 2500):
+    '''TLE CSV files of satellites from ~200 launches with random orbital elements'''
+
+    rng = np.random.default_rng(0)
+    launch_dates = pd.date_range("2019-05-24", periods=200, freq='7D')
+
+    for sat_id in range(satellites):
+        epochs = pd.Timestamp("2020-01-01") + pd.to_timedelta(
+            np.sort(rng.uniform(0, 1500, tles)), unit='D'
+        )
+        mean_motion = 15.06 + rng.normal(0, 0.01, tles)
+        write_TLEs_to_CSV(pd.DataFrame({
+            TLE.NORAD_CAT_ID: 44000 + sat_id,
+            TLE.LAUNCH_DATE: launch_dates[sat_id % len(launch_dates)],
+            TLE.EPOCH: epochs,
+            TLE.INCLINATION: 53 + rng.normal(0, 0.01, tles),
+            TLE.RAAN: rng.uniform(0, 360, tles),
+            TLE.ARGP: rng.uniform(0, 360, tles),
+            TLE.ECCENTRICITY: rng.uniform(0, 0.001, tles),
+            TLE.ALTITUDE_KM: convert_to_km(mean_motion),
+            TLE.MEAN_MOTION: mean_motion,
+            TLE.MEAN_ANOMALY: rng.uniform(0, 360, tles),
+            TLE.DRAG: rng.normal(0, 1e-4, tles),
+        }), f"{directory}/{44000 + sat_id}.csv")
+
+
+if __name__ == "__main__":
+
+    directory_name = sys.argv[1] if len(sys.argv) > 1 else TLE_CSV_DIR
+
+    if not os.path.isdir(directory_name):
+        print(f"No directory {directory_name}, using synthetic TLE files")
+        directory_name = tempfile.mkdtemp()
+        synthetic_TLE_files(directory_name)
+
+    df = get_merged_TLEs_from_all_CSVs(directory_name)
+    df_compact = get_merged_TLEs_from_all_CSVs(directory_name, compact=True)
+
+    print(memory_report(df, df_compact).to_string())
+
+    print("Largest rounding error (float32)")
+    for column, dtype in COMPACT_DTYPES.items():
+        if dtype == "float32" and column in df:
+            error = np.abs(df[column].to_numpy() - df_compact[column].to_numpy(dtype=np.float64))
+            print(f"|- {column}: {error.max():.3g} (relative {np.max(error / np.maximum(np.abs(df[column].to_numpy()), 1e-300)):.3g})")
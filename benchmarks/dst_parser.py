@@ -0,0 +1,101 @@
+'''Benchmark of the WDC Dst parser
+
+Compares `parse_dst_content` against the previous line-by-line parser on the
+monthly files of the Dst cache, or on a synthetic archive when the cache is
+empty, and checks both produce the same DataFrame.
+
+Run from the repository root:
+    PYTHONPATH=. python benchmarks/dst_parser.py [CACHE_DIR]
+'''
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from cosmic_dance.dst_index import *
+from cosmic_dance.io import get_file_names
+
+CACHE_DIR = "artifacts/OUTPUT/DST_cache"
+
+
+def parse_dst_content_reference(contents: list[str]) -> pd.DataFrame:
+    '''Previous parser: one pd.to_datetime call and dict per hourly value'''
+
+    dst_index_records = []
+
+    for content in contents:
+        content = content.split('\n')[:-3]
+
+        for line in content:
+            yy = line[3:5]
+            mm = line[5:7]
+            dd = line[8:10]
+
+            h = 0
+            for index in range(20, 116, 4):
+                date = pd.to_datetime(
+                    f"20{yy}-{mm}-{dd} {str(h).rjust(2, '0')}:00:00"
+                )
+                nT = int(line[index:index+4].strip())
+
+                h += 1
+
+                dst_index_records.append({
+                    DST.TIMESTAMP: date,
+                    DST.NANOTESLA: nT
+                })
+
+    return pd.DataFrame.from_dict(dst_index_records)
+
+
+def synthetic_contents(start_month: str = "2020-01", end_month: str = "2025-03") -> list[str]:
+    '''Monthly WDC files with random hourly values'''
+
+    rng = np.random.default_rng(0)
+    contents = []
+
+    for month in pd.period_range(start_month, end_month, freq='M'):
+        lines = []
+        for day in range(1, month.days_in_month + 1):
+            values = rng.integers(-450, 60, 24)
+            lines.append(
+                f"DST{month.year % 100:02d}{month.month:02d}*{day:02d}RRX020   0"
+                f"{''.join(f'{v:4d}' for v in values)}{int(values.mean()):4d}"
+            )
+        contents.append("\n".join(lines) + "\n\n\n")
+
+    return contents
+
+
+if __name__ == "__main__":
+
+    cache_dir = sys.argv[1] if len(sys.argv) > 1 else CACHE_DIR
+
+    contents = []
+    if os.path.isdir(cache_dir):
+        for name in sorted(get_file_names(cache_dir, ".txt")):
+            with open(f"{cache_dir}/{name}") as f:
+                contents.append(f.read())
+
+    if not contents:
+        print("No cached months, using a synthetic archive")
+        contents = synthetic_contents()
+
+    start = time.perf_counter()
+    vectorized = parse_dst_content(contents)
+    vectorized_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = parse_dst_content_reference(contents)
+    reference_time = time.perf_counter() - start
+
+    # pandas >= 2 may infer a coarser datetime unit from the strings
+    reference[DST.TIMESTAMP] = reference[DST.TIMESTAMP].astype('datetime64[ns]')
+    pd.testing.assert_frame_equal(vectorized, reference)
+
+    print(f"Months: {len(contents)} Hours: {vectorized.shape[0]}")
+    print(f"Reference: {reference_time:.3f}s")
+    print(f"Vectorized: {vectorized_time:.3f}s ({reference_time/vectorized_time:.0f}x)")
@@ -0,0 +1,82 @@
+'''Benchmark of the EPOCH parsing of the TLE CSV files
+
+Compares the previous `pd.to_datetime(..., format='mixed')` parsing against
+`parse_epochs` on the EPOCH column of every CSV file of a TLE directory
+(the Starlink directory by default, synthetic files when it does not exist),
+once as stored and once rewritten in the canonical format (EPOCH_FORMAT),
+and checks all of them give the same timestamps.
+
+Run from the repository root:
+    PYTHONPATH=. python benchmarks/epoch_parsing.py [TLE_CSV_DIR]
+'''
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from cosmic_dance.io import *
+from cosmic_dance.TLEs import *
+
+TLE_CSV_DIR = "artifacts/OUTPUT/Starlink/TLEs"
+
+
+def synthetic_epoch_columns(satellites: int = 200, tles: int = 5000) -> list[pd.Series]:
+    '''EPOCH columns as written before the canonical format: pandas default
+    datetime strings, fractional seconds dropped when zero'''
+
+    rng = np.random.default_rng(0)
+    columns = []
+
+    for _ in range(satellites):
+        epochs = pd.Timestamp("2020-01-01") + pd.to_timedelta(
+            np.sort(rng.uniform(0, 1500, tles)), unit='D'
+        ).floor('us')
+        epochs = epochs.where(rng.uniform(size=tles) < 0.9, epochs.floor('s'))
+        columns.append(pd.Series([str(epoch) for epoch in epochs]))
+
+    return columns
+
+
+def time_parser(columns: list[pd.Series], parser) -> tuple[float, list[pd.Series]]:
+    '''Total seconds to parse all the columns'''
+
+    start = time.perf_counter()
+    parsed = [parser(column) for column in columns]
+    return time.perf_counter() - start, parsed
+
+
+if __name__ == "__main__":
+
+    directory_name = sys.argv[1] if len(sys.argv) > 1 else TLE_CSV_DIR
+
+    if os.path.isdir(directory_name):
+        columns = [
+            read_CSV(f"{directory_name}/{name}")[TLE.EPOCH]
+            for name in get_file_names(directory_name)
+        ]
+    else:
+        print(f"No directory {directory_name}, using synthetic EPOCH columns")
+        columns = synthetic_epoch_columns()
+
+    canonical = [format_epochs(column) for column in columns]
+
+    mixed_time, reference = time_parser(
+        columns, lambda column: pd.to_datetime(column, format='mixed')
+    )
+    stored_time, stored = time_parser(columns, parse_epochs)
+    canonical_time, parsed = time_parser(canonical, parse_epochs)
+
+    for expected, *results in zip(reference, stored, parsed):
+        for result in results:
+            pd.testing.assert_series_equal(
+                result.astype('datetime64[ns]'), expected.astype('datetime64[ns]')
+            )
+
+    print(f"Files: {len(columns)} TLEs: {sum(len(column) for column in columns)}")
+    print(f"|- format='mixed': {mixed_time:.2f}s")
+    print(f"|- parse_epochs (as stored): {stored_time:.2f}s ({mixed_time/stored_time:.1f}x)")
+    print(f"|- parse_epochs (canonical): {canonical_time:.2f}s ({mixed_time/canonical_time:.1f}x)")
@@ -0,0 +1,109 @@
+'''Benchmark of the gp_history JSON to CSV conversion
+
+Compares `convert_from_JSON_to_CSV` (bulk casting, one write per file) against
+the previous per-TLE conversion (build_TLE_record and CSV_logger per row) on
+raw TLE files, or on synthetic files when no directory is given, and checks
+both CSV files hold the same values.
+
+Run from the repository root:
+    PYTHONPATH=. python benchmarks/json_to_csv.py [JSON_DIR] [MAX_FILES]
+'''
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from cosmic_dance.io import *
+from cosmic_dance.TLEs import *
+
+
+def convert_from_JSON_to_CSV_reference(filename: str, output_file: str):
+    '''Previous conversion: cast and append one TLE at a time'''
+
+    for tle in read_JSON_file(filename):
+        CSV_logger(build_TLE_record(tle), output_file)
+
+
+def synthetic_JSON_files(directory: str, satellites: int = 20, tles: int = 5000) -> list[str]:
+    '''gp_history like JSON files with random orbital elements'''
+
+    rng = np.random.default_rng(0)
+    filenames = []
+
+    for sat_id in range(satellites):
+        cat_id = 44000 + sat_id
+        epochs = pd.Timestamp("2020-01-01") + pd.to_timedelta(
+            np.sort(rng.uniform(0, 1500, tles)), unit='D'
+        )
+        records = [{
+            TLE.NORAD_CAT_ID: str(cat_id),
+            TLE.OBJECT_NAME: f"STARLINK-{sat_id}",
+            TLE.LAUNCH_DATE: "2019-11-11",
+            TLE.EPOCH: epoch.strftime('%Y-%m-%dT%H:%M:%S.%f'),
+            TLE.INCLINATION: f"{53 + rng.normal() * 0.01:.4f}",
+            TLE.RA_OF_ASC_NODE: f"{rng.uniform(0, 360):.4f}",
+            TLE.ARG_OF_PERICENTER: f"{rng.uniform(0, 360):.4f}",
+            TLE.ECCENTRICITY: f"{rng.uniform(0, 0.001):.7f}",
+            TLE.MEAN_MOTION: f"{15.06 + rng.normal() * 0.01:.8f}",
+            TLE.MEAN_ANOMALY: f"{rng.uniform(0, 360):.4f}",
+            TLE.BSTAR: f"{rng.normal() * 1e-4:.10f}",
+        } for epoch in epochs]
+
+        filename = f"{directory}/{cat_id}.json"
+        with open(filename, 'w') as f:
+            json.dump(records, f)
+        filenames.append(filename)
+
+    return filenames
+
+
+if __name__ == "__main__":
+
+    work_dir = tempfile.mkdtemp()
+
+    if len(sys.argv) > 1:
+        json_dir = sys.argv[1]
+        max_files = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+        filenames = [
+            f"{json_dir}/{name}"
+            for name in get_file_names(json_dir, RAW_TLE_SUFFIXES)[:max_files]
+        ]
+    else:
+        filenames = synthetic_JSON_files(work_dir)
+
+    reference_total, vectorized_total = 0.0, 0.0
+    for filename in filenames:
+        reference_file = f"{work_dir}/reference.csv"
+        vectorized_file = f"{work_dir}/vectorized.csv"
+
+        start = time.perf_counter()
+        convert_from_JSON_to_CSV_reference(filename, reference_file)
+        reference_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        convert_from_JSON_to_CSV(filename, vectorized_file)
+        vectorized_time = time.perf_counter() - start
+
+        # ALTITUDE_KM differs in the last bits (numpy vs libm pow)
+        pd.testing.assert_frame_equal(
+            pd.read_csv(reference_file), pd.read_csv(vectorized_file), rtol=1e-12
+        )
+        os.remove(reference_file)
+        os.remove(vectorized_file)
+
+        reference_total += reference_time
+        vectorized_total += vectorized_time
+        print(
+            f"|- {os.path.basename(filename)}: {reference_time:.3f}s -> "
+            f"{vectorized_time:.3f}s ({reference_time/vectorized_time:.1f}x)"
+        )
+
+    print(
+        f"Files: {len(filenames)} Reference: {reference_total:.2f}s "
+        f"Vectorized: {vectorized_total:.2f}s ({reference_total/vectorized_total:.1f}x)"
+    )
@@ -1,16 +1,60 @@
+import collections
+import concurrent.futures
+import glob
+import hashlib
+import heapq
 import math
+import os
+import shutil
 import sys
+import threading
 import time
+import warnings
 import json
 import requests
 import ephem
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from cosmic_dance.column_store import *
+from cosmic_dance.dataset import *
 from cosmic_dance.io import *
+from cosmic_dance.manifest import *
+from cosmic_dance.space_track import *
+from cosmic_dance.tle_store import *
 
 G: float = 6.67408 * 10**(-11)
 M: float = 5.9722 * (10**24)
 EARTH_RADIUS_M: float = 6378135.0
-LOGIN_URL = "https://www.space-track.org/ajaxauth/login"
+LOGIN_URL = f"{SPACE_TRACK_URL}/ajaxauth/login"
+
+# Canonical EPOCH representation of the TLE CSV files
+EPOCH_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+# On-disk cache of merged TLE frames (cached_merged_TLEs)
+TLE_CACHE_DIR = "artifacts/CACHE/TLEs"
+TLE_CACHE_MAX_MB = 4096
+
+# Compact in-memory schema of the TLEs (compact_TLEs), float32 keeps 24 bits
+# of mantissa (relative error <= 6e-8):
+#   ALTITUDE_KM ~550 km: <= 3 cm rounding
+#   MEAN_MOTION ~15 rev/day: <= 5e-7 rev/day, i.e., <= 0.15 m of altitude
+#   INCLINATION, RAAN, ARGP, MEAN_ANOMALY (<= 360 deg): <= 1.5e-5 deg
+#   ECCENTRICITY, DRAG (BSTAR): relative 6e-8
+# LAUNCH_DATE is categorical (int8/int16 codes, ~200 launch dates).
+COMPACT_DTYPES: dict[str, str] = {
+    "NORAD_CAT_ID": "int32",
+    "INCLINATION": "float32",
+    "RAAN": "float32",
+    "ARGP": "float32",
+    "ECCENTRICITY": "float32",
+    "ALTITUDE_KM": "float32",
+    "MEAN_MOTION": "float32",
+    "MEAN_ANOMALY": "float32",
+    "DRAG": "float32",
+    "LAUNCH_DATE": "category",
+}
 
 class TLE:
     '''Data attributes for TLEs'''
@@ -36,32 +80,259 @@ class TLE:
     LINE1 = "TLE_LINE1"
     LINE2 = "TLE_LINE2"
 
-def convert_from_JSON_to_CSV(filename: str, output_dir: str):
-    '''Filter the required attributes and write into a CSV file (NORAD_CAT_ID.csv)'''
-    tles = read_JSON_file(filename)
-    for tle in tles:
-        data_dict = {
-            TLE.NORAD_CAT_ID: int(tle[TLE.NORAD_CAT_ID]),
-            TLE.LAUNCH_DATE: tle[TLE.LAUNCH_DATE],
-            TLE.EPOCH: tle[TLE.EPOCH],
-            TLE.INCLINATION: float(tle[TLE.INCLINATION]),
-            TLE.RAAN: float(tle[TLE.RA_OF_ASC_NODE]),
-            TLE.ARGP: float(tle[TLE.ARG_OF_PERICENTER]),
-            TLE.ECCENTRICITY: float(tle[TLE.ECCENTRICITY]),
-            TLE.ALTITUDE_KM: convert_to_km(float(tle[TLE.MEAN_MOTION])),
-            TLE.MEAN_MOTION: float(tle[TLE.MEAN_MOTION]),
-            TLE.MEAN_ANOMALY: float(tle[TLE.MEAN_ANOMALY]),
-            TLE.DRAG: float(tle[TLE.BSTAR]),
-        }
-        CSV_logger(data_dict, output_dir)
-
-def download_satellite(catalog_number: int, credential: dict, start_date: str, end_date: str, output_dir: str) -> bool:
-    """Download TLEs for a single satellite with retry logic"""
+def build_TLE_record(tle: dict[str, str]) -> dict[str, float | int | str]:
+    '''Filter and cast the required attributes of a gp_history TLE'''
+    return {
+        TLE.NORAD_CAT_ID: int(tle[TLE.NORAD_CAT_ID]),
+        TLE.LAUNCH_DATE: tle[TLE.LAUNCH_DATE],
+        TLE.EPOCH: tle[TLE.EPOCH],
+        TLE.INCLINATION: float(tle[TLE.INCLINATION]),
+        TLE.RAAN: float(tle[TLE.RA_OF_ASC_NODE]),
+        TLE.ARGP: float(tle[TLE.ARG_OF_PERICENTER]),
+        TLE.ECCENTRICITY: float(tle[TLE.ECCENTRICITY]),
+        TLE.ALTITUDE_KM: convert_to_km(float(tle[TLE.MEAN_MOTION])),
+        TLE.MEAN_MOTION: float(tle[TLE.MEAN_MOTION]),
+        TLE.MEAN_ANOMALY: float(tle[TLE.MEAN_ANOMALY]),
+        TLE.DRAG: float(tle[TLE.BSTAR]),
+    }
+
+def build_TLE_frame(tles: list[dict[str, str]], creation_date: bool = False) -> pd.DataFrame:
+    '''Filter and cast the required attributes of gp_history TLEs in bulk,
+    same columns and values as build_TLE_record (and CREATION_DATE if asked)
+    with EPOCH in the canonical format (EPOCH_FORMAT)'''
+    df = pd.DataFrame.from_records(tles, columns=[
+        TLE.NORAD_CAT_ID, TLE.LAUNCH_DATE, TLE.EPOCH, TLE.INCLINATION,
+        TLE.RA_OF_ASC_NODE, TLE.ARG_OF_PERICENTER, TLE.ECCENTRICITY,
+        TLE.MEAN_MOTION, TLE.MEAN_ANOMALY, TLE.BSTAR, TLE.CREATION_DATE
+    ])
+    mean_motion = df[TLE.MEAN_MOTION].to_numpy(dtype=np.float64)
+    df_tles = pd.DataFrame({
+        TLE.NORAD_CAT_ID: df[TLE.NORAD_CAT_ID].to_numpy(dtype=np.int64),
+        TLE.LAUNCH_DATE: df[TLE.LAUNCH_DATE],
+        TLE.EPOCH: format_epochs(df[TLE.EPOCH]),
+        TLE.INCLINATION: df[TLE.INCLINATION].to_numpy(dtype=np.float64),
+        TLE.RAAN: df[TLE.RA_OF_ASC_NODE].to_numpy(dtype=np.float64),
+        TLE.ARGP: df[TLE.ARG_OF_PERICENTER].to_numpy(dtype=np.float64),
+        TLE.ECCENTRICITY: df[TLE.ECCENTRICITY].to_numpy(dtype=np.float64),
+        TLE.ALTITUDE_KM: convert_to_km(mean_motion),
+        TLE.MEAN_MOTION: mean_motion,
+        TLE.MEAN_ANOMALY: df[TLE.MEAN_ANOMALY].to_numpy(dtype=np.float64),
+        TLE.DRAG: df[TLE.BSTAR].to_numpy(dtype=np.float64),
+    })
+    if creation_date:
+        df_tles[TLE.CREATION_DATE] = df[TLE.CREATION_DATE]
+    return df_tles
+
+def deduplicate_TLEs(df: pd.DataFrame, keep: str | None = "latest") -> tuple[pd.DataFrame, int]:
+    '''Keep one TLE per (NORAD_CAT_ID, EPOCH) and sort the TLEs by EPOCH
+
+    keep: "latest" or "earliest" CREATION_DATE wins among reissued element
+    sets (ties keep the later/earlier one in the file), None keeps all.
+    The CREATION_DATE column is dropped. Returns the TLEs and the number of
+    dropped TLEs.
+    '''
+    if keep not in ("latest", "earliest", None):
+        raise ValueError(f"Unknown keep policy: {keep}")
+
+    df = df.assign(
+        _EPOCH=parse_epochs(df[TLE.EPOCH]),
+        _CREATED=parse_epochs(df[TLE.CREATION_DATE])
+    ).sort_values(["_EPOCH", "_CREATED"], kind='stable', na_position='first')
+
+    total = len(df)
+    if keep is not None:
+        df = df.drop_duplicates(
+            subset=[TLE.NORAD_CAT_ID, "_EPOCH"],
+            keep='last' if keep == "latest" else 'first'
+        )
+
+    df = df.drop(columns=["_EPOCH", "_CREATED", TLE.CREATION_DATE])
+    return df.reset_index(drop=True), total - len(df)
+
+def convert_from_JSON_to_CSV(filename: str, output_dir: str, dataset_dir: str | None = None, constellation: str | None = None, batch_size: int = 10000, keep: str | None = "latest") -> dict[str, int]:
+    '''Filter the required attributes and write into a CSV file (NORAD_CAT_ID.csv),
+    and into the Parquet dataset if `dataset_dir` is given. The JSON file is
+    streamed in batches of `batch_size` TLEs (only the typed columns are held),
+    reissued TLEs are dropped by the `keep` policy (deduplicate_TLEs) and the
+    rows are written sorted by EPOCH. Returns the number of RECORDS written and
+    DUPLICATES dropped'''
+    frames = [
+        build_TLE_frame(tles, creation_date=True)
+        for tles in read_JSON_batches(filename, batch_size)
+    ]
+    if not frames:
+        return {"RECORDS": 0, "DUPLICATES": 0}
+
+    df, dropped = deduplicate_TLEs(pd.concat(frames, ignore_index=True), keep)
+    append_to_CSV(df, output_dir)
+    if dropped:
+        print(f"|- {os.path.basename(filename)}: dropped {dropped} reissued TLE(s)")
+    if dataset_dir is not None:
+        sync_TLE_dataset(output_dir, dataset_dir, constellation)
+    return {"RECORDS": len(df), "DUPLICATES": dropped}
+
+def sync_TLE_dataset(filename: str, dataset_dir: str, constellation: str):
+    '''Replace the TLEs of a satellite in the Parquet dataset with its CSV file
+    (NORAD_CAT_ID.csv), a removed CSV file removes the satellite'''
+    NORAD_catalog_number = int(os.path.basename(filename).split('.')[0])
+    if os.path.isfile(filename):
+        df = read_TLEs_in_CSV(filename)
+    else:
+        df = pd.DataFrame()
+    write_satellite_TLEs(df, dataset_dir, constellation, NORAD_catalog_number)
+
+def balanced_file_groups(filenames: list[str], groups: int) -> list[list[str]]:
+    '''Split files into groups of similar total byte size (largest file first
+    into the lightest group) so no worker straggles on big satellites'''
+    heap = [(0, group_id) for group_id in range(max(1, min(groups, len(filenames))))]
+    members = collections.defaultdict(list)
+    for filename in sorted(filenames, key=os.path.getsize, reverse=True):
+        size, group_id = heapq.heappop(heap)
+        members[group_id].append(filename)
+        heapq.heappush(heap, (size + os.path.getsize(filename), group_id))
+    return [members[group_id] for group_id in sorted(members)]
+
+def convert_file_group(filenames: list[str], output_dir: str, dataset_dir: str | None = None, constellation: str | None = None) -> list[dict[str, str | int | float]]:
+    '''Convert a group of JSON files into output_dir (NORAD_CAT_ID.csv) and record
+    the outcome of each file, a failed file leaves no partial CSV behind'''
+    results = []
+    for filename in filenames:
+        output_file = f"{output_dir}/{os.path.basename(filename).split('.')[0]}.csv"
+        start = time.time()
+        try:
+            if os.path.isfile(output_file):
+                os.remove(output_file)
+            stats = convert_from_JSON_to_CSV(filename, output_file, dataset_dir, constellation)
+            status, error = "ok", ""
+        except Exception as e:
+            stats = {"RECORDS": 0, "DUPLICATES": 0}
+            status, error = "error", f"{type(e).__name__}: {str(e)}"
+            # Cleanup errors are reported with the conversion error
+            try:
+                if os.path.isfile(output_file):
+                    os.remove(output_file)
+                if dataset_dir is not None:
+                    sync_TLE_dataset(output_file, dataset_dir, constellation)
+            except Exception as cleanup_error:
+                error += f"; cleanup {type(cleanup_error).__name__}: {str(cleanup_error)}"
+        results.append({
+            "FILE": os.path.basename(filename),
+            "STATUS": status,
+            "BYTES": os.path.getsize(filename),
+            **stats,
+            "SECONDS": round(time.time() - start, 3),
+            "ERROR": error
+        })
+    return results
+
+def convert_JSON_files(
+    json_dir: str,
+    file_names: list[str],
+    output_dir: str,
+    dataset_dir: str | None = None,
+    constellation: str | None = None,
+    parallel: bool = True,
+    max_workers: int | None = None
+) -> pd.DataFrame:
+    """Convert JSON files to CSV files (NORAD_CAT_ID.csv) in a process pool
+
+    Files are split into byte size balanced groups (4 per worker), one task
+    per group. The outcome of every file is collected, a failed file (or a
+    crashed worker) is reported with its error instead of being lost.
+
+    Returns the report: FILE, STATUS (ok, error), BYTES, RECORDS,
+    DUPLICATES (reissued TLEs dropped), SECONDS, ERROR.
+    """
+    filenames = [f"{json_dir}/{name}" for name in file_names]
+    if not filenames:
+        return pd.DataFrame(columns=["FILE", "STATUS", "BYTES", "RECORDS", "DUPLICATES", "SECONDS", "ERROR"])
+
+    max_workers = max_workers or os.cpu_count() or 1
+    groups = balanced_file_groups(filenames, max_workers * 4 if parallel else 1)
+
+    results = []
+    start = time.time()
+
+    def record(group_results: list[dict]):
+        results.extend(group_results)
+        failed = sum(result["STATUS"] != "ok" for result in results)
+        print(
+            f"|- {len(results)}/{len(filenames)} file(s) "
+            f"({len(results)/(time.time()-start):.1f} files/s), {failed} failed"
+        )
+
+    if parallel:
+        with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+            futures = {
+                executor.submit(convert_file_group, group, output_dir, dataset_dir, constellation): group
+                for group in groups
+            }
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    record(future.result())
+                except Exception as e:
+                    record([{
+                        "FILE": os.path.basename(filename),
+                        "STATUS": "error",
+                        "BYTES": os.path.getsize(filename),
+                        "RECORDS": 0,
+                        "DUPLICATES": 0,
+                        "SECONDS": 0,
+                        "ERROR": f"{type(e).__name__}: {str(e)}"
+                    } for filename in futures[future]])
+    else:
+        for group in groups:
+            record(convert_file_group(group, output_dir, dataset_dir, constellation))
+
+    df_report = pd.DataFrame(results).sort_values("FILE").reset_index(drop=True)
+    print(
+        f"|- Converted {(df_report['STATUS'] == 'ok').sum()}/{len(df_report)} file(s), "
+        f"{(df_report['STATUS'] != 'ok').sum()} failed in {time.time()-start:.1f}s, "
+        f"{df_report['DUPLICATES'].sum()} reissued TLE(s) dropped"
+    )
+    return df_report
+
+def update_conversion_report(df_report: pd.DataFrame, report_file: str) -> pd.DataFrame:
+    '''Merge the outcome of a (retry) run into the conversion report CSV, the newest outcome of a file wins'''
+    if os.path.isfile(report_file):
+        df_previous = pd.read_csv(report_file, keep_default_na=False)
+        df_report = pd.concat([
+            df_previous[~df_previous["FILE"].isin(df_report["FILE"])], df_report
+        ]).sort_values("FILE").reset_index(drop=True)
+    export_as_csv(df_report, report_file)
+    return df_report
+
+def failed_conversions(report_file: str) -> list[str]:
+    '''JSON file names of the failed conversions in the report CSV'''
+    df_report = pd.read_csv(report_file, keep_default_na=False)
+    return df_report.loc[df_report["STATUS"] != "ok", "FILE"].tolist()
+
+def download_satellite(
+    catalog_number: int,
+    credential: dict,
+    start_date: str,
+    end_date: str,
+    output_dir: str,
+    pool: SessionPool | None = None,
+    base_url: str = SPACE_TRACK_URL,
+    manifest: DownloadManifest | None = None,
+    allow_empty: bool = False
+) -> bool:
+    """Download TLEs for a single satellite with retry logic
+
+    The session of the credential is taken from `pool` (login once, reused
+    across satellites). Without a pool a private one is used and closed.
+    A valid download is recorded in `manifest` (if given). With `allow_empty`
+    an empty array (no TLEs in the epoch range, e.g., delta queries of quiet
+    or decayed satellites) is a success, not retried.
+    """
     cred_id = credential.get('identity', 'unknown')
-    session = None
+    private_pool = pool is None
+    if private_pool:
+        pool = SessionPool(base_url)
     
     try:
-        session = create_session(credential)
+        session = pool.get(credential)
         if not session:
             print(f"|- Failed to create session for satellite {catalog_number} with {cred_id}")
             return False
@@ -72,17 +343,25 @@ def download_satellite(catalog_number: int, credential: dict, start_date: str, e
         while attempt < max_attempts:
             print(f"|- Starting attempt {attempt + 1} for {catalog_number} with {cred_id}")
             try:
-                success = fetch_from_space_track_API(
+                entry = fetch_from_space_track_API(
                     session,
                     catalog_number,
                     start_date,
                     end_date,
-                    output_dir
+                    output_dir,
+                    pool.base_url
                 )
                 
-                if success and check_response_content(output_dir, catalog_number):
+                if entry is not None and manifest is not None:
+                    manifest.update(catalog_number, **entry)
+
+                if entry is not None and entry["STATUS"] == "ok":
                     print(f"|- Completed: {catalog_number} with {cred_id}")
                     return True
+
+                if entry is not None and entry["STATUS"] == "empty" and allow_empty:
+                    print(f"|- No new TLEs: {catalog_number} with {cred_id}")
+                    return True
                     
                 print(f"|- Failed attempt {attempt + 1} for {catalog_number} with {cred_id}: Invalid data or no success")
                 time.sleep(3 + attempt)  # Progressive backoff
@@ -102,95 +381,418 @@ def download_satellite(catalog_number: int, credential: dict, start_date: str, e
         print(f"|- Unexpected error for {catalog_number} with {cred_id}: {str(e)}")
         return False
     finally:
-        if session:
+        if private_pool:
             try:
-                session.close()
+                pool.close()
             except:
                 pass
     return False
 
+def inspect_raw_file(json_file: str) -> dict[str, int | str]:
+    """Read and parse a raw gp_history file (.json or .json.gz), returns its
+    manifest attributes
+
+    STATUS is "missing" if the file does not exist
+    """
+    try:
+        with open_text_file(json_file) as f:
+            entry = summarize_raw_TLEs(f.read())
+        entry["BYTES"] = os.path.getsize(json_file)
+        return entry
+    except FileNotFoundError:
+        return {"STATUS": "missing"}
+    except (OSError, EOFError, UnicodeDecodeError):
+        return {"STATUS": "invalid"}
+
 def check_response_content(output_dir: str, catalog_number: int) -> bool:
     """Check if the JSON file contains valid data and not rate limit errors"""
-    try:
-        json_file = f"{output_dir}/{catalog_number}.json"
-        with open(json_file, 'r') as f:
-            content = f.read()
-            if any(error_text in content for error_text in [
-                '"error":', 
-                'rate limit',
-                'You\'ve violated'
-            ]):
-                return False
-            data = json.loads(content)
-            return bool(data and not (isinstance(data, list) and len(data) == 0))
-    except:
-        return False
+    return inspect_raw_file(raw_TLE_file(output_dir, catalog_number))["STATUS"] == "ok"
 
-def download_TLEs(
-    catalog_numbers: list[int],  # Changed from List[int] to list[int]
-    credentials: list[dict[str, str]],  # Changed from List[Dict[str, str]] to list[dict[str, str]]
+def find_missing_satellites(catalog_numbers: list[int], output_dir: str, check_stat: bool = True) -> list[int]:
+    """Satellites without a valid raw file according to the manifest
+
+    With `check_stat` the file size is compared with the manifest, files
+    without a manifest entry (older archives) are parsed once and recorded.
+    """
+    manifest = DownloadManifest(output_dir)
+    missing = []
+    for sat_num in catalog_numbers:
+        json_file = raw_TLE_file(output_dir, sat_num)
+        entry = manifest.get(sat_num)
+
+        if entry is None:
+            entry = inspect_raw_file(json_file)
+            if entry["STATUS"] != "missing":
+                manifest.update(sat_num, **entry)
+
+        elif check_stat and entry["STATUS"] == "ok":
+            try:
+                if os.stat(json_file).st_size != entry["BYTES"]:
+                    entry = {"STATUS": "modified"}
+            except FileNotFoundError:
+                entry = {"STATUS": "missing"}
+
+        if entry["STATUS"] != "ok":
+            print(f"|- {entry['STATUS'].capitalize()} file for satellite {sat_num}")
+            missing.append(sat_num)
+
+    return missing
+
+def verify_raw_files(catalog_numbers: list[int], output_dir: str, max_workers: int | None = None) -> list[int]:
+    """Deep verify: re-parse all raw files in parallel and refresh the manifest
+
+    Returns the satellites without a valid raw file
+    """
+    manifest = DownloadManifest(output_dir)
+    json_files = [raw_TLE_file(output_dir, sat_num) for sat_num in catalog_numbers]
+
+    invalid = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+        entries = executor.map(inspect_raw_file, json_files, chunksize=64)
+        for sat_num, entry in zip(catalog_numbers, entries):
+            previous = manifest.get(sat_num)
+            if previous is not None:
+                if "SHA256" in entry and entry["SHA256"] != previous.get("SHA256"):
+                    print(f"|- Content changed for satellite {sat_num}")
+                manifest.update(sat_num, **entry)
+            elif entry["STATUS"] != "missing":
+                manifest.update(sat_num, **entry)
+            if entry["STATUS"] != "ok":
+                print(f"|- {entry['STATUS'].capitalize()} file for satellite {sat_num}")
+                invalid.append(sat_num)
+
+    manifest.compact()
+    return invalid
+
+def download_batch(
+    catalog_numbers: list[int],
+    credential: dict,
     start_date: str,
     end_date: str,
-    output_dir: str
+    output_dir: str,
+    pool: SessionPool,
+    manifest: DownloadManifest | None = None
+) -> list[int] | None:
+    """Download TLEs of many satellites with a single bulk query
+
+    Returns the catalog numbers written, None if the query failed (login,
+    HTTP or space-track error). A truncated response raises TruncatedJSONArray
+    """
+    cred_id = credential.get('identity', 'unknown')
+    session = pool.get(credential)
+    if not session:
+        print(f"|- Failed to create session for batch {min(catalog_numbers)}..{max(catalog_numbers)} with {cred_id}")
+        return None
+
+    print(f"|- Bulk query of {len(catalog_numbers)} satellites ({min(catalog_numbers)}..{max(catalog_numbers)}) with {cred_id}")
+    entries = fetch_bulk_from_space_track_API(
+        session,
+        catalog_numbers,
+        start_date,
+        end_date,
+        output_dir,
+        pool.base_url
+    )
+    if entries is None:
+        return None
+
+    valid = []
+    for cat_num, entry in entries.items():
+        if manifest is not None:
+            manifest.update(cat_num, **entry)
+        if entry["STATUS"] == "ok":
+            valid.append(cat_num)
+    return valid
+
+def download_TLEs(
+    catalog_numbers: list[int],
+    credentials: list[dict[str, str]],
+    start_date: str,
+    end_date: str | None,
+    output_dir: str,
+    rate_per_minute: float = SPACE_TRACK_RATE_LIMIT,
+    base_url: str = SPACE_TRACK_URL,
+    batch_size: int = 1,
+    allow_empty: bool = False
 ):
-    '''Download all TLEs sequentially with a single credential, switching on repeated failures'''
+    '''Download all TLEs concurrently, one worker lane per credential
+
+    Every lane pulls catalog numbers from a shared queue, reuses one logged in
+    session of its credential and is held at `rate_per_minute` requests by
+    the token bucket of that credential, so throughput grows with the number
+    of credentials. A lane retires after 5 consecutive failures (blocked or
+    invalid credential), the others drain the queue.
+
+    With `batch_size` > 1 satellites are fetched by bulk queries of up to
+    `batch_size` catalog numbers, the batch size halves whenever a response
+    fails or is truncated. Only failed queries count towards retiring the
+    lane, truncation does not. A single satellite batch uses the per
+    satellite download with retries.
+
+    Valid downloads are recorded in the manifest of `output_dir`. Without
+    `end_date` all TLEs after `start_date` are fetched. With `allow_empty`
+    satellites without TLEs in the range are not failures (delta queries).
+    '''
     if not credentials:
         raise Exception("No credentials provided")
-    
-    current_cred_idx = 0
-    current_credential = credentials[current_cred_idx]
-    consecutive_failures = 0
-    MIN_DELAY = 3  # Minimum delay between requests in seconds
-    
-    print(f"Starting downloads with credential: {current_credential.get('identity', 'cred_0')}")
+
+    print(f"Starting downloads with {len(credentials)} credential lane(s)")
     print(f"Processing {len(catalog_numbers)} satellites")
-    
+
+    pending = collections.deque(catalog_numbers)
+    sizer = AdaptiveBatchSize(batch_size)
+
     failed = []
-    completed = 0
-    
-    for cat_num in catalog_numbers:
-        start_time = time.time()
-        
-        success = download_satellite(cat_num, current_credential, start_date, end_date, output_dir)
-        completed += 1
-        
-        if success:
-            consecutive_failures = 0
-        else:
-            failed.append(cat_num)
-            consecutive_failures += 1
-            print(f"|- Consecutive failures: {consecutive_failures}")
-            
-            if consecutive_failures >= 5 and current_cred_idx < len(credentials) - 1:
-                current_cred_idx += 1
-                current_credential = credentials[current_cred_idx]
+    progress = {"completed": 0}
+    lock = threading.Lock()
+
+    def lane(lane_id: int, credential: dict[str, str]):
+        cred_id = credential.get('identity', f'cred_{lane_id}')
+        consecutive_failures = 0
+
+        while consecutive_failures < 5:
+            with lock:
+                if not pending:
+                    return
+                batch = [pending.popleft() for _ in range(min(sizer.size, len(pending)))]
+
+            if batch_size > 1 and len(batch) > 1:
+                try:
+                    written = download_batch(
+                        batch, credential, start_date, end_date, output_dir, pool, manifest
+                    )
+                except TruncatedJSONArray:
+                    # Response too large, retry in smaller batches (not a credential failure)
+                    print(f"|- [{cred_id}] Bulk response truncated, batch size: {sizer.shrink()}")
+                    with lock:
+                        pending.extendleft(reversed(batch))
+                    continue
+
+                # Failed query, retry in smaller batches
+                if written is None:
+                    print(f"|- [{cred_id}] Bulk query failed, batch size: {sizer.shrink()}")
+                    with lock:
+                        pending.extendleft(reversed(batch))
+                    consecutive_failures += 1
+                    continue
+
+                sizer.grow()
                 consecutive_failures = 0
-                print(f"|- Switching to new credential: {current_credential.get('identity', f'cred_{current_cred_idx}')}")
-        
-        print(f"Progress: {completed}/{len(catalog_numbers)} ({round(100*completed/len(catalog_numbers),2)}%)")
-        
-        # Enforce 2.1-second delay between requests
-        elapsed = time.time() - start_time
-        if elapsed < MIN_DELAY:
-            time.sleep(MIN_DELAY - elapsed)
-    
+                with lock:
+                    progress["completed"] += len(batch)
+                    # No (valid) TLEs returned for the satellite
+                    if not allow_empty:
+                        failed.extend(sorted(set(batch) - set(written)))
+                    print(f"Progress: {progress['completed']}/{len(catalog_numbers)} ({round(100*progress['completed']/len(catalog_numbers),2)}%)")
+                continue
+
+            cat_num = batch[0]
+            success = download_satellite(
+                cat_num, credential, start_date, end_date, output_dir, pool,
+                manifest=manifest, allow_empty=allow_empty
+            )
+
+            with lock:
+                progress["completed"] += 1
+                if success:
+                    consecutive_failures = 0
+                else:
+                    failed.append(cat_num)
+                    consecutive_failures += 1
+                    print(f"|- [{cred_id}] Consecutive failures: {consecutive_failures}")
+                print(f"Progress: {progress['completed']}/{len(catalog_numbers)} ({round(100*progress['completed']/len(catalog_numbers),2)}%)")
+
+        print(f"|- Retiring credential lane: {cred_id}")
+
+    pool = SessionPool(base_url, rate_per_minute)
+    manifest = DownloadManifest(output_dir)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(credentials)) as executor:
+        lanes = [
+            executor.submit(lane, lane_id, credential)
+            for lane_id, credential in enumerate(credentials)
+        ]
+        for future in lanes:
+            future.result()
+
+    pool.close()
+    print(f"|- Sessions: {pool.stats()}")
+
+    # Every lane retired before the queue drained
+    failed.extend(pending)
+
     if failed:
         print(f"\nFailed to download {len(failed)} satellites: {failed[:5]}{'...' if len(failed) > 5 else ''}")
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         failed_file = f"{output_dir}/failed_satellites_{timestamp}.txt"
         with open(failed_file, 'w') as f:
-            for sat in failed:
+            for sat in sorted(failed):
                 f.write(f"{sat}\n")
         print(f"Failed satellites saved to: {failed_file}")
     
     print(f"\nCompleted download process: {len(catalog_numbers) - len(failed)} successful, {len(failed)} failed")
 
-def create_session(credential: dict) -> requests.Session | None:
-    """Create a new session with the given credentials"""
+def download_TLE_updates(
+    catalog_numbers: list[int],
+    credentials: list[dict[str, str]],
+    start_date: str,
+    output_dir: str,
+    csv_dir: str | None = None,
+    rate_per_minute: float = SPACE_TRACK_RATE_LIMIT,
+    base_url: str = SPACE_TRACK_URL,
+    batch_size: int = 1,
+    dataset_dir: str | None = None,
+    constellation: str | None = None
+):
+    '''Download only the TLEs published after the newest EPOCH already held
+
+    The newest EPOCH of each satellite is taken from the manifest (or the raw
+    file for older archives). Satellites are grouped by the day of their
+    newest EPOCH and each group is queried with EPOCH > that day into a
+    staging directory, then the new TLEs are appended to the raw JSON file
+    and the CSV file (NORAD_CAT_ID.csv) in `csv_dir`, and the Parquet
+    dataset is synced with the CSV file if `dataset_dir` is given.
+    Satellites without any TLE are downloaded from `start_date`.
+
+    Appended CSV rows are not cleaned, re-run the preprocess scripts.
+    '''
+    staging_dir = f"{output_dir}/delta"
+    if os.path.exists(staging_dir):
+        shutil.rmtree(staging_dir)
+    create_directories(staging_dir)
+
+    manifest = DownloadManifest(output_dir)
+
+    # Group satellites by the day of the newest EPOCH held
+    last_epochs: dict[int, str | None] = dict()
+    groups: dict[str, list[int]] = collections.defaultdict(list)
+    for cat_num in catalog_numbers:
+        last_epoch = manifest.last_epoch(cat_num)
+        if last_epoch is None:
+            entry = inspect_raw_file(raw_TLE_file(output_dir, cat_num))
+            if entry["STATUS"] == "ok":
+                manifest.update(cat_num, **entry)
+                last_epoch = entry["LAST_EPOCH"]
+        last_epochs[cat_num] = last_epoch
+        groups[start_date if last_epoch is None else last_epoch[:10]].append(cat_num)
+
+    for since, group in sorted(groups.items()):
+        print(f"|- {len(group)} satellite(s) with TLEs after {since}")
+        # No TLEs since the newest EPOCH held is the usual answer, not a failure
+        download_TLEs(
+            group, credentials, since, None, staging_dir,
+            rate_per_minute, base_url, batch_size, allow_empty=True
+        )
+
+    # Merge the new TLEs into the raw and CSV stores
+    merged = 0
+    for cat_num in last_epochs:
+        staged_file = raw_TLE_file(staging_dir, cat_num)
+        if not check_response_content(staging_dir, cat_num):
+            continue
+
+        new_tles = merge_TLE_update(
+            read_JSON_file(staged_file),
+            raw_TLE_file(output_dir, cat_num),
+            None if csv_dir is None else f"{csv_dir}/{cat_num}.csv",
+            manifest,
+            dataset_dir,
+            constellation
+        )
+        remove_file(staged_file)
+        merged += new_tles > 0
+
+    manifest.compact()
+    print(f"|- Updated {merged} satellite(s)")
+
+def merge_TLE_update(
+    tles: list[dict[str, str]],
+    raw_file: str,
+    csv_file: str | None = None,
+    manifest: DownloadManifest | None = None,
+    dataset_dir: str | None = None,
+    constellation: str | None = None
+) -> int:
+    '''Append the TLEs not held yet to the raw JSON and CSV file
+
+    The raw file is rewritten compressed (NORAD_CAT_ID.json.gz). In the CSV
+    file a reissued TLE replaces the held one of its EPOCH when it is newer
+    (merge_TLEs_into_CSV), the satellite is replaced in the Parquet dataset
+    by the updated CSV file if `dataset_dir` is given.
+    Returns the number of TLEs appended
+    '''
+    if not tles:
+        return 0
+
+    # Raw store, skip the TLEs already held (same element set)
+    existing = read_JSON_file(raw_file) if os.path.isfile(raw_file) else []
+    held = {(tle.get("GP_ID"), tle[TLE.EPOCH], tle.get(TLE.LINE1)) for tle in existing}
+    tles = [
+        tle for tle in tles
+        if (tle.get("GP_ID"), tle[TLE.EPOCH], tle.get(TLE.LINE1)) not in held
+    ]
+    if not tles:
+        return 0
+    if not raw_file.endswith(".gz"):
+        raw_file = f"{raw_file}.gz"
+    entry = write_raw_TLEs(existing + tles, raw_file)
+
+    # CSV store
+    if csv_file is not None:
+        merge_TLEs_into_CSV(build_TLE_frame(tles, creation_date=True), csv_file, existing)
+        if dataset_dir is not None:
+            sync_TLE_dataset(csv_file, dataset_dir, constellation)
+
+    if manifest is not None:
+        manifest.update(int(tles[0][TLE.NORAD_CAT_ID]), **entry)
+
+    print(f"|- Appended {len(tles)} TLE(s): {raw_file}")
+    return len(tles)
+
+def merge_TLEs_into_CSV(df: pd.DataFrame, csv_file: str, held_tles: list[dict[str, str]]):
+    '''Merge TLEs (with CREATION_DATE) into a CSV file sorted by EPOCH
+
+    The held rows from the earliest new EPOCH on are deduplicated together
+    with the new TLEs (deduplicate_TLEs), their CREATION_DATE is taken from
+    the held raw TLEs. Without held rows in that range the TLEs are appended,
+    otherwise the file is rewritten.
+    '''
+    if not os.path.isfile(csv_file):
+        df, _ = deduplicate_TLEs(df)
+        append_to_CSV(df, csv_file)
+        return
+
+    df_held = read_TLEs_in_CSV(csv_file, epoch_date_type=False, ldate_type=False, engine="pyarrow")
+    held_epochs = parse_epochs(df_held[TLE.EPOCH])
+    in_tail = (held_epochs >= parse_epochs(df[TLE.EPOCH]).min()).to_numpy()
+    if not in_tail.any():
+        df, _ = deduplicate_TLEs(df)
+        append_to_CSV(df, csv_file)
+        return
+
+    # Latest CREATION_DATE held per EPOCH, the CSV keeps that TLE
+    df_raw = pd.DataFrame.from_records(held_tles, columns=[TLE.EPOCH, TLE.CREATION_DATE])
+    created = df_raw.assign(**{TLE.EPOCH: parse_epochs(df_raw[TLE.EPOCH])}).groupby(TLE.EPOCH)[TLE.CREATION_DATE].max()
+
+    df_tail = df_held[in_tail].assign(**{TLE.CREATION_DATE: held_epochs[in_tail].map(created)})
+    df_tail, dropped = deduplicate_TLEs(pd.concat([df_tail, df], ignore_index=True))
+    if dropped:
+        print(f"|- {os.path.basename(csv_file)}: replaced {dropped} reissued TLE(s)")
+
+    temp_file = f"{csv_file}.tmp"
+    append_to_CSV(pd.concat([df_held[~in_tail], df_tail], ignore_index=True), temp_file)
+    os.replace(temp_file, csv_file)
+
+def create_session(
+    credential: dict,
+    limiter: TokenBucket | None = None,
+    base_url: str = SPACE_TRACK_URL
+) -> requests.Session | None:
+    """Create a new (rate limited) session with the given credentials"""
     try:
-        session = requests.Session()
+        session = RateLimitedSession(limiter)
         response = session.post(
-            LOGIN_URL,
+            f"{base_url}/ajaxauth/login",
             data={
                 "identity": credential.get('identity'),
                 "password": credential.get('password')
@@ -204,24 +806,32 @@ def create_session(credential: dict) -> requests.Session | None:
         print(f"Session creation error: {str(e)}")
         return None
 
-def get_median_altitude(df: pd.DataFrame, end_date: pd.Timestamp = None) -> float:
+def get_median_altitude(df: pd.DataFrame | TLEStore, end_date: pd.Timestamp = None) -> float:
     '''Calculate the median altitude from the TLEs up to given date'''
+    if isinstance(df, TLEStore):
+        return df.median_altitude(end_date)
     if end_date is not None:
         df = df[df[TLE.EPOCH] < end_date]
     return df[TLE.ALTITUDE_KM].median()
 
-def get_first_TLE_after_the_date(df: pd.DataFrame, date: pd.Timestamp) -> dict[str, float] | None:
-    '''Query the immediate first TLE after the given date'''
-    df = df[df[TLE.EPOCH] > date]
-    if len(df):
-        return df.iloc[0].to_dict()
+def get_first_TLE_after_the_date(df: pd.DataFrame | TLEStore, date: pd.Timestamp) -> dict[str, float] | TLERecord | None:
+    '''Query the immediate first TLE after the given date (earliest EPOCH, rows in any order)'''
+    if isinstance(df, TLEStore):
+        return df.first_after(date)
+    epochs = df[TLE.EPOCH].to_numpy()
+    rows = np.flatnonzero(epochs > date)
+    if len(rows):
+        return df.iloc[rows[np.argmin(epochs[rows])]].to_dict()
     return None
 
-def get_last_TLE_before_the_date(df: pd.DataFrame, date: pd.Timestamp) -> dict[str, float] | None:
-    '''Query the immediate last TLE before the given date'''
-    df = df[df[TLE.EPOCH] < date]
-    if len(df):
-        return df.iloc[-1].to_dict()
+def get_last_TLE_before_the_date(df: pd.DataFrame | TLEStore, date: pd.Timestamp) -> dict[str, float] | TLERecord | None:
+    '''Query the immediate last TLE before the given date (latest EPOCH, rows in any order)'''
+    if isinstance(df, TLEStore):
+        return df.last_before(date)
+    epochs = df[TLE.EPOCH].to_numpy()
+    rows = np.flatnonzero(epochs < date)[::-1]
+    if len(rows):
+        return df.iloc[rows[np.argmax(epochs[rows])]].to_dict()
     return None
 
 def get_TLEs_by_cat_id(df: pd.DataFrame, cat_id: int) -> pd.DataFrame:
@@ -241,12 +851,14 @@ def get_unique_cat_ids(df: pd.DataFrame) -> pd.Series:
     return df[TLE.NORAD_CAT_ID].unique()
 
 def get_all_TLE_between_two_date(
-    df: pd.DataFrame,
+    df: pd.DataFrame | TLEStore,
     sdate: pd.Timestamp,
     edate: pd.Timestamp,
     cat_id: int | None = None
 ) -> pd.DataFrame | None:
     '''Query all the TLEs of given satellite(s) within the time window'''
+    if isinstance(df, TLEStore):
+        return df.between(sdate, edate, cat_id)
     if cat_id is not None:
         df = df[df[TLE.NORAD_CAT_ID] == cat_id]
     df = df[df[TLE.EPOCH].between(sdate, edate)]
@@ -254,20 +866,324 @@ def get_all_TLE_between_two_date(
         return df
     return None
 
-def get_merged_TLEs_from_all_CSVs(directory_name: str, epoch_date_type: bool = True, ldate_type: bool = True, epoch_mixed_format: bool = True) -> pd.DataFrame:
-    '''Read TLEs from all CSV files in directory'''
-    list_of_df = []
+def catalog_number_order(file_names: list[str]) -> list[str]:
+    '''Sort TLE files (NORAD_CAT_ID.csv) by NORAD Catalog Number, other names last'''
+    def key(name: str) -> tuple[bool, int, str]:
+        stem = name.split('.')[0]
+        return (not stem.isdigit(), int(stem) if stem.isdigit() else 0, name)
+    return sorted(file_names, key=key)
+
+def TLE_file_index_name(directory_name: str) -> str:
+    '''Epoch range index of the TLE files, kept next to the directory'''
+    return f"{directory_name.rstrip('/')}.index.csv"
+
+def summarize_TLE_file(filename: str) -> dict[str, int | str]:
+    '''NORAD Catalog Number, launch date, TLE count and EPOCH range of a TLE file'''
+    df = read_CSV(filename, engine="pyarrow", usecols=[TLE.NORAD_CAT_ID, TLE.LAUNCH_DATE, TLE.EPOCH])
+    epochs = parse_epochs(df[TLE.EPOCH])
+    return {
+        "FILE": os.path.basename(filename),
+        "SIZE": os.path.getsize(filename),
+        "MTIME": os.stat(filename).st_mtime_ns,
+        "NORAD_CAT_ID": int(df[TLE.NORAD_CAT_ID].iloc[0]) if len(df) else -1,
+        "LAUNCH_DATE": str(pd.to_datetime(df[TLE.LAUNCH_DATE].iloc[0]).date()) if len(df) else "",
+        "RECORDS": len(df),
+        # Rows are not necessarily sorted by EPOCH
+        "FIRST_EPOCH": format_epochs(pd.Series([epochs.min()])).iloc[0] if len(df) else "",
+        "LAST_EPOCH": format_epochs(pd.Series([epochs.max()])).iloc[0] if len(df) else "",
+    }
+
+def TLE_file_index(directory_name: str, max_workers: int | None = None) -> pd.DataFrame:
+    '''Per file epoch range index of a TLE directory (TLE_file_index_name),
+    files added or changed (size or modification time in ns) since the last call are
+    summarized again and removed files are dropped'''
+    index_file = TLE_file_index_name(directory_name)
+    df_index = read_CSV(index_file, remove_nan=False) if os.path.isfile(index_file) else pd.DataFrame(
+        columns=["FILE", "SIZE", "MTIME", "NORAD_CAT_ID", "LAUNCH_DATE", "RECORDS", "FIRST_EPOCH", "LAST_EPOCH"]
+    )
+    known = {row.FILE: (row.SIZE, row.MTIME) for row in df_index.itertuples()}
+
     file_names = get_file_names(directory_name)
-    for id, file in enumerate(file_names):
-        sys.stdout.write(f"\r Reading {round(id/len(file_names)*100,1)}%  ")
-        _filename = f"{directory_name}/{file}"
-        list_of_df.append(
-            read_TLEs_in_CSV(
-                _filename, epoch_date_type, ldate_type, epoch_mixed_format
+    changed = [
+        file for file in file_names
+        if known.get(file) != (
+            os.path.getsize(f"{directory_name}/{file}"),
+            os.stat(f"{directory_name}/{file}").st_mtime_ns
+        )
+    ]
+    if not changed and len(known) == len(file_names):
+        return df_index
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        summaries = list(executor.map(
+            summarize_TLE_file, [f"{directory_name}/{file}" for file in changed]
+        ))
+
+    df_index = pd.concat([
+        df_index[df_index["FILE"].isin(set(file_names) - set(changed))],
+        pd.DataFrame(summaries, columns=df_index.columns)
+    ], ignore_index=True).sort_values("FILE", ignore_index=True)
+    export_as_csv(df_index, index_file)
+    return df_index
+
+def indexed_TLE_files(
+    directory_name: str,
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+    cat_ids: list[int] | None = None,
+    launch_dates: list[pd.Timestamp] | None = None
+) -> list[str]:
+    '''TLE files that can hold TLEs matching the filters (TLE_file_index)'''
+    df_index = TLE_file_index(directory_name)
+    df_index = df_index[df_index["RECORDS"] > 0]
+    if start is not None:
+        df_index = df_index[parse_epochs(df_index["LAST_EPOCH"]) >= pd.Timestamp(start)]
+    if end is not None:
+        df_index = df_index[parse_epochs(df_index["FIRST_EPOCH"]) <= pd.Timestamp(end)]
+    if cat_ids is not None:
+        df_index = df_index[df_index["NORAD_CAT_ID"].isin(list(cat_ids))]
+    if launch_dates is not None:
+        df_index = df_index[pd.to_datetime(df_index["LAUNCH_DATE"]).isin(pd.to_datetime(list(launch_dates)))]
+    return df_index["FILE"].tolist()
+
+def get_merged_TLEs_from_all_CSVs(
+    directory_name: str,
+    epoch_date_type: bool = True,
+    ldate_type: bool = True,
+    epoch_mixed_format: bool = True,
+    engine: str = "pyarrow",
+    max_workers: int | None = None,
+    processes: bool = False,
+    max_inflight_mb: float = 512,
+    columns: list[str] | None = None,
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+    cat_ids: list[int] | None = None,
+    launch_dates: list[pd.Timestamp] | None = None,
+    compact: bool = False
+) -> pd.DataFrame:
+    '''Read TLEs from all CSV files in directory in a thread (or process) pool,
+    concatenated in NORAD Catalog Number order
+
+    At most `max_workers` files are read at once and new files are submitted
+    only while the CSV bytes being read stay under `max_inflight_mb`. The
+    pyarrow `engine` parses in C++ and releases the GIL, best with threads.
+    Only the given `columns` of the TLEs matching the filters (select_TLEs)
+    are kept, files outside the filters are skipped using the epoch range
+    index (TLE_file_index). Each file is cast to the compact schema right
+    after reading if asked (compact_TLEs). Prints the throughput (files/s, MB/s).'''
+    filters = dict(start=start, end=end, cat_ids=cat_ids, launch_dates=launch_dates)
+    if any(value is not None for value in filters.values()):
+        file_names = indexed_TLE_files(directory_name, **filters)
+    else:
+        file_names = get_file_names(directory_name)
+    file_names = catalog_number_order(file_names)
+    filenames = [f"{directory_name}/{file}" for file in file_names]
+    sizes = [os.path.getsize(filename) for filename in filenames]
+    max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+    max_inflight = max_inflight_mb * 1024 * 1024
+
+    pool = concurrent.futures.ProcessPoolExecutor if processes else concurrent.futures.ThreadPoolExecutor
+    list_of_df = [None] * len(filenames)
+    start_time = time.time()
+
+    with pool(max_workers=max_workers) as executor:
+        pending, inflight, next_id = dict(), 0, 0
+
+        while next_id < len(filenames) or pending:
+            # Submit while under the concurrency and memory caps (always one)
+            while next_id < len(filenames) and len(pending) < max_workers and (
+                not pending or inflight + sizes[next_id] <= max_inflight
+            ):
+                future = executor.submit(
+                    read_TLEs_in_CSV, filenames[next_id],
+                    epoch_date_type, ldate_type, epoch_mixed_format, engine,
+                    columns, **filters, compact=compact
+                )
+                pending[future] = next_id
+                inflight += sizes[next_id]
+                next_id += 1
+
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
             )
+            for future in done:
+                id = pending.pop(future)
+                inflight -= sizes[id]
+                list_of_df[id] = future.result()
+
+    elapsed = max(time.time() - start_time, 1e-9)
+    print(
+        f"|- Read {len(filenames)} file(s) ({sum(sizes)/1024/1024:.1f} MB) in {elapsed:.2f}s: "
+        f"{len(filenames)/elapsed:.1f} files/s, {sum(sizes)/1024/1024/elapsed:.1f} MB/s"
+    )
+    if not list_of_df:
+        return empty_TLE_frame(epoch_date_type, ldate_type, columns, compact)
+    if compact and TLE.LAUNCH_DATE in list_of_df[0]:
+        # Same categories in every file, concat keeps the categorical
+        categories = pd.api.types.union_categoricals(
+            [df[TLE.LAUNCH_DATE] for df in list_of_df], sort_categories=True
+        ).categories
+        list_of_df = [
+            df.assign(**{TLE.LAUNCH_DATE: df[TLE.LAUNCH_DATE].cat.set_categories(categories)})
+            for df in list_of_df
+        ]
+    return pd.concat(list_of_df, ignore_index=compact)
+
+def empty_TLE_frame(epoch_date_type: bool = True, ldate_type: bool = True, columns: list[str] | None = None, compact: bool = False) -> pd.DataFrame:
+    '''TLEs without rows, same columns and dtypes as read_TLEs_in_CSV'''
+    df = build_TLE_frame([])
+    df[TLE.LAUNCH_DATE] = df[TLE.LAUNCH_DATE].astype(str)
+    if ldate_type:
+        df[TLE.LAUNCH_DATE] = pd.to_datetime(df[TLE.LAUNCH_DATE]).dt.as_unit('ns')
+    if epoch_date_type:
+        df[TLE.EPOCH] = parse_epochs(df[TLE.EPOCH])
+    if columns is not None:
+        df = df.reindex(columns=columns)
+    if compact:
+        df = compact_TLEs(df, object_name=columns is not None and TLE.OBJECT_NAME in columns)
+    return df
+
+def TLE_source_files(directory_name: str) -> list[str]:
+    '''Sorted paths (relative to the directory) of the files in a TLE directory
+    and its subdirectories (Parquet dataset partitions), none if it is missing'''
+    return sorted(
+        os.path.relpath(os.path.join(root, name), directory_name)
+        for root, _, names in os.walk(directory_name)
+        for name in names
+    )
+
+def TLE_source_fingerprint(directory_name: str) -> str:
+    '''SHA-256 of the file names, sizes and modification times (ns) in a TLE directory'''
+    digest = hashlib.sha256()
+    for name in TLE_source_files(directory_name):
+        stat = os.stat(os.path.join(directory_name, name))
+        digest.update(f"{name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+def cached_merged_TLEs(directory_name: str, cache_dir: str = TLE_CACHE_DIR, max_cache_mb: float = TLE_CACHE_MAX_MB, **kwargs) -> pd.DataFrame:
+    '''get_merged_TLEs_from_all_CSVs (same keyword arguments) served from an Arrow IPC
+    (Feather) file cache
+
+    A cached frame is named after the query (directory and arguments) and the
+    fingerprint of the directory (TLE_source_fingerprint), any added, removed
+    or rewritten file is a miss and the stale frame of the query is removed.
+    The least recently used frames are evicted beyond `max_cache_mb`.'''
+    # Arguments that only change how the files are read
+    query = {
+        key: value for key, value in kwargs.items()
+        if key not in ("engine", "max_workers", "processes", "max_inflight_mb")
+    }
+    query_key = hashlib.sha256(
+        json.dumps({"DIRECTORY": os.path.abspath(directory_name), **query}, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+    filename = f"{cache_dir}/{query_key}-{TLE_source_fingerprint(directory_name)[:16]}.arrow"
+
+    if os.path.isfile(filename):
+        os.utime(filename)
+        print(f"|- Cache hit: {filename}")
+        return feather.read_table(filename).to_pandas()
+
+    create_directories(cache_dir)
+    for stale in glob.glob(f"{cache_dir}/{query_key}-*.arrow"):
+        os.remove(stale)
+
+    df = get_merged_TLEs_from_all_CSVs(directory_name, **kwargs)
+    feather.write_feather(pa.Table.from_pandas(df, preserve_index=True), f"{filename}.tmp")
+    os.replace(f"{filename}.tmp", filename)
+    print(f"|- Cache save: {filename}")
+
+    evict_TLE_cache(cache_dir, max_cache_mb)
+    return df
+
+def evict_TLE_cache(cache_dir: str = TLE_CACHE_DIR, max_cache_mb: float = TLE_CACHE_MAX_MB) -> list[str]:
+    '''Remove the least recently used cached frames until the cache fits in `max_cache_mb`'''
+    entries = sorted(
+        (os.path.getmtime(filename), os.path.getsize(filename), filename)
+        for filename in glob.glob(f"{cache_dir}/*.arrow")
+    )
+    total = sum(size for _, size, _ in entries)
+    removed = []
+    for _, size, filename in entries:
+        if total <= max_cache_mb * 1024 * 1024:
+            break
+        os.remove(filename)
+        total -= size
+        removed.append(filename)
+        print(f"|- Cache evict: {filename}")
+    return removed
+
+def build_TLE_dataset(directory_name: str, dataset_dir: str, constellation: str):
+    '''Rebuild the Parquet dataset partition of a constellation from all CSV files in directory'''
+    write_TLE_dataset(get_merged_TLEs_from_all_CSVs(directory_name), dataset_dir, constellation)
+
+def load_TLEs(
+    directory_name: str,
+    dataset_dir: str,
+    constellation: str,
+    epoch_date_type: bool = True,
+    ldate_type: bool = True,
+    epoch_mixed_format: bool = True,
+    engine: str = "pyarrow",
+    columns: list[str] | None = None,
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+    cat_ids: list[int] | None = None,
+    launch_dates: list[pd.Timestamp] | None = None,
+    compact: bool = False,
+    cache_dir: str | None = None
+) -> pd.DataFrame:
+    '''Read TLEs of a constellation from the Parquet dataset if built, otherwise from all CSV files in directory
+    (through the cache if `cache_dir` is given, cached_merged_TLEs), only the given columns of the TLEs matching
+    the filters (select_TLEs), in the compact schema if asked (compact_TLEs)'''
+    filters = dict(columns=columns, start=start, end=end, cat_ids=cat_ids, launch_dates=launch_dates)
+    if os.path.isdir(constellation_dir(dataset_dir, constellation)):
+        df = read_TLE_dataset(dataset_dir, constellation, epoch_date_type, ldate_type, **filters)
+        if compact:
+            df = compact_TLEs(df, object_name=columns is not None and TLE.OBJECT_NAME in columns)
+        return df
+    if cache_dir is not None:
+        return cached_merged_TLEs(
+            directory_name, cache_dir,
+            epoch_date_type=epoch_date_type, ldate_type=ldate_type, epoch_mixed_format=epoch_mixed_format,
+            engine=engine, **filters, compact=compact
         )
-    print()
-    return pd.concat(list_of_df)
+    return get_merged_TLEs_from_all_CSVs(
+        directory_name, epoch_date_type, ldate_type, epoch_mixed_format, engine, **filters, compact=compact
+    )
+
+def build_TLE_column_store(directory_name: str, dataset_dir: str, constellation: str, store_dir: str, rebuild: bool = False):
+    '''Write the memory-mapped column store of a constellation (load_TLEs),
+    skipped if the fingerprint of its source (TLE_source_fingerprint of the
+    Parquet dataset partition if built, otherwise of the CSV directory) is
+    unchanged since the store was written, any added, removed or rewritten
+    file rebuilds it. Nothing is written without source files.'''
+    source_dir = constellation_dir(dataset_dir, constellation)
+    if not os.path.isdir(source_dir):
+        source_dir = directory_name
+    if not TLE_source_files(source_dir):
+        print(f"|- No TLE files in {source_dir}, column store not written: {store_dir}")
+        return
+
+    fingerprint = TLE_source_fingerprint(source_dir)
+    if not rebuild and column_store_source_fingerprint(store_dir) == fingerprint:
+        print(f"|- Column store is up to date: {store_dir}")
+        return
+    write_column_store(load_TLEs(directory_name, dataset_dir, constellation), store_dir, fingerprint)
+
+def read_satellite_TLEs(source: str | pd.DataFrame | StoreSatellite) -> pd.DataFrame:
+    '''TLEs of a satellite from a CSV file (NORAD_CAT_ID.csv), a column store or a DataFrame'''
+    if isinstance(source, pd.DataFrame):
+        return source
+    if isinstance(source, StoreSatellite):
+        return open_column_store(source.store_dir).satellite(source.NORAD_catalog_number)
+    return read_TLEs_in_CSV(source)
+
+def read_satellite_TLE_store(source: str | pd.DataFrame | StoreSatellite | TLEStore) -> TLEStore:
+    '''TLEs of a satellite (read_satellite_TLEs) as an epoch-sorted TLEStore'''
+    if isinstance(source, TLEStore):
+        return source
+    return TLEStore(read_satellite_TLEs(source))
 
 def read_orbit_raise_CSV(filename: str) -> pd.DataFrame:
     '''Read orbit raise CSV file'''
@@ -276,26 +1192,164 @@ def read_orbit_raise_CSV(filename: str) -> pd.DataFrame:
     df["ORBIT_RAISE_COMEPLETE"] = pd.to_datetime(df["ORBIT_RAISE_COMEPLETE"])
     return df
 
-def read_TLEs_in_CSV(filename: str, epoch_date_type: bool = True, ldate_type: bool = True, epoch_mixed_format: bool = True) -> pd.DataFrame:
-    '''Read TLEs from CSV file'''
-    df = read_CSV(filename)
-    if ldate_type:
-        df[TLE.LAUNCH_DATE] = pd.to_datetime(df[TLE.LAUNCH_DATE])
-    if epoch_date_type:
-        if epoch_mixed_format:
-            df[TLE.EPOCH] = pd.to_datetime(df[TLE.EPOCH], format='mixed')
-        else:
-            df[TLE.EPOCH] = pd.to_datetime(df[TLE.EPOCH])
+def format_epochs(epochs: pd.Series) -> pd.Series:
+    '''EPOCH values (strings or datetime) in the canonical format'''
+    if not pd.api.types.is_datetime64_any_dtype(epochs):
+        epochs = parse_epochs(epochs)
+    if epochs.dt.tz is not None:
+        epochs = epochs.dt.tz_convert('UTC').dt.tz_localize(None)
+    # numpy writes EPOCH_FORMAT at microsecond unit
+    return pd.Series(
+        np.datetime_as_string(epochs.to_numpy().astype('datetime64[us]'), unit='us'),
+        index=epochs.index, name=epochs.name
+    )
+
+def parse_epochs(epochs: pd.Series, mixed_format: bool = True) -> pd.Series:
+    '''Parse EPOCH values into datetime64[ns]: integer nanoseconds are cast directly,
+    ISO-8601 strings (EPOCH_FORMAT) are parsed by numpy, then by pandas ISO-8601
+    parser and only legacy files fall back to the per element parser'''
+    if pd.api.types.is_integer_dtype(epochs):
+        return pd.to_datetime(epochs, unit='ns')
+    if pd.api.types.is_datetime64_any_dtype(epochs):
+        return epochs.dt.as_unit('ns')
+    try:
+        # Time zone suffixes warn in numpy, leave them to pandas
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            return pd.Series(
+                epochs.to_numpy().astype('datetime64[ns]'),
+                index=epochs.index, name=epochs.name
+            )
+    except (ValueError, TypeError, Warning):
+        pass
+    try:
+        return pd.to_datetime(epochs, format='ISO8601').dt.as_unit('ns')
+    except ValueError:
+        pass
+    if mixed_format:
+        return pd.to_datetime(epochs, format='mixed').dt.as_unit('ns')
+    return pd.to_datetime(epochs).dt.as_unit('ns')
+
+def read_TLEs_in_CSV(
+    filename: str,
+    epoch_date_type: bool = True,
+    ldate_type: bool = True,
+    epoch_mixed_format: bool = True,
+    engine: str = "c",
+    columns: list[str] | None = None,
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+    cat_ids: list[int] | None = None,
+    launch_dates: list[pd.Timestamp] | None = None,
+    compact: bool = False
+) -> pd.DataFrame:
+    '''Read TLEs from CSV file (pandas c or pyarrow engine), only the given
+    columns of the TLEs matching the filters (select_TLEs), in the compact
+    schema if asked (compact_TLEs)'''
+    usecols = None
+    if columns is not None:
+        usecols = list(dict.fromkeys(columns + filter_columns(start, end, cat_ids, launch_dates)))
+    df = read_CSV(filename, engine=engine, usecols=usecols)
+    if ldate_type and TLE.LAUNCH_DATE in df:
+        df[TLE.LAUNCH_DATE] = pd.to_datetime(df[TLE.LAUNCH_DATE]).dt.as_unit('ns')
+    elif TLE.LAUNCH_DATE in df and not pd.api.types.is_string_dtype(df[TLE.LAUNCH_DATE]):
+        # pyarrow infers dates
+        df[TLE.LAUNCH_DATE] = pd.to_datetime(df[TLE.LAUNCH_DATE]).dt.strftime('%Y-%m-%d')
+    if epoch_date_type and TLE.EPOCH in df:
+        df[TLE.EPOCH] = parse_epochs(df[TLE.EPOCH], epoch_mixed_format)
+    elif TLE.EPOCH in df and pd.api.types.is_datetime64_any_dtype(df[TLE.EPOCH]):
+        # pyarrow infers ISO-8601 timestamps
+        df[TLE.EPOCH] = format_epochs(df[TLE.EPOCH])
+    df = select_TLEs(df, start, end, cat_ids, launch_dates)
+    if columns is not None:
+        df = df[columns]
+    if compact:
+        df = compact_TLEs(df, object_name=columns is not None and TLE.OBJECT_NAME in columns)
     return df
 
+def compact_TLEs(df: pd.DataFrame, object_name: bool = False) -> pd.DataFrame:
+    '''TLEs in the compact schema (COMPACT_DTYPES), OBJECT_NAME dropped unless asked
+    and the CSV row labels replaced by a RangeIndex'''
+    data = dict()
+    for column in df.columns:
+        dtype = COMPACT_DTYPES.get(column)
+        if column == TLE.OBJECT_NAME and not object_name:
+            continue
+        if dtype is None:
+            data[column] = df[column].array
+        elif dtype == "category":
+            codes, categories = pd.factorize(df[column])
+            data[column] = pd.Categorical.from_codes(codes, categories=categories)
+        else:
+            data[column] = df[column].to_numpy(dtype=dtype)
+    return pd.DataFrame(data)
+
+def TLE_memory_usage(df: pd.DataFrame) -> pd.Series:
+    '''Resident memory of the TLEs in MB per column (index included) and TOTAL'''
+    usage = df.memory_usage(deep=True) / 1024 / 1024
+    usage["TOTAL"] = usage.sum()
+    return usage.round(3)
+
+def memory_report(df: pd.DataFrame, df_compact: pd.DataFrame) -> pd.DataFrame:
+    '''Memory (MB) of the TLEs in the default and the compact schema per column'''
+    df_report = pd.DataFrame({
+        "DEFAULT_MB": TLE_memory_usage(df),
+        "COMPACT_MB": TLE_memory_usage(df_compact)
+    })
+    df_report["RATIO"] = (df_report["DEFAULT_MB"] / df_report["COMPACT_MB"]).round(2)
+    return df_report
+
+def filter_columns(start: pd.Timestamp | None = None, end: pd.Timestamp | None = None, cat_ids: list[int] | None = None, launch_dates: list[pd.Timestamp] | None = None) -> list[str]:
+    '''Columns needed to apply the filters of select_TLEs'''
+    needed = []
+    if start is not None or end is not None:
+        needed.append(TLE.EPOCH)
+    if cat_ids is not None:
+        needed.append(TLE.NORAD_CAT_ID)
+    if launch_dates is not None:
+        needed.append(TLE.LAUNCH_DATE)
+    return needed
+
+def select_TLEs(
+    df: pd.DataFrame,
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+    cat_ids: list[int] | None = None,
+    launch_dates: list[pd.Timestamp] | None = None
+) -> pd.DataFrame:
+    '''TLEs with EPOCH within [start, end] (either bound optional), of the given
+    NORAD Catalog Numbers and launch dates (None keeps all)'''
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None or end is not None:
+        epochs = parse_epochs(df[TLE.EPOCH])
+        if start is not None:
+            mask &= (epochs >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (epochs <= pd.Timestamp(end)).to_numpy()
+    if cat_ids is not None:
+        mask &= df[TLE.NORAD_CAT_ID].isin(list(cat_ids)).to_numpy()
+    if launch_dates is not None:
+        mask &= pd.to_datetime(df[TLE.LAUNCH_DATE]).isin(pd.to_datetime(list(launch_dates))).to_numpy()
+    if mask.all():
+        return df
+    return df[mask]
+
+def write_TLEs_to_CSV(df: pd.DataFrame, filename: str):
+    '''Write TLEs into a CSV file with EPOCH in the canonical format'''
+    df = df.copy()
+    df[TLE.EPOCH] = format_epochs(df[TLE.EPOCH])
+    if pd.api.types.is_datetime64_any_dtype(df[TLE.LAUNCH_DATE]):
+        df[TLE.LAUNCH_DATE] = df[TLE.LAUNCH_DATE].dt.strftime('%Y-%m-%d')
+    export_as_csv(df, filename)
+
 def satellite_age_in_days(df: pd.DataFrame) -> float:
     '''Counts how many days passed after the launch'''
     return (df[TLE.EPOCH].iloc[-1] - df[TLE.EPOCH].iloc[0]) / pd.Timedelta(days=1)
 
-def convert_to_km(mean_motion: float) -> float:
-    '''Calculate altitude in km from mean motion of satellites'''
-    return (math.pow(((G * M * ((24*60*60)/mean_motion) ** 2) /
-                     (4 * math.pi ** 2)), (1/3)) - EARTH_RADIUS_M) / 1000
+def convert_to_km(mean_motion: float | np.ndarray) -> float | np.ndarray:
+    '''Calculate altitude in km from mean motion of satellites (scalar or array)'''
+    return (np.power(((G * M * ((24*60*60)/mean_motion) ** 2) /
+                     (4 * np.pi ** 2)), (1/3)) - EARTH_RADIUS_M) / 1000
 
 def find_new_catalog_numbers(
     current_TLE_file: str,
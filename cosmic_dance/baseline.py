@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+from cosmic_dance.tle_store import ASOF_BACKWARD, TLEStore
+
+# Baseline over all the TLEs before the date (get_median_altitude)
+BASELINE_FULL_HISTORY = None
+
+
+class AltitudeBaseline:
+    '''Median and median absolute deviation (MAD) of the altitude of every
+    satellite of a TLEStore, precomputed at every TLE
+
+    With `window_days` the values at a TLE are over the TLEs of the trailing
+    window (EPOCH - window_days, EPOCH], otherwise over the full history up
+    to the TLE. The medians are computed for all the satellites in one
+    grouped rolling pass. The baseline at a date is the value at the last
+    TLE before the date (a binary search), for the full history it is the
+    median of get_median_altitude.
+
+    The MAD at a TLE is the median of the absolute deviations of the
+    altitudes of its window from the median at that TLE (robust spread of
+    the recent altitudes), NaN altitudes are skipped. It depends on the
+    median of each window, so it is computed on the first query of a TLE
+    and kept.
+
+    Params
+    ------
+    tles: TLEStore
+        TLEs with ALTITUDE_KM
+    window_days: float | None, optional
+        Trailing window length in days (Default None, full history)
+    '''
+
+    def __init__(self, tles: TLEStore, window_days: float | None = BASELINE_FULL_HISTORY):
+        self.tles = tles
+        self.window_days = window_days
+
+        df = pd.DataFrame(
+            {
+                "NORAD_CAT_ID": tles.columns["NORAD_CAT_ID"],
+                "ALTITUDE_KM": np.asarray(tles.columns["ALTITUDE_KM"], dtype=np.float64),
+            },
+            index=pd.DatetimeIndex(tles.columns["EPOCH"], name="EPOCH")
+        )
+
+        self.altitude = df["ALTITUDE_KM"].to_numpy()
+        self.median = self.rolling_median(df)
+        self.window_start = self.window_starts()
+        self.mads: dict[int, float] = dict()
+
+    def rolling_median(self, df: pd.DataFrame) -> np.ndarray:
+        '''Median of ALTITUDE_KM over the window ending at every TLE, per satellite
+
+        Params
+        ------
+        df: pd.DataFrame
+            NORAD_CAT_ID and ALTITUDE_KM indexed by EPOCH, in store order
+
+        Returns
+        -------
+        np.ndarray: value of every row of the store
+        '''
+
+        groups = df.groupby("NORAD_CAT_ID", sort=False)["ALTITUDE_KM"]
+        if self.window_days is None:
+            window = groups.expanding(min_periods=1)
+        else:
+            window = groups.rolling(pd.Timedelta(days=self.window_days), min_periods=1)
+
+        # The store is sorted by NORAD Catalog Number, groups come back in row order
+        return window.median().to_numpy()
+
+    def window_starts(self) -> np.ndarray:
+        '''First row of the window ending at every TLE, per satellite
+
+        Returns
+        -------
+        np.ndarray: row of every row of the store
+        '''
+
+        offsets = self.tles.offsets
+        starts = np.repeat(offsets[:-1], np.diff(offsets))
+        if self.window_days is None:
+            return starts
+
+        window = pd.Timedelta(days=self.window_days).value
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            epochs = self.tles.epoch[start:end]
+            starts[start:end] = start + np.searchsorted(epochs, epochs - window, side='right')
+        return starts
+
+    def mad_rows(self, rows: np.ndarray) -> np.ndarray:
+        '''MAD of the windows ending at rows of the store, NaN for -1
+
+        Params
+        ------
+        rows: np.ndarray
+            Rows of the store (rows), -1 if none
+
+        Returns
+        -------
+        np.ndarray: MAD of every row
+        '''
+
+        for row in np.unique(rows[rows >= 0]).tolist():
+            if row not in self.mads:
+                window = self.altitude[self.window_start[row]:row + 1]
+                window = window[~np.isnan(window)]
+                self.mads[row] = float(np.median(np.abs(window - self.median[row]))) if len(window) else np.nan
+        return np.array([self.mads[row] if row >= 0 else np.nan for row in rows.tolist()], dtype=np.float64)
+
+    def rows(
+        self,
+        dates: pd.Timestamp | np.ndarray | pd.Series | list[pd.Timestamp],
+        cat_ids: int | np.ndarray | list[int] | None = None
+    ) -> np.ndarray:
+        '''Rows of the last TLEs before the dates, -1 if none'''
+
+        if cat_ids is None:
+            # Single satellite store only
+            self.tles.bounds()
+            cat_ids = self.tles.catalog[0] if len(self.tles.catalog) else -1
+        cat_ids, dates = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(cat_ids)),
+            pd.to_datetime(np.atleast_1d(np.asarray(dates))).as_unit('ns').to_numpy()
+        )
+        return self.tles.asof_rows(cat_ids, dates, ASOF_BACKWARD)
+
+    def at(
+        self,
+        dates: pd.Timestamp | np.ndarray | pd.Series | list[pd.Timestamp],
+        cat_ids: int | np.ndarray | list[int] | None = None
+    ) -> pd.DataFrame:
+        '''Baseline of satellites at dates
+
+        Params
+        ------
+        dates: pd.Timestamp | np.ndarray | pd.Series | list[pd.Timestamp]
+            Query dates
+        cat_ids: int | np.ndarray | list[int] | None, optional
+            NORAD Catalog Number of every query, or one for all (Default the
+            only satellite of the store)
+
+        Returns
+        -------
+        pd.DataFrame: MEDIAN and MAD of every query, NaN if there is no TLE
+        before the date
+        '''
+
+        rows = self.rows(dates, cat_ids)
+        found = rows >= 0
+        return pd.DataFrame({
+            "MEDIAN": np.where(found, self.median[rows], np.nan),
+            "MAD": self.mad_rows(rows),
+        })
+
+    def median_at(self, date: pd.Timestamp, cat_id: int | None = None) -> float:
+        '''Median altitude of a satellite at a date (NaN if no TLE before it)'''
+
+        row = self.rows(date, cat_id)[0]
+        return float(self.median[row]) if row >= 0 else np.nan
+
+    def mad_at(self, date: pd.Timestamp, cat_id: int | None = None) -> float:
+        '''Median absolute deviation of the altitude of a satellite at a date'''
+
+        return float(self.mad_rows(self.rows(date, cat_id))[0])
+
+
+def altitude_baseline(tles: TLEStore, window_days: float | None = BASELINE_FULL_HISTORY) -> AltitudeBaseline:
+    '''Altitude baseline of a store, computed once per store and window
+
+    Params
+    ------
+    tles: TLEStore
+        TLEs with ALTITUDE_KM
+    window_days: float | None, optional
+        Trailing window length in days (Default None, full history)
+
+    Returns
+    -------
+    AltitudeBaseline
+    '''
+
+    # Kept on the store, released with it
+    baselines = vars(tles).setdefault("baselines", dict())
+    if window_days not in baselines:
+        baselines[window_days] = AltitudeBaseline(tles, window_days)
+    return baselines[window_days]
@@ -0,0 +1,235 @@
+import functools
+import json
+import os
+import shutil
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+# Fixed dtype of every column file of the store
+STORE_COLUMNS: dict[str, str] = {
+    "NORAD_CAT_ID": "int32",
+    "EPOCH": "int64",
+    "INCLINATION": "float32",
+    "RAAN": "float32",
+    "ARGP": "float32",
+    "ECCENTRICITY": "float32",
+    "ALTITUDE_KM": "float32",
+    "MEAN_MOTION": "float32",
+    "MEAN_ANOMALY": "float32",
+    "DRAG": "float32",
+}
+
+# Per satellite offset table
+STORE_CATALOG = "CATALOG"
+STORE_OFFSETS = "OFFSETS"
+STORE_LAUNCH_DATE = "LAUNCH_DATE"
+
+STORE_META = "meta.json"
+
+
+class StoreSatellite(NamedTuple):
+    '''Reference to the TLEs of a satellite in a column store, cheap to send
+    to process pool workers (read_satellite_TLEs)'''
+
+    store_dir: str
+    NORAD_catalog_number: int
+
+
+def write_column_store(df: pd.DataFrame, store_dir: str, source_fingerprint: str | None = None):
+    '''Write TLEs into a column store: one .npy file per column, sorted by
+    NORAD Catalog Number and EPOCH, and a per satellite offset table
+
+    EPOCH is kept as int64 nanoseconds, NORAD_CAT_ID as int32 and the orbital
+    elements as float32 (ALTITUDE_KM within ~6 cm at LEO). LAUNCH_DATE is
+    kept once per satellite. The store is written next to `store_dir` and
+    swapped in, readers never see a partial store.
+
+    Params
+    ------
+    df: pd.DataFrame
+        TLEs with typed EPOCH and LAUNCH_DATE (load_TLEs)
+    store_dir: str
+        Column store directory
+    source_fingerprint: str | None, optional
+        Fingerprint of the source files, kept in the metadata
+    '''
+
+    epoch = pd.to_datetime(df["EPOCH"]).astype('datetime64[ns]').to_numpy().view(np.int64)
+    cat_id = df["NORAD_CAT_ID"].to_numpy(dtype=np.int32)
+    order = np.lexsort((epoch, cat_id))
+
+    catalog, offsets = np.unique(cat_id[order], return_index=True)
+    launch_date = pd.to_datetime(df["LAUNCH_DATE"]).to_numpy(dtype='datetime64[ns]')[order][offsets]
+
+    tmp_dir = f"{store_dir}.tmp"
+    if os.path.isdir(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    for column, dtype in STORE_COLUMNS.items():
+        values = epoch if column == "EPOCH" else df[column].to_numpy(dtype=dtype)
+        np.save(f"{tmp_dir}/{column}.npy", values[order])
+
+    np.save(f"{tmp_dir}/{STORE_CATALOG}.npy", catalog.astype(np.int32))
+    np.save(f"{tmp_dir}/{STORE_OFFSETS}.npy", np.append(offsets, len(order)).astype(np.int64))
+    np.save(f"{tmp_dir}/{STORE_LAUNCH_DATE}.npy", launch_date.astype('datetime64[D]'))
+
+    with open(f"{tmp_dir}/{STORE_META}", 'w') as f:
+        json.dump({
+            "COLUMNS": STORE_COLUMNS,
+            "RECORDS": int(len(order)),
+            "SATELLITES": int(len(catalog)),
+            "SOURCE_FINGERPRINT": source_fingerprint,
+        }, f)
+
+    if os.path.isdir(store_dir):
+        shutil.rmtree(store_dir)
+    os.replace(tmp_dir, store_dir)
+
+    print(f"|- Save column store: {store_dir} ({len(order)} TLEs, {len(catalog)} satellites)")
+
+
+def column_store_source_fingerprint(store_dir: str) -> str | None:
+    '''Fingerprint of the source files the store was written from
+
+    Params
+    ------
+    store_dir: str
+        Column store directory
+
+    Returns
+    -------
+    str | None: None if the store does not exist (or predates fingerprints)
+    '''
+
+    if not os.path.isfile(f"{store_dir}/{STORE_META}"):
+        return None
+    with open(f"{store_dir}/{STORE_META}") as f:
+        return json.load(f).get("SOURCE_FINGERPRINT")
+
+
+class TLEColumnStore:
+    '''Read-only view of a column store, the column files are memory-mapped
+
+    Opening maps the files without reading them, the pages of a satellite
+    are read on first access and shared through the OS page cache by all
+    the processes that open the same store.
+
+    Params
+    ------
+    store_dir: str
+        Column store directory
+    '''
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        self.columns = {
+            column: np.load(f"{store_dir}/{column}.npy", mmap_mode='r')
+            for column in STORE_COLUMNS
+        }
+        self.catalog = np.load(f"{store_dir}/{STORE_CATALOG}.npy")
+        self.offsets = np.load(f"{store_dir}/{STORE_OFFSETS}.npy")
+        self.launch_date = np.load(f"{store_dir}/{STORE_LAUNCH_DATE}.npy")
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def catalog_numbers(self) -> list[int]:
+        '''NORAD Catalog Numbers in the store (ascending)'''
+
+        return self.catalog.tolist()
+
+    def satellites(self) -> list[StoreSatellite]:
+        '''References to every satellite of the store'''
+
+        return [StoreSatellite(self.store_dir, cat_id) for cat_id in self.catalog_numbers()]
+
+    def bounds(self, NORAD_catalog_number: int) -> tuple[int, int]:
+        '''Row range [start, end) of a satellite, empty if not in the store
+
+        Params
+        ------
+        NORAD_catalog_number: int
+            NORAD Catalog Number
+
+        Returns
+        -------
+        tuple[int, int]: start and end row
+        '''
+
+        index = np.searchsorted(self.catalog, NORAD_catalog_number)
+        if index == len(self.catalog) or self.catalog[index] != NORAD_catalog_number:
+            return 0, 0
+        return int(self.offsets[index]), int(self.offsets[index + 1])
+
+    def column(self, NORAD_catalog_number: int, column: str) -> np.ndarray:
+        '''Memory-mapped slice of a column of a satellite (no copy)
+
+        Params
+        ------
+        NORAD_catalog_number: int
+            NORAD Catalog Number
+        column: str
+            Column name (STORE_COLUMNS)
+
+        Returns
+        -------
+        np.ndarray: read-only values sorted by EPOCH
+        '''
+
+        start, end = self.bounds(NORAD_catalog_number)
+        return self.columns[column][start:end]
+
+    def satellite(self, NORAD_catalog_number: int, columns: list[str] | None = None) -> pd.DataFrame:
+        '''TLEs of a satellite sorted by EPOCH, in the columns of the TLE CSV files
+
+        Params
+        ------
+        NORAD_catalog_number: int
+            NORAD Catalog Number
+        columns: list[str] | None, optional
+            Columns to read (Default all)
+
+        Returns
+        -------
+        DataFrame of TLEs with typed EPOCH and LAUNCH_DATE
+        '''
+
+        start, end = self.bounds(NORAD_catalog_number)
+        if columns is None:
+            columns = ["NORAD_CAT_ID", STORE_LAUNCH_DATE] + list(STORE_COLUMNS)[1:]
+
+        data = dict()
+        for column in columns:
+            if column == "EPOCH":
+                data[column] = self.columns[column][start:end].view('datetime64[ns]')
+            elif column == STORE_LAUNCH_DATE:
+                index = np.searchsorted(self.catalog, NORAD_catalog_number)
+                data[column] = np.full(
+                    end - start,
+                    self.launch_date[index] if end > start else np.datetime64('NaT'),
+                    dtype='datetime64[ns]'
+                )
+            else:
+                data[column] = self.columns[column][start:end]
+
+        return pd.DataFrame(data)
+
+
+@functools.lru_cache(maxsize=4)
+def open_column_store(store_dir: str) -> TLEColumnStore:
+    '''Open a column store once per process
+
+    Params
+    ------
+    store_dir: str
+        Column store directory
+
+    Returns
+    -------
+    TLEColumnStore
+    '''
+
+    return TLEColumnStore(store_dir)
@@ -0,0 +1,282 @@
+import glob
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+class PARTITION:
+    '''Partition attributes of the TLE dataset'''
+
+    CONSTELLATION = "CONSTELLATION"
+    EPOCH_YEAR = "EPOCH_YEAR"
+
+    # Row label of the TLE in the satellite CSV file
+    ROW = "ROW"
+
+
+# Columns of the TLE CSV files used by the dataset
+NORAD_CAT_ID = "NORAD_CAT_ID"
+EPOCH = "EPOCH"
+LAUNCH_DATE = "LAUNCH_DATE"
+
+
+def constellation_dir(dataset_dir: str, constellation: str) -> str:
+    '''Partition directory of a constellation
+
+    Params
+    ------
+    dataset_dir: str
+        Dataset directory
+    constellation: str
+        Constellation name (e.g., Starlink)
+
+    Returns
+    -------
+    str: directory
+    '''
+
+    return f"{dataset_dir}/{PARTITION.CONSTELLATION}={constellation}"
+
+
+def satellite_fragments(dataset_dir: str, constellation: str, NORAD_catalog_number: int) -> list[str]:
+    '''Parquet files of a satellite in all epoch year partitions
+
+    Params
+    ------
+    dataset_dir: str
+        Dataset directory
+    constellation: str
+        Constellation name (e.g., Starlink)
+    NORAD_catalog_number: int
+        NORAD Catalog Number
+
+    Returns
+    -------
+    list[str]: Parquet filenames
+    '''
+
+    return glob.glob(
+        f"{constellation_dir(dataset_dir, constellation)}/"
+        f"{PARTITION.EPOCH_YEAR}=*/{NORAD_catalog_number}-*.parquet"
+    )
+
+
+def to_partitioned_table(df: pd.DataFrame, constellation: str) -> pa.Table:
+    '''Typed Arrow table of TLEs with the partition and row label columns
+
+    Params
+    ------
+    df: pd.DataFrame
+        TLEs with typed EPOCH and LAUNCH_DATE (read_TLEs_in_CSV)
+    constellation: str
+        Constellation name (e.g., Starlink)
+
+    Returns
+    -------
+    pa.Table
+    '''
+
+    df = df.copy()
+    df[PARTITION.ROW] = df.index.astype(np.int64)
+    df[EPOCH] = pd.to_datetime(df[EPOCH]).astype('datetime64[ns]')
+    df[LAUNCH_DATE] = pd.to_datetime(df[LAUNCH_DATE]).astype('datetime64[ns]')
+    df[PARTITION.CONSTELLATION] = constellation
+    df[PARTITION.EPOCH_YEAR] = df[EPOCH].dt.year.astype(np.int32)
+
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def write_satellite_TLEs(df: pd.DataFrame, dataset_dir: str, constellation: str, NORAD_catalog_number: int):
+    '''Replace the TLEs of a satellite in the Parquet dataset
+
+    The dataset is partitioned by constellation and epoch year (Hive style
+    directories). A satellite is written as one file per year named after
+    the NORAD Catalog Number, so writers of different satellites can run in
+    parallel; compact_TLE_dataset merges them afterwards.
+
+    Params
+    ------
+    df: pd.DataFrame
+        TLEs of the satellite with typed EPOCH and LAUNCH_DATE (read_TLEs_in_CSV)
+    dataset_dir: str
+        Dataset directory
+    constellation: str
+        Constellation name (e.g., Starlink)
+    NORAD_catalog_number: int
+        NORAD Catalog Number
+    '''
+
+    for filename in satellite_fragments(dataset_dir, constellation, NORAD_catalog_number):
+        os.remove(filename)
+
+    if df.empty:
+        return
+
+    pq.write_to_dataset(
+        to_partitioned_table(df, constellation),
+        dataset_dir,
+        partition_cols=[PARTITION.CONSTELLATION, PARTITION.EPOCH_YEAR],
+        basename_template=f"{NORAD_catalog_number}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore'
+    )
+
+
+def write_TLE_dataset(df: pd.DataFrame, dataset_dir: str, constellation: str):
+    '''Replace all TLEs of a constellation in the Parquet dataset, one file
+    per epoch year
+
+    Params
+    ------
+    df: pd.DataFrame
+        TLEs with typed EPOCH and LAUNCH_DATE (get_merged_TLEs_from_all_CSVs)
+    dataset_dir: str
+        Dataset directory
+    constellation: str
+        Constellation name (e.g., Starlink)
+    '''
+
+    if os.path.isdir(constellation_dir(dataset_dir, constellation)):
+        shutil.rmtree(constellation_dir(dataset_dir, constellation))
+
+    table = to_partitioned_table(df, constellation)
+    pq.write_to_dataset(
+        table.sort_by([(NORAD_CAT_ID, "ascending"), (PARTITION.ROW, "ascending")]),
+        dataset_dir,
+        partition_cols=[PARTITION.CONSTELLATION, PARTITION.EPOCH_YEAR],
+        basename_template="part-{i}.parquet",
+        existing_data_behavior='overwrite_or_ignore'
+    )
+    print(f"|- Save dataset: {constellation_dir(dataset_dir, constellation)}")
+
+
+def compact_TLE_dataset(dataset_dir: str, constellation: str):
+    '''Merge the satellite files of every epoch year partition into one file
+
+    Params
+    ------
+    dataset_dir: str
+        Dataset directory
+    constellation: str
+        Constellation name (e.g., Starlink)
+    '''
+
+    for year_dir in sorted(glob.glob(f"{constellation_dir(dataset_dir, constellation)}/{PARTITION.EPOCH_YEAR}=*")):
+        filenames = sorted(glob.glob(f"{year_dir}/*.parquet"))
+        if len(filenames) <= 1:
+            continue
+
+        table = ds.dataset(filenames, format="parquet").to_table()
+        pq.write_table(
+            table.sort_by([(NORAD_CAT_ID, "ascending"), (PARTITION.ROW, "ascending")]),
+            f"{year_dir}/part-0.parquet.tmp"
+        )
+        for filename in filenames:
+            os.remove(filename)
+        os.replace(f"{year_dir}/part-0.parquet.tmp", f"{year_dir}/part-0.parquet")
+
+    print(f"|- Compact dataset: {constellation_dir(dataset_dir, constellation)}")
+
+
+def read_TLE_dataset(
+    dataset_dir: str,
+    constellation: str,
+    epoch_date_type: bool = True,
+    ldate_type: bool = True,
+    columns: list[str] | None = None,
+    start: pd.Timestamp | None = None,
+    end: pd.Timestamp | None = None,
+    cat_ids: list[int] | None = None,
+    launch_dates: list[pd.Timestamp] | None = None
+) -> pd.DataFrame:
+    '''Read TLEs of a constellation from the Parquet dataset
+
+    Returns the same DataFrame as get_merged_TLEs_from_all_CSVs on the CSV
+    directory the dataset was written from: same columns, satellites in
+    NORAD Catalog Number order and the row labels of the CSV files. The
+    filters are pushed down to the Parquet scan, epoch year partitions and
+    row groups outside the time range are not read.
+
+    Params
+    ------
+    dataset_dir: str
+        Dataset directory
+    constellation: str
+        Constellation name (e.g., Starlink)
+    epoch_date_type: bool, optional
+        EPOCH as datetime, ISO string otherwise (Default datetime)
+    ldate_type: bool, optional
+        LAUNCH_DATE as datetime, date string otherwise (Default datetime)
+    columns: list[str] | None, optional
+        Columns to read (Default all)
+    start: pd.Timestamp | None, optional
+        Only TLEs with EPOCH at or after start
+    end: pd.Timestamp | None, optional
+        Only TLEs with EPOCH at or before end
+    cat_ids: list[int] | None, optional
+        Only TLEs of these NORAD Catalog Numbers
+    launch_dates: list[pd.Timestamp] | None, optional
+        Only TLEs of satellites launched on these dates
+
+    Returns
+    -------
+    DataFrame of TLEs
+    '''
+
+    dataset = ds.dataset(
+        constellation_dir(dataset_dir, constellation),
+        format="parquet",
+        partitioning=ds.partitioning(
+            pa.schema([(PARTITION.EPOCH_YEAR, pa.int32())]), flavor="hive"
+        )
+    )
+
+    expression = None
+    conditions = []
+    if start is not None:
+        start = pd.Timestamp(start)
+        conditions += [
+            ds.field(PARTITION.EPOCH_YEAR) >= start.year,
+            ds.field(EPOCH) >= pa.scalar(start.as_unit('ns').value, pa.timestamp('ns'))
+        ]
+    if end is not None:
+        end = pd.Timestamp(end)
+        conditions += [
+            ds.field(PARTITION.EPOCH_YEAR) <= end.year,
+            ds.field(EPOCH) <= pa.scalar(end.as_unit('ns').value, pa.timestamp('ns'))
+        ]
+    if cat_ids is not None:
+        conditions.append(ds.field(NORAD_CAT_ID).isin([int(cat_id) for cat_id in cat_ids]))
+    if launch_dates is not None:
+        conditions.append(ds.field(LAUNCH_DATE).isin(
+            pa.array(pd.to_datetime(list(launch_dates)).to_numpy(dtype='datetime64[ns]'))
+        ))
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    names = [
+        name for name in dataset.schema.names
+        if name not in (PARTITION.CONSTELLATION, PARTITION.EPOCH_YEAR)
+    ]
+    if columns is not None:
+        names = [name for name in names if name in columns or name in (NORAD_CAT_ID, PARTITION.ROW)]
+    df = dataset.to_table(columns=names, filter=expression).to_pandas()
+
+    # NORAD Catalog Number order of the satellites, then CSV row order
+    order = np.lexsort((df[PARTITION.ROW].values, df[NORAD_CAT_ID].values))
+
+    df = df.iloc[order].set_index(PARTITION.ROW)
+    df.index.name = None
+
+    if not epoch_date_type and EPOCH in df:
+        df[EPOCH] = df[EPOCH].dt.strftime('%Y-%m-%dT%H:%M:%S.%f')
+    if not ldate_type and LAUNCH_DATE in df:
+        df[LAUNCH_DATE] = df[LAUNCH_DATE].dt.strftime('%Y-%m-%d')
+    if columns is not None:
+        df = df[columns]
+
+    return df
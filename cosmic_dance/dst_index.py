@@ -1,6 +1,18 @@
+import concurrent.futures
+import hashlib
+import json
+import os
+
+import numpy as np
 import pandas as pd
+import requests
+
+from cosmic_dance.io import create_directories, export_as_csv, fetch_from_url, read_CSV
+
+WDC_URL = "https://wdc.kugi.kyoto-u.ac.jp"
 
-from cosmic_dance.io import fetch_from_url, read_CSV
+# Data tiers of the WDC Dst index, best quality first
+DST_TIERS = ["dst_final", "dst_provisional", "dst_realtime"]
 
 
 class DST:
@@ -304,7 +316,19 @@ def read_dst_index_CSV(filename: str, abs_value: bool = True) -> pd.DataFrame:
 
 
 def parse_dst_index(urls: list[str]) -> pd.DataFrame:
-    dst_index_records = []
+    '''Fetch and parse the monthly Dst index files (WDC format)
+
+    Params
+    ------
+    urls: list[str]
+        URLs of monthly files
+
+    Returns
+    -------
+    DataFrame of hourly Dst index
+    '''
+
+    contents = []
 
     for id, url in enumerate(urls):
         print(f"|- ({id+1}/{len(urls)}): {url}")
@@ -319,29 +343,544 @@ def parse_dst_index(urls: list[str]) -> pd.DataFrame:
             print(f"Warning: Failed to get {date_str}'s data")
             continue  # Skip to the next URL
 
-        content = content.split('\n')[:-3]
+        contents.append(content)
+
+    return parse_dst_content(contents)
+
+
+def parse_dst_content(contents: list[str]) -> pd.DataFrame:
+    '''Parse monthly Dst index files (WDC format)
+
+    All lines are sliced at once as a fixed-width character matrix, hourly
+    values (columns 21-116) are decoded into a (days x 24) int array and the
+    timestamps are generated arithmetically from year/month/day.
+
+    Params
+    ------
+    contents: list[str]
+        Text of monthly files
+
+    Returns
+    -------
+    DataFrame of hourly Dst index
+    '''
+
+    lines = [
+        line[:120].ljust(120)
+        for content in contents
+        for line in content.split('\n')[:-3]
+        if line.startswith("DST")
+    ]
+    if not lines:
+        return pd.DataFrame({
+            DST.TIMESTAMP: pd.Series(dtype='datetime64[ns]'),
+            DST.NANOTESLA: pd.Series(dtype='int64')
+        })
+
+    chars = np.frombuffer(
+        "".join(lines).encode('ascii', errors='replace'), dtype=np.uint8
+    ).reshape(len(lines), 120)
+
+    def to_int(columns: np.ndarray) -> np.ndarray:
+        '''Decode right-aligned (signed) integer fields of ASCII codes'''
+        value = np.zeros(columns.shape[:-1], dtype=np.int64)
+        for k in range(columns.shape[-1]):
+            digit = columns[..., k].astype(np.int64) - ord('0')
+            is_digit = (digit >= 0) & (digit <= 9)
+            value = np.where(is_digit, value*10 + digit, value)
+        return np.where((columns == ord('-')).any(axis=-1), -value, value)
+
+    # Year (century in columns 15-16, 20 if blank), month and day
+    century = np.where(
+        (chars[:, 14:16] == ord(' ')).all(axis=1), 20, to_int(chars[:, 14:16])
+    )
+    year = century*100 + to_int(chars[:, 3:5])
+    month = to_int(chars[:, 5:7])
+    day = to_int(chars[:, 8:10])
+
+    dates = (
+        (year - 1970).astype('datetime64[Y]').astype('datetime64[M]')
+        + (month - 1).astype('timedelta64[M]')
+    ).astype('datetime64[D]') + (day - 1).astype('timedelta64[D]')
+
+    timestamps = (
+        dates.astype('datetime64[ns]')[:, None]
+        + np.arange(24).astype('timedelta64[h]')
+    )
+    nT = to_int(chars[:, 20:116].reshape(len(lines), 24, 4))
+
+    return pd.DataFrame({
+        DST.TIMESTAMP: timestamps.ravel(),
+        DST.NANOTESLA: nT.ravel()
+    })
+
+
+def dst_month_url(month: pd.Period, tier: str, base_url: str = WDC_URL) -> str:
+    '''URL of the monthly Dst index file
+
+    Params
+    ------
+    month: pd.Period
+        Month
+    tier: str
+        Data tier (one of DST_TIERS)
+    base_url: str, optional
+        WDC host
+
+    Returns
+    -------
+    str: URL
+    '''
+
+    return f"{base_url}/{tier}/{month.strftime('%Y%m')}/dst{month.strftime('%y%m')}.for.request"
+
+
+def fetch_dst_month(month: pd.Period, cache_dir: str, base_url: str = WDC_URL) -> tuple[str, str] | None:
+    '''Fetch the best available tier of a monthly Dst index file through an
+    on-disk HTTP cache
+
+    Tiers are tried best first (final, provisional, realtime). A cached final
+    month is never fetched again, a cached lower tier month is revalidated
+    with ETag/Last-Modified (or content hash) after checking for a better tier.
+
+    Params
+    ------
+    month: pd.Period
+        Month
+    cache_dir: str
+        Cache directory
+    base_url: str, optional
+        WDC host
+
+    Returns
+    -------
+    tuple[str, str] | None: tier and text of the file, None if not published
+    '''
+
+    yyyymm = month.strftime('%Y%m')
+
+    # Best cached tier of the month
+    cached_tier = None
+    for tier in DST_TIERS:
+        if os.path.isfile(f"{cache_dir}/{yyyymm}.{tier}.txt"):
+            cached_tier = tier
+            break
+
+    # Final values never change
+    if cached_tier == DST_TIERS[0]:
+        with open(f"{cache_dir}/{yyyymm}.{cached_tier}.txt") as f:
+            return cached_tier, f.read()
+
+    for tier in DST_TIERS:
+        content_file = f"{cache_dir}/{yyyymm}.{tier}.txt"
+        meta_file = f"{cache_dir}/{yyyymm}.{tier}.json"
+
+        headers = {}
+        meta = {}
+        if tier == cached_tier:
+            with open(meta_file) as f:
+                meta = json.load(f)
+            if meta.get("ETag"):
+                headers["If-None-Match"] = meta["ETag"]
+            if meta.get("Last-Modified"):
+                headers["If-Modified-Since"] = meta["Last-Modified"]
+
+        try:
+            response = requests.get(dst_month_url(month, tier, base_url), headers=headers)
+        except requests.exceptions.RequestException as e:
+            print(f"|- fetch_dst_month: {str(e)}")
+            response = None
+
+        # Not (yet) published in this tier
+        if response is None or (response.status_code != 304 and not response.ok):
+            if tier == cached_tier:
+                break
+            continue
+
+        if response.status_code == 304:
+            print(f"|- {yyyymm} {tier}: not modified")
+            with open(content_file) as f:
+                return tier, f.read()
+
+        content = response.text
+        sha256 = hashlib.sha256(content.encode()).hexdigest()
+        if tier == cached_tier and sha256 == meta.get("SHA256"):
+            print(f"|- {yyyymm} {tier}: unchanged")
+        else:
+            print(f"|- {yyyymm} {tier}: fetched")
+            with open(content_file, 'w') as f:
+                f.write(content)
+
+        with open(meta_file, 'w') as f:
+            json.dump({
+                "ETag": response.headers.get("ETag"),
+                "Last-Modified": response.headers.get("Last-Modified"),
+                "SHA256": sha256,
+            }, f)
+
+        # Superseded lower tier copies
+        for lower_tier in DST_TIERS[DST_TIERS.index(tier)+1:]:
+            for suffix in ("txt", "json"):
+                if os.path.isfile(f"{cache_dir}/{yyyymm}.{lower_tier}.{suffix}"):
+                    os.remove(f"{cache_dir}/{yyyymm}.{lower_tier}.{suffix}")
+
+        return tier, content
+
+    # Network failure, fall back to the cached copy
+    if cached_tier is not None:
+        with open(f"{cache_dir}/{yyyymm}.{cached_tier}.txt") as f:
+            return cached_tier, f.read()
+
+    print(f"Warning: Failed to get {yyyymm}'s data")
+    return None
+
+
+def fetch_dst_index(
+    start_month: str,
+    end_month: str,
+    cache_dir: str,
+    base_url: str = WDC_URL,
+    max_workers: int = 8
+) -> dict[pd.Period, tuple[str, str]]:
+    '''Fetch the monthly Dst index files of a date range concurrently
+
+    Params
+    ------
+    start_month: str
+        First month (e.g., 2020-01)
+    end_month: str
+        Last month (e.g., 2025-03)
+    cache_dir: str
+        Cache directory
+    base_url: str, optional
+        WDC host
+    max_workers: int, optional
+        Concurrent requests (Default 8)
+
+    Returns
+    -------
+    dict[pd.Period, tuple[str, str]]: tier and text of each available month
+    '''
+
+    create_directories(cache_dir)
+    months = pd.period_range(start_month, end_month, freq='M')
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        results = executor.map(
+            lambda month: fetch_dst_month(month, cache_dir, base_url), months
+        )
+        return {
+            month: result
+            for month, result in zip(months, results)
+            if result is not None
+        }
+
+
+def dst_store_files(filename: str) -> tuple[str, str]:
+    '''Sidecar files of the Dst index store
+
+    Params
+    ------
+    filename: str
+        Dst index CSV file (e.g., artifacts/DST/Dst_index.csv)
+
+    Returns
+    -------
+    tuple[str, str]: data tier of each month, hour ranges changed by the updates
+    '''
+
+    base = os.path.splitext(filename)[0]
+    return f"{base}_tiers.csv", f"{base}_changes.csv"
+
+
+def dst_consumers_file(filename: str) -> str:
+    '''Sidecar file of the last update processed by each consumer of the
+    changed hour ranges (pending_dst_changes)
+
+    Params
+    ------
+    filename: str
+        Dst index CSV file (e.g., artifacts/DST/Dst_index.csv)
+
+    Returns
+    -------
+    str: CSV file of CONSUMER, UPDATE_ID
+    '''
+
+    return f"{os.path.splitext(filename)[0]}_consumers.csv"
 
-        for line in content:
-            # Extract Year, Month, Date
-            yy = line[3:5]
-            mm = line[5:7]
-            dd = line[8:10]
 
-            # Extract hourly value with timestamp
-            h = 0
-            for index in range(20, 116, 4):
-                date = pd.to_datetime(
-                    f"20{yy}-{mm}-{dd} {str(h).rjust(2, '0')}:00:00"
-                )
-                nT = int(line[index:index+4].strip())
+def read_dst_changes(filename: str) -> pd.DataFrame:
+    '''Changed hour ranges of all the updates still kept in the changes sidecar
 
-                h += 1
+    Params
+    ------
+    filename: str
+        Dst index CSV file
 
-                # Store the records
-                dst_index_records.append({
-                    DST.TIMESTAMP: date,
-                    DST.NANOTESLA: nT
-                })
+    Returns
+    -------
+    DataFrame of UPDATE_ID, STARTTIME, ENDTIME
+    '''
 
-    # create Dataframe
-    return pd.DataFrame.from_dict(dst_index_records)
+    _, changes_file = dst_store_files(filename)
+    if not os.path.isfile(changes_file):
+        return pd.DataFrame({
+            "UPDATE_ID": pd.Series(dtype='int64'),
+            DST.STARTTIME: pd.Series(dtype='datetime64[ns]'),
+            DST.ENDTIME: pd.Series(dtype='datetime64[ns]'),
+        })
+
+    df = pd.read_csv(changes_file)
+    # Ranges written before the update ids were kept
+    if "UPDATE_ID" not in df:
+        df.insert(0, "UPDATE_ID", 0)
+    df["UPDATE_ID"] = df["UPDATE_ID"].fillna(0).astype('int64')
+    df[DST.STARTTIME] = pd.to_datetime(df[DST.STARTTIME])
+    df[DST.ENDTIME] = pd.to_datetime(df[DST.ENDTIME])
+    return df
+
+
+def read_dst_watermarks(filename: str) -> dict[str, int]:
+    '''Last update processed by each consumer (dst_consumers_file)'''
+
+    consumers_file = dst_consumers_file(filename)
+    if not os.path.isfile(consumers_file):
+        return dict()
+    df = pd.read_csv(consumers_file)
+    return dict(zip(df["CONSUMER"], df["UPDATE_ID"].astype(int)))
+
+
+def pending_dst_changes(filename: str, consumer: str) -> pd.DataFrame:
+    '''Changed hour ranges a consumer has not processed yet
+
+    Params
+    ------
+    filename: str
+        Dst index CSV file
+    consumer: str
+        Name of the consumer (e.g., the timespan script)
+
+    Returns
+    -------
+    DataFrame of UPDATE_ID, STARTTIME, ENDTIME sorted by STARTTIME, all the
+    kept ranges for a consumer that never marked any (mark_dst_changes_processed)
+    '''
+
+    df = read_dst_changes(filename)
+    watermark = read_dst_watermarks(filename).get(consumer)
+    if watermark is not None:
+        df = df[df["UPDATE_ID"] > watermark]
+    return df.sort_values(DST.STARTTIME).reset_index(drop=True)
+
+
+def mark_dst_changes_processed(filename: str, consumer: str, df_changes: pd.DataFrame):
+    '''Record the changed hour ranges (pending_dst_changes) as processed by
+    a consumer, ranges processed by every known consumer are dropped
+
+    Params
+    ------
+    filename: str
+        Dst index CSV file
+    consumer: str
+        Name of the consumer
+    df_changes: pd.DataFrame
+        Ranges the consumer processed
+    '''
+
+    df = read_dst_changes(filename)
+    watermarks = read_dst_watermarks(filename)
+    if not df_changes.empty:
+        processed = int(df_changes["UPDATE_ID"].max())
+    elif consumer not in watermarks:
+        # First run of the consumer, extracted from the whole store
+        processed = int(df["UPDATE_ID"].max()) if len(df) else 0
+    else:
+        return
+
+    watermarks[consumer] = max(processed, watermarks.get(consumer, processed))
+    export_as_csv(
+        pd.DataFrame({"CONSUMER": list(watermarks), "UPDATE_ID": list(watermarks.values())}),
+        dst_consumers_file(filename)
+    )
+
+    kept = df[df["UPDATE_ID"] > min(watermarks.values())]
+    if len(kept) < len(df):
+        _, changes_file = dst_store_files(filename)
+        export_as_csv(kept, changes_file)
+
+
+def update_dst_store(filename: str, months: dict[pd.Period, tuple[str, str]]) -> pd.DataFrame:
+    '''Merge fetched monthly files into the Dst index CSV
+
+    The data tier and content hash of every stored month is kept in a sidecar
+    CSV. New months are appended, a month is replaced only when a better tier
+    (or new content of the same tier) is fetched; a lower tier than the stored
+    one is ignored. The hour ranges whose values changed are appended to a
+    second sidecar CSV with the id of the update, they are kept until every
+    consumer processed them (pending_dst_changes, mark_dst_changes_processed).
+
+    Params
+    ------
+    filename: str
+        Dst index CSV file
+    months: dict[pd.Period, tuple[str, str]]
+        Tier and text of each month (from fetch_dst_index)
+
+    Returns
+    -------
+    DataFrame of the hour ranges changed by this update (UPDATE_ID, STARTTIME, ENDTIME)
+    '''
+
+    tiers_file, changes_file = dst_store_files(filename)
+
+    tiers = dict()
+    if os.path.isfile(filename) and os.path.isfile(tiers_file):
+        tiers = {
+            record["MONTH"]: record
+            for record in pd.read_csv(tiers_file, dtype=str).to_dict(orient='records')
+        }
+
+    # Months with new or better data
+    updates = dict()
+    for month, (tier, content) in sorted(months.items()):
+        yyyymm = month.strftime('%Y-%m')
+        sha256 = hashlib.sha256(content.encode()).hexdigest()
+        stored = tiers.get(yyyymm)
+
+        if stored is not None:
+            if DST_TIERS.index(tier) > DST_TIERS.index(stored["TIER"]):
+                continue
+            if tier == stored["TIER"] and sha256 == stored["SHA256"]:
+                continue
+            if tier == stored["TIER"]:
+                print(f"|- {yyyymm}: {tier} (revised)")
+            else:
+                print(f"|- {yyyymm}: {stored['TIER']} -> {tier}")
+        else:
+            print(f"|- {yyyymm}: {tier} (new)")
+
+        updates[month] = content
+        tiers[yyyymm] = {"MONTH": yyyymm, "TIER": tier, "SHA256": sha256}
+
+    df_new = parse_dst_content(list(updates.values()))
+
+    if os.path.isfile(filename) and tiers:
+        df_store = read_dst_index_CSV(filename, abs_value=False)
+    else:
+        df_store = df_new.iloc[:0]
+
+    # Hourly values replaced by the update
+    replaced = df_store[DST.TIMESTAMP].dt.to_period('M').isin(list(updates))
+    df_diff = df_store[replaced].merge(
+        df_new, on=DST.TIMESTAMP, how='outer', suffixes=("_OLD", "")
+    )
+    changed_hours = df_diff.loc[
+        df_diff[f"{DST.NANOTESLA}_OLD"] != df_diff[DST.NANOTESLA], DST.TIMESTAMP
+    ].sort_values()
+
+    # Consecutive changed hours form one range
+    range_id = (changed_hours.diff() != pd.Timedelta(hours=1)).cumsum()
+    df_changes = changed_hours.groupby(range_id.values).agg(['min', 'max'])
+    df_changes.columns = [DST.STARTTIME, DST.ENDTIME]
+    df_changes = df_changes.reset_index(drop=True)
+
+    df_kept = read_dst_changes(filename)
+    watermarks = read_dst_watermarks(filename)
+    last_update = max([0, *df_kept["UPDATE_ID"].tolist(), *watermarks.values()])
+    df_changes.insert(0, "UPDATE_ID", last_update + 1)
+
+    if updates:
+        if not replaced.any() and (
+            df_store.empty or df_new[DST.TIMESTAMP].min() > df_store[DST.TIMESTAMP].max()
+        ):
+            # Only months after the stored ones, append
+            df_new.to_csv(
+                filename, mode='a', index=False,
+                header=not os.path.isfile(filename) or df_store.empty
+            )
+            print(f"|- Append {df_new.shape[0]} hours: {filename}")
+        else:
+            df_store = pd.concat([df_store[~replaced], df_new])
+            export_as_csv(df_store.sort_values(DST.TIMESTAMP), filename)
+
+    export_as_csv(pd.DataFrame.from_dict(list(tiers.values())), tiers_file)
+    # Append only, a run without changes keeps the pending ranges
+    if not df_changes.empty:
+        export_as_csv(pd.concat([df_kept, df_changes], ignore_index=True), changes_file)
+
+    return df_changes
+
+
+def update_timespan_between_nT_intensity(
+    df: pd.DataFrame,
+    df_timespan: pd.DataFrame,
+    df_changes: pd.DataFrame,
+    lb: int,
+    ub: int
+) -> pd.DataFrame:
+    '''Recompute only the windows affected by changed hours of the Dst index
+
+    Each changed hour range is widened to the closest out of bound hours on
+    both sides, where no window can be open, so extracting the windows of the
+    widened slice gives the same result as a full extraction.
+
+    Params
+    ------
+    df: pd.DataFrame
+        Dst index time series (updated)
+    df_timespan: pd.DataFrame
+        Windows extracted before the update
+    df_changes: pd.DataFrame
+        Changed hour ranges (from update_dst_store)
+    lb: int
+        Lower bound of intensity (absolute)
+    ub: int
+        Upper bound of intensity (absolute)
+
+    Returns
+    -------
+    DataFrame of time windows
+    '''
+
+    df_timespan = df_timespan[[DST.STARTTIME, DST.ENDTIME]]
+    if df_changes.empty or df.empty:
+        return df_timespan
+
+    df = df.sort_values(DST.TIMESTAMP).reset_index(drop=True)
+    timestamps = df[DST.TIMESTAMP].values
+    out_of_bound = np.flatnonzero(
+        ~df[DST.NANOTESLA].between(lb, ub).values
+    )
+
+    # Widened slices [first, last] of the time series
+    slices = []
+    for stime, etime in zip(df_changes[DST.STARTTIME], df_changes[DST.ENDTIME]):
+        first = np.searchsorted(timestamps, np.datetime64(stime), side='left')
+        last = np.searchsorted(timestamps, np.datetime64(etime), side='right') - 1
+
+        # Closest out of bound hours before and after the changed range
+        before = np.searchsorted(out_of_bound, first, side='left') - 1
+        first = out_of_bound[before] if before >= 0 else 0
+
+        after = np.searchsorted(out_of_bound, last, side='right')
+        last = out_of_bound[after] if after < out_of_bound.size else len(df) - 1
+
+        if slices and first <= slices[-1][1]:
+            slices[-1][1] = max(slices[-1][1], last)
+        else:
+            slices.append([first, last])
+
+    windows = []
+    for first, last in slices:
+        df_timespan = df_timespan[~df_timespan[DST.STARTTIME].between(
+            timestamps[first], timestamps[last]
+        )]
+        windows.append(
+            extract_timespan_between_nT_intensity(df.iloc[first:last+1], lb, ub)
+        )
+
+    print(f"|- Recomputed {len(slices)} slice(s)")
+    return pd.concat(
+        [df_timespan] + [window for window in windows if not window.empty]
+    ).sort_values(DST.STARTTIME).reset_index(drop=True)
@@ -1,11 +1,39 @@
 import csv
+import gzip
+import hashlib
 import json
 import os
 import shutil
+import time
+from typing import Iterable, Iterator
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import requests
 
+from cosmic_dance.space_track import SPACE_TRACK_URL
+
+# Raw TLE files, compressed (written) and legacy uncompressed
+RAW_TLE_SUFFIXES = (".json.gz", ".json")
+
+# Markers of space-track error responses (instead of TLEs)
+SPACE_TRACK_ERRORS = [
+    '"error":',
+    'rate limit',
+    'You\'ve violated',
+    'You\'ve exceeded'
+]
+
+# Largest pending (undecoded) JSON array element, in characters
+MAX_JSON_ELEMENT_SIZE = 1 << 24
+
+
+class TruncatedJSONArray(ValueError):
+    '''JSON array cut short, e.g., an interrupted or oversized response'''
+
 
 def create_directories(*directories: tuple[str]):
     '''Create directories
@@ -37,13 +65,118 @@ def recreate_directories(*directories: tuple[str]):
         os.makedirs(directory)
 
 
-def get_records_by_date(df: pd.DataFrame, column_name: str, date: pd.Timestamp) -> pd.DataFrame:
-    '''Query the rows by same dates from the Timestamp
+class DayIndex:
+    '''Day buckets of a Timestamp column: integer day numbers and the row
+    range of every day, built once so that the rows of a day (or of a range
+    of days) are a slice
+
+    Rows of a frame not sorted by the column are kept in a stable order by
+    day, the rows of a day stay in frame order. The index is a snapshot of
+    the frame: build it once for many queries and build a new one after
+    the frame is changed.
 
     Params
     ------
     df: pd.DataFrame
         Any DataFrame
+    column_name: str
+        Column with Timestamp (timezone-aware columns are bucketed by their
+        local date)
+    '''
+
+    def __init__(self, df: pd.DataFrame, column_name: str):
+        self.df = df
+        self.column_name = column_name
+
+        timestamps = df[column_name]
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps, format='mixed')
+        if timestamps.dt.tz is not None:
+            timestamps = timestamps.dt.tz_localize(None)
+
+        day = timestamps.to_numpy().astype('datetime64[D]').view(np.int64)
+        day = np.where(timestamps.isna().to_numpy(), np.iinfo(np.int64).max, day)
+
+        # Positions of the rows by day, None if the frame is already in day order
+        self.order = None
+        if len(day) and not (np.diff(day) >= 0).all():
+            self.order = np.argsort(day, kind='stable')
+            day = day[self.order]
+
+        self.days, starts = np.unique(day, return_index=True)
+        self.offsets = np.append(starts, len(day)).astype(np.int64)
+        self.rows = len(day)
+
+    def day_number(self, date: pd.Timestamp) -> int:
+        '''Day number (days since 1970-01-01) of the date'''
+
+        return int(np.datetime64(pd.Timestamp(date).tz_localize(None).date(), 'D').view(np.int64))
+
+    def positions(self, sdate: pd.Timestamp, edate: pd.Timestamp | None = None) -> slice | np.ndarray:
+        '''Positions of the rows from the day of `sdate` to the day of
+        `edate` (both included, Default the single day of `sdate`)
+
+        Params
+        ------
+        sdate: pd.Timestamp
+            First date
+        edate: pd.Timestamp | None, optional
+            Last date
+
+        Returns
+        -------
+        slice | np.ndarray: slice of the frame, positions if not in day order
+        '''
+
+        first = self.day_number(sdate)
+        last = first if edate is None else self.day_number(edate)
+
+        rows = slice(
+            int(self.offsets[np.searchsorted(self.days, first, side='left')]),
+            int(self.offsets[np.searchsorted(self.days, last, side='right')])
+        )
+        if rows.stop < rows.start:
+            rows = slice(rows.start, rows.start)
+        if self.order is None:
+            return rows
+        return self.order[rows]
+
+    def records(self, sdate: pd.Timestamp, edate: pd.Timestamp | None = None) -> pd.DataFrame:
+        '''Rows of the frame the index was built on, from the day of `sdate`
+        to the day of `edate` (both included, Default the single day)'''
+
+        return self.df.iloc[self.positions(sdate, edate)]
+
+
+def as_day_index(df: pd.DataFrame | DayIndex, column_name: str) -> DayIndex:
+    '''DayIndex of a Timestamp column, built for the call unless given
+
+    Params
+    ------
+    df: pd.DataFrame | DayIndex
+        Any DataFrame or a DayIndex of the column
+    column_name: str
+        Column with Timestamp
+
+    Returns
+    -------
+    DayIndex
+    '''
+
+    if isinstance(df, DayIndex):
+        if df.column_name != column_name:
+            raise ValueError(f"DayIndex of {df.column_name}, not of {column_name}")
+        return df
+    return DayIndex(df, column_name)
+
+
+def get_records_by_date(df: pd.DataFrame | DayIndex, column_name: str, date: pd.Timestamp) -> pd.DataFrame:
+    '''Query the rows by same dates from the Timestamp
+
+    Params
+    ------
+    df: pd.DataFrame | DayIndex
+        Any DataFrame, or the DayIndex of its column to query many dates
     column_name: str
         Column with Timestamp
     date: pd.Timestamp
@@ -54,9 +187,29 @@ def get_records_by_date(df: pd.DataFrame, column_name: str, date: pd.Timestamp)
     DataFrame: rows with same date
     '''
 
-    return df[
-        df[column_name].dt.strftime('%Y-%m-%d') == date.strftime('%Y-%m-%d')
-    ]
+    return as_day_index(df, column_name).records(date)
+
+
+def get_records_between_dates(df: pd.DataFrame | DayIndex, column_name: str, sdate: pd.Timestamp, edate: pd.Timestamp) -> pd.DataFrame:
+    '''Query the rows from the date of `sdate` to the date of `edate` (both included)
+
+    Params
+    ------
+    df: pd.DataFrame | DayIndex
+        Any DataFrame, or the DayIndex of its column to query many dates
+    column_name: str
+        Column with Timestamp
+    sdate: pd.Timestamp
+        First date
+    edate: pd.Timestamp
+        Last date
+
+    Returns
+    -------
+    DataFrame: rows of the dates, grouped by date
+    '''
+
+    return as_day_index(df, column_name).records(sdate, edate)
 
 
 def remove_file(filename: str):
@@ -71,7 +224,7 @@ def remove_file(filename: str):
     os.remove(filename)
 
 
-def read_CSV(filename: str, remove_nan: bool = True) -> pd.DataFrame:
+def read_CSV(filename: str, remove_nan: bool = True, engine: str = "c", usecols: list[str] | None = None) -> pd.DataFrame:
     '''Read CSV file as Dataframe
 
     Params
@@ -80,13 +233,17 @@ def read_CSV(filename: str, remove_nan: bool = True) -> pd.DataFrame:
         Path to CSV file
     remove_nan: bool, optional
         Remove nan values
+    engine: str, optional
+        pandas CSV parser: c or pyarrow (Default c)
+    usecols: list[str] | None, optional
+        Only parse these columns (Default all)
 
     Returns
     -------
     pd.DataFrame
     '''
 
-    df = pd.read_csv(filename)
+    df = pd.read_csv(filename, engine=engine, usecols=usecols)
 
     if remove_nan:
         return df.dropna()
@@ -94,13 +251,15 @@ def read_CSV(filename: str, remove_nan: bool = True) -> pd.DataFrame:
         return df
 
 
-def get_file_names(directory_name: str) -> list[str]:
+def get_file_names(directory_name: str, suffix: str | tuple[str] | None = None) -> list[str]:
     '''Get the sorted list of filenames inside given directory
 
     Params
     ------
     directory_name: str
         Directory (path)
+    suffix: str | tuple[str] | None, optional
+        Only filenames ending with the suffix (or any of the suffixes)
 
     Returns
     -------
@@ -108,23 +267,70 @@ def get_file_names(directory_name: str) -> list[str]:
 
     '''
 
-    return sorted(os.listdir(directory_name))
+    file_names = os.listdir(directory_name)
+    if suffix is not None:
+        file_names = [name for name in file_names if name.endswith(suffix)]
+
+    return sorted(file_names)
+
+
+def open_text_file(filename: str):
+    '''Open a text file for reading, gzip compressed if the name ends with .gz
+
+    Params
+    ------
+    filename: str
+        File path
+
+    Returns
+    -------
+    Text file object
+    '''
+
+    if filename.endswith(".gz"):
+        return gzip.open(filename, 'rt', encoding="utf-8")
+    return open(filename)
+
+
+def raw_TLE_file(output_dir: str, NORAD_catalog_number: int) -> str:
+    '''Path of the raw TLE file of a satellite
+
+    The compressed file (NORAD_CAT_ID.json.gz) unless only a legacy
+    uncompressed file (NORAD_CAT_ID.json) exists.
+
+    Params
+    ------
+    output_dir: str
+        Raw TLE directory
+    NORAD_catalog_number: int
+        NORAD Catalog Number
+
+    Returns
+    -------
+    str: file path
+    '''
+
+    compressed = f"{output_dir}/{NORAD_catalog_number}.json.gz"
+    legacy = f"{output_dir}/{NORAD_catalog_number}.json"
+    if not os.path.exists(compressed) and os.path.exists(legacy):
+        return legacy
+    return compressed
 
 
 def read_JSON_file(filename: str) -> dict[str, int | float]:
-    '''Read JSON file
+    '''Read JSON file (plain or gzip compressed)
 
     Params
     ------
     filename: str
-        JSON file
+        JSON file (.json or .json.gz)
 
     Returns
     -------
     dict[str, int | float]: dictionary
     '''
 
-    with open(filename) as json_file:
+    with open_text_file(filename) as json_file:
         return json.loads(json_file.read())
 
 
@@ -150,13 +356,142 @@ def CSV_logger(data: dict[str, float | int], csv_file_path: str = "log.csv"):
         writer.writerow(data)
 
 
+class RecordWriter:
+    '''Buffered writer of dict records into a CSV or Parquet file
+
+    Keeps the file open and collects records in memory, they are written in
+    one batch once `flush_rows` records are held or `flush_seconds` passed
+    since the last write, and on close. Use as a context manager.
+
+    CSV files are appended to (header written only for a new file) like
+    CSV_logger, the columns are the header of an existing file or the keys of
+    the first record and missing keys are left empty. Parquet files are
+    (re)created with the schema of the first batch, each batch is a row group.
+
+    Params
+    ------
+    filename: str
+        Output file, Parquet if it ends with `.parquet`
+    flush_rows: int, optional
+        Records held before writing (Default 10000)
+    flush_seconds: float, optional
+        Seconds between writes (Default 5 seconds)
+    '''
+
+    def __init__(self, filename: str, flush_rows: int = 10000, flush_seconds: float = 5.0):
+        self.filename = filename
+        self.parquet = filename.endswith(".parquet")
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+
+        self.records: list[dict] = []
+        self.written = 0
+        self.flushed = time.monotonic()
+
+        self.file = None
+        self.writer: csv.DictWriter | pq.ParquetWriter | None = None
+        if not self.parquet:
+            self.file = open(filename, 'a', newline='')
+
+    def __enter__(self) -> 'RecordWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, record: dict[str, float | int | str]):
+        '''Buffer a record, write the batch when a threshold is reached
+
+        Params
+        ------
+        record: dict[str, float | int | str]
+            Record (column, value pairs)
+        '''
+
+        self.records.append(record)
+        if (
+            len(self.records) >= self.flush_rows
+            or time.monotonic() - self.flushed >= self.flush_seconds
+        ):
+            self.flush()
+
+    def write_many(self, records: Iterable[dict[str, float | int | str]]):
+        '''Buffer records (see write)'''
+
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        '''Write the buffered records'''
+
+        self.flushed = time.monotonic()
+        if not self.records:
+            return
+
+        if self.parquet:
+            if self.writer is None:
+                table = pa.Table.from_pylist(self.records)
+                self.writer = pq.ParquetWriter(self.filename, table.schema)
+            else:
+                table = pa.Table.from_pylist(self.records, schema=self.writer.schema)
+            self.writer.write_table(table)
+
+        else:
+            if self.writer is None:
+                # Columns of an existing file, otherwise of the first record
+                fieldnames = list(self.records[0].keys())
+                if self.file.tell() > 0:
+                    with open(self.filename, newline='') as f:
+                        fieldnames = next(csv.reader(f), fieldnames)
+
+                self.writer = csv.DictWriter(self.file, fieldnames=fieldnames, restval="")
+                if self.file.tell() == 0:
+                    self.writer.writeheader()
+            self.writer.writerows(self.records)
+            self.file.flush()
+
+        self.written += len(self.records)
+        self.records = []
+
+    def close(self):
+        '''Write the buffered records and close the file'''
+
+        self.flush()
+        if self.parquet and self.writer is not None:
+            self.writer.close()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def space_track_epoch_range(start_date: str, end_date: str | None) -> str:
+    '''EPOCH predicate of a space-track query
+
+    Params
+    ------
+    start_date: str
+        TLE epoch start date (or datetime)
+    end_date: str | None
+        TLE epoch end date, None for open ended query (EPOCH > start_date)
+
+    Returns
+    -------
+    str: URL encoded predicate
+    '''
+
+    if end_date is None:
+        return f"%3E{start_date}"
+    return f"{start_date}--{end_date}"
+
+
 def fetch_from_space_track_API(
     session: requests.Session,
     NORAD_catalog_number: str,
     start_date: str,
-    end_date: str,
-    output_dir: str
-) -> bool:
+    end_date: str | None,
+    output_dir: str,
+    base_url: str = SPACE_TRACK_URL
+) -> dict[str, int | str] | None:
     '''Fetch TLEs in JSON format using curl command from space-track API
 
     Params
@@ -167,32 +502,424 @@ def fetch_from_space_track_API(
         NORAD Catalog Number of a satellite
     start_date: str
         TLE epoch start date
-    end_date: str
-        TLE epoch end date
+    end_date: str | None
+        TLE epoch end date, None for all TLEs after start_date
     output_dir: str
         Output directory
+    base_url: str, optional
+        space-track host (Default https://www.space-track.org)
+
+    The response is streamed into a gzip compressed file
+    (NORAD_CAT_ID.json.gz) which is moved into place once complete.
 
     Returns
     -------
-    bool:
-        Status
+    dict[str, int | str] | None:
+        Manifest attributes of the written file (see summarize_raw_TLEs),
+        None on failure
     '''
 
+    DATA_URL = f"{base_url}/basicspacedata/query/class/gp_history/NORAD_CAT_ID/{NORAD_catalog_number}/orderby/TLE_LINE1%20ASC/EPOCH/{space_track_epoch_range(start_date, end_date)}/format/json"
+
+    writer = None
     try:
-        DATA_URL = f"https://www.space-track.org/basicspacedata/query/class/gp_history/NORAD_CAT_ID/{NORAD_catalog_number}/orderby/TLE_LINE1%20ASC/EPOCH/{start_date}--{end_date}/format/json"
-        response = session.get(DATA_URL)
+        with session.get(DATA_URL, stream=True) as response:
+            if not response.ok:
+                return None
+
+            if response.encoding is None:
+                response.encoding = "utf-8"
+
+            # Write the chunks as received while decoding them for the manifest
+            writer = RawTLEWriter(f"{output_dir}/{NORAD_catalog_number}.json.gz")
+            for tle in iter_JSON_array(writer.tee(response.iter_content(1 << 16, decode_unicode=True))):
+                writer.observe(tle)
+
+    except ValueError as e:
+        # Invalid URL (requests raises ValueError subclasses) before the stream opened
+        if writer is None:
+            print(f"|- fetch_from_space_track_API: {str(e)}")
+            return None
+
+        # Not a TLE array (error message) or truncated
+        entry = writer.reject()
+        print(f"|- fetch_from_space_track_API: {entry['STATUS']} response")
+        return entry
 
     except Exception as e:
         print(f"|- fetch_from_space_track_API: {str(e)}")
+        if writer is not None:
+            writer.discard()
+        return None
 
-    finally:
-        if response.ok:
-            write_to_file(
-                response.text,
-                f"{output_dir}/{NORAD_catalog_number}.json"
-            )
-            return True
-        return False
+    entry = writer.close(complete_array=True)
+    print(f"|- Save file: {writer.filename}")
+    return entry
+
+
+def iter_JSON_array(chunks: Iterable[str]) -> Iterator[dict]:
+    '''Incrementally decode the objects of a JSON array from text chunks
+
+    Params
+    ------
+    chunks: Iterable[str]
+        Pieces of the JSON text, e.g., streamed HTTP response
+
+    Returns
+    -------
+    Iterator[dict]: array elements in order
+
+    Raises
+    ------
+    ValueError: content is not a JSON array or an element is malformed
+    TruncatedJSONArray: the array is truncated
+    '''
+
+    decoder = json.JSONDecoder()
+    buffer = ""
+    # Characters consumed before the buffer
+    offset = 0
+    started = False
+    closed = False
+
+    for chunk in chunks:
+        if closed:
+            break
+        buffer += chunk
+        pos = 0
+
+        while True:
+            # Skip whitespace and element separators
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buffer):
+                break
+
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError(f"Not a JSON array: {buffer[pos:pos+80]}")
+                started = True
+                pos += 1
+                continue
+
+            if buffer[pos] == ']':
+                closed = True
+                break
+
+            # Wait for more content if the element is incomplete, an error
+            # followed by a delimiter (outside a string) is a malformed one
+            try:
+                element, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if not e.msg.startswith("Unterminated string") and any(
+                    delimiter in buffer[e.pos:] for delimiter in ",]}"
+                ):
+                    raise ValueError(f"Malformed JSON array element at offset {offset + e.pos}: {e.msg}") from e
+                if len(buffer) - pos > MAX_JSON_ELEMENT_SIZE:
+                    raise ValueError(f"JSON array element at offset {offset + pos} exceeds {MAX_JSON_ELEMENT_SIZE} characters") from e
+                break
+            yield element
+
+        buffer = buffer[pos:]
+        offset += pos
+
+    if not closed:
+        raise TruncatedJSONArray("Truncated JSON array")
+
+
+def read_JSON_batches(filename: str, batch_size: int = 10000, chunk_size: int = 1 << 20) -> Iterator[list[dict]]:
+    '''Read a JSON array file (plain or gzip compressed) in record batches
+
+    The file is decoded incrementally (iter_JSON_array), memory stays bounded
+    by one text chunk and one batch regardless of the file size.
+
+    Params
+    ------
+    filename: str
+        JSON file (.json or .json.gz)
+    batch_size: int, optional
+        Records per batch (Default 10000)
+    chunk_size: int, optional
+        Characters read at a time (Default 1M)
+
+    Returns
+    -------
+    Iterator[list[dict]]: batches of array elements in order
+
+    Raises
+    ------
+    ValueError: content is not a JSON array or the array is truncated
+    '''
+
+    with open_text_file(filename) as json_file:
+        batch = []
+        for record in iter_JSON_array(iter(lambda: json_file.read(chunk_size), "")):
+            batch.append(record)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def fetch_bulk_from_space_track_API(
+    session: requests.Session,
+    NORAD_catalog_numbers: list[int],
+    start_date: str,
+    end_date: str | None,
+    output_dir: str,
+    base_url: str = SPACE_TRACK_URL
+) -> dict[int, dict[str, int | str]] | None:
+    '''Fetch TLEs of many satellites in one query and split the streamed
+    JSON array into one compressed file per satellite (NORAD_CAT_ID.json.gz)
+
+    Files are only written once the complete array has been received, a
+    truncated or failed response leaves the output directory untouched.
+
+    Params
+    ------
+    session: requests.Session
+        space-track session
+    NORAD_catalog_numbers: list[int]
+        NORAD Catalog Numbers of the satellites
+    start_date: str
+        TLE epoch start date
+    end_date: str | None
+        TLE epoch end date, None for all TLEs after start_date
+    output_dir: str
+        Output directory
+    base_url: str, optional
+        space-track host (Default https://www.space-track.org)
+
+    Returns
+    -------
+    dict[int, dict[str, int | str]] | None:
+        Manifest attributes of the written file of each satellite with TLEs,
+        None on failure (HTTP error, space-track error message)
+
+    Raises
+    ------
+    TruncatedJSONArray: the response was cut short, retry with fewer satellites
+    '''
+
+    id_list = ",".join(str(cat_id) for cat_id in sorted(NORAD_catalog_numbers))
+    DATA_URL = f"{base_url}/basicspacedata/query/class/gp_history/NORAD_CAT_ID/{id_list}/orderby/NORAD_CAT_ID%20ASC,TLE_LINE1%20ASC/EPOCH/{space_track_epoch_range(start_date, end_date)}/format/json"
+
+    writers: dict[int, RawTLEWriter] = dict()
+    try:
+        with session.get(DATA_URL, stream=True) as response:
+            if not response.ok:
+                print(f"|- fetch_bulk_from_space_track_API: HTTP {response.status_code}")
+                return None
+
+            if response.encoding is None:
+                response.encoding = "utf-8"
+
+            for record in iter_JSON_array(response.iter_content(1 << 16, decode_unicode=True)):
+                cat_id = int(record["NORAD_CAT_ID"])
+                writer = writers.get(cat_id)
+                if writer is None:
+                    writer = RawTLEWriter(f"{output_dir}/{cat_id}.json.gz")
+                    writers[cat_id] = writer
+                writer.write(record)
+
+    except (TruncatedJSONArray, requests.exceptions.ChunkedEncodingError) as e:
+        print(f"|- fetch_bulk_from_space_track_API: truncated response ({str(e)})")
+        for writer in writers.values():
+            writer.discard()
+        raise TruncatedJSONArray(str(e)) from e
+
+    except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+        print(f"|- fetch_bulk_from_space_track_API: {str(e)}")
+        for writer in writers.values():
+            writer.discard()
+        return None
+
+    entries: dict[int, dict[str, int | str]] = dict()
+    for cat_id in sorted(writers):
+        entries[cat_id] = writers[cat_id].close()
+        print(f"|- Save file: {writers[cat_id].filename}")
+
+    return entries
+
+
+def summarize_raw_TLEs(content: str) -> dict[str, int | str]:
+    '''Manifest attributes of a raw gp_history JSON text
+
+    Params
+    ------
+    content: str
+        JSON text as written to the file
+
+    Returns
+    -------
+    dict[str, int | str]:
+        STATUS (ok, empty, error, invalid), BYTES, SHA256 and for valid
+        content RECORDS, FIRST_EPOCH, LAST_EPOCH
+    '''
+
+    raw = content.encode()
+    entry = {
+        "STATUS": "ok",
+        "BYTES": len(raw),
+        "SHA256": hashlib.sha256(raw).hexdigest(),
+    }
+
+    if any(error_text in content for error_text in SPACE_TRACK_ERRORS):
+        entry["STATUS"] = "error"
+        return entry
+
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        entry["STATUS"] = "invalid"
+        return entry
+
+    if not isinstance(data, list):
+        entry["STATUS"] = "invalid"
+        return entry
+    if not data:
+        entry["STATUS"] = "empty"
+        return entry
+
+    epochs = [tle["EPOCH"] for tle in data]
+    entry["RECORDS"] = len(data)
+    entry["FIRST_EPOCH"] = min(epochs)
+    entry["LAST_EPOCH"] = max(epochs)
+    return entry
+
+
+class RawTLEWriter:
+    '''Write gp_history TLEs as a gzip compressed JSON array file and
+    collect the manifest attributes (see summarize_raw_TLEs) on the fly
+
+    Content is either written TLE by TLE (`write`) or passed through as
+    received (`tee`, with `observe` for each decoded TLE). It goes to a
+    temporary `.part` file which `close()` renames, replacing a legacy
+    uncompressed file of the satellite. BYTES is the compressed size and
+    SHA256 the digest of the uncompressed JSON text.
+
+    Params
+    ------
+    filename: str
+        Output file (.json.gz)
+    '''
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.file = gzip.open(f"{filename}.part", 'wt', encoding="utf-8")
+        self.sha256 = hashlib.sha256()
+        self.head = ""
+        self.records = 0
+        self.first_epoch: str | None = None
+        self.last_epoch: str | None = None
+
+    def write_text(self, text: str):
+        '''Append raw JSON text'''
+
+        self.sha256.update(text.encode())
+        if len(self.head) < 4096:
+            self.head += text[:4096]
+        self.file.write(text)
+
+    def tee(self, chunks: Iterable[str]) -> Iterator[str]:
+        '''Write the text chunks while passing them on'''
+
+        for chunk in chunks:
+            self.write_text(chunk)
+            yield chunk
+
+    def observe(self, tle: dict[str, str]):
+        '''Account a TLE of the written text'''
+
+        self.records += 1
+
+        epoch = tle["EPOCH"]
+        if self.first_epoch is None or epoch < self.first_epoch:
+            self.first_epoch = epoch
+        if self.last_epoch is None or epoch > self.last_epoch:
+            self.last_epoch = epoch
+
+    def write(self, tle: dict[str, str]):
+        '''Append a TLE to the array'''
+
+        self.write_text("[" if self.records == 0 else ",")
+        self.write_text(json.dumps(tle))
+        self.observe(tle)
+
+    def close(self, complete_array: bool = False) -> dict[str, int | str]:
+        '''Move the file into place
+
+        Params
+        ------
+        complete_array: bool, optional
+            Text was passed through (`tee`) and already is a complete array
+
+        Returns
+        -------
+        dict[str, int | str]: manifest attributes of the file
+        '''
+
+        if not complete_array:
+            self.write_text("]" if self.records else "[]")
+        self.file.close()
+
+        os.replace(f"{self.filename}.part", self.filename)
+        legacy = self.filename[:-len(".gz")]
+        if self.filename.endswith(".json.gz") and os.path.exists(legacy):
+            os.remove(legacy)
+
+        entry = {
+            "STATUS": "ok" if self.records else "empty",
+            "BYTES": os.path.getsize(self.filename),
+            "SHA256": self.sha256.hexdigest(),
+        }
+        if self.records:
+            entry["RECORDS"] = self.records
+            entry["FIRST_EPOCH"] = self.first_epoch
+            entry["LAST_EPOCH"] = self.last_epoch
+        return entry
+
+    def reject(self) -> dict[str, str]:
+        '''Drop the file of a response without TLEs
+
+        Returns
+        -------
+        dict[str, str]: STATUS error (space-track message) or invalid
+        '''
+
+        self.discard()
+        if any(error_text in self.head for error_text in SPACE_TRACK_ERRORS):
+            return {"STATUS": "error"}
+        return {"STATUS": "invalid"}
+
+    def discard(self):
+        '''Drop the incomplete file'''
+
+        self.file.close()
+        os.remove(f"{self.filename}.part")
+
+
+def write_raw_TLEs(tles: list[dict[str, str]], filename: str) -> dict[str, int | str]:
+    '''Write TLEs into a compressed raw file
+
+    Params
+    ------
+    tles: list[dict[str, str]]
+        gp_history TLEs
+    filename: str
+        Output file (.json.gz)
+
+    Returns
+    -------
+    dict[str, int | str]: manifest attributes of the file
+    '''
+
+    writer = RawTLEWriter(filename)
+    for tle in tles:
+        writer.write(tle)
+    print(f"|- Save file: {filename}")
+    return writer.close()
 
 
 def read_credentials(filename_list: list[str]) -> list[dict[str, str]]:
@@ -269,6 +996,26 @@ def write_to_file(content: str, filename: str):
     print(f"|- Save file: {filename}")
 
 
+def append_to_CSV(df: pd.DataFrame, filename: str):
+    '''Append a DataFrame to a CSV file in one write (Arrow CSV writer),
+    the header is written only for a new file. Values are not quoted.
+
+    Params
+    ------
+    df: pd.DataFrame
+        DataFrame
+    filename: str
+        Filename including path
+    '''
+
+    with open(filename, 'ab') as f:
+        pa_csv.write_csv(
+            pa.Table.from_pandas(df, preserve_index=False),
+            f,
+            pa_csv.WriteOptions(include_header=f.tell() == 0, quoting_style="none")
+        )
+
+
 def fetch_from_url(url):
     response = requests.get(url)
     if not response.ok:
@@ -0,0 +1,105 @@
+import json
+import os
+import threading
+
+# Manifest file name inside the raw TLE download directory
+MANIFEST_FILE = "manifest.jsonl"
+
+
+class DownloadManifest:
+    '''Per satellite record of the raw TLE downloads
+
+    Stored as JSON-lines next to the raw files, every update appends one line
+    and the last line of a NORAD Catalog Number wins. Thread-safe.
+
+    Entry attributes: STATUS (ok, empty, error, invalid, missing), BYTES,
+    SHA256, RECORDS, FIRST_EPOCH and LAST_EPOCH of the raw file.
+
+    Params
+    ------
+    directory: str
+        Raw TLE download directory
+    '''
+
+    def __init__(self, directory: str):
+        self.filename = f"{directory}/{MANIFEST_FILE}"
+        self.entries: dict[int, dict] = dict()
+        self.lock = threading.Lock()
+
+        if os.path.isfile(self.filename):
+            with open(self.filename) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn line of an interrupted run
+                        continue
+                    self.entries[int(entry["NORAD_CAT_ID"])] = entry
+
+    def get(self, cat_id: int) -> dict | None:
+        '''Manifest entry of a satellite
+
+        Params
+        ------
+        cat_id: int
+            NORAD Catalog Number
+
+        Returns
+        -------
+        dict | None: None if never recorded
+        '''
+
+        with self.lock:
+            return self.entries.get(int(cat_id))
+
+    def update(self, cat_id: int, **fields):
+        '''Merge fields into the entry of a satellite and persist it
+
+        Params
+        ------
+        cat_id: int
+            NORAD Catalog Number
+        fields: dict
+            Entry attributes, e.g., LAST_EPOCH
+        '''
+
+        with self.lock:
+            entry = {
+                **self.entries.get(int(cat_id), dict()),
+                **fields,
+                "NORAD_CAT_ID": int(cat_id)
+            }
+            self.entries[int(cat_id)] = entry
+
+            with open(self.filename, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def last_epoch(self, cat_id: int) -> str | None:
+        '''Newest TLE EPOCH held for a satellite
+
+        Params
+        ------
+        cat_id: int
+            NORAD Catalog Number
+
+        Returns
+        -------
+        str | None: EPOCH as in gp_history, None if unknown
+        '''
+
+        entry = self.get(cat_id)
+        if entry is None or entry.get("STATUS", "ok") != "ok":
+            return None
+        return entry.get("LAST_EPOCH")
+
+    def compact(self):
+        '''Rewrite the manifest with a single line per satellite'''
+
+        with self.lock:
+            with open(f"{self.filename}.tmp", 'w') as f:
+                for cat_id in sorted(self.entries):
+                    f.write(json.dumps(self.entries[cat_id]) + "\n")
+            os.replace(f"{self.filename}.tmp", self.filename)
@@ -1,4 +1,5 @@
 
+from cosmic_dance.baseline import *
 from cosmic_dance.dst_index import *
 from cosmic_dance.io import *
 from cosmic_dance.stats import percentile
@@ -7,13 +8,14 @@ from cosmic_dance.TLEs import *
 
 def track_satellite_altitude_change(
     out_filename: str,
-    tle_csv_filename: str,
+    tle_csv_filename: str | pd.DataFrame | StoreSatellite | TLEStore,
 
-    df_dst: pd.DataFrame,
+    df_dst: pd.DataFrame | DayIndex,
     event_date: pd.Timestamp,
     next_observation_days: int,
 
-    change_thershold: float = 5.0
+    change_thershold: float = 5.0,
+    baseline_days: float | None = BASELINE_FULL_HISTORY
 ):
     '''Capture abrupt altitude change over next few days immediately after a event date
 
@@ -21,27 +23,36 @@ def track_satellite_altitude_change(
     ------
     out_filename: str
         Output CSV file name
-    tle_csv_filename: str
-        Filename of TLE file (NORAD_CAT_ID.csv)
-    df_dst: pd.DataFrame
-        DataFrame of Dst indices
+    tle_csv_filename: str | pd.DataFrame | StoreSatellite | TLEStore
+        Filename of TLE file (NORAD_CAT_ID.csv), TLEs of the satellite,
+        reference into the column store or TLEStore of the satellite
+    df_dst: pd.DataFrame | DayIndex
+        DataFrame of Dst indices, or its DayIndex of TIMESTAMP to reuse
+        across calls
     event_date: pd.Timestamp
         Solar event Timestamp
     next_observation_days: int
         Obervation window from solar event date
     change_thershold: float, optional
         Altitude change thershold (Default 0.5 KM)
+    baseline_days: float | None, optional
+        Median altitude before the event over the TLEs of the trailing
+        window of this many days, or of the full history (Default None)
     '''
 
-    # Read all TLEs
-    df_tles = read_TLEs_in_CSV(tle_csv_filename)
+    # Read all TLEs (sorted by EPOCH for the as-of lookups)
+    df_tles = read_satellite_TLE_store(tle_csv_filename)
+    dst_days = as_day_index(df_dst, DST.TIMESTAMP)
 
     # Skip the satellite if already started decay (no TLE found before the date)
     last_tle = get_last_TLE_before_the_date(df_tles, event_date)
     if last_tle is None:
         return
 
-    median_altitude_before_event = get_median_altitude(df_tles, event_date)
+    if baseline_days is BASELINE_FULL_HISTORY:
+        median_altitude_before_event = get_median_altitude(df_tles, event_date)
+    else:
+        median_altitude_before_event = altitude_baseline(df_tles, baseline_days).median_at(event_date)
     altitude_change = abs(
         median_altitude_before_event-last_tle.get(TLE.ALTITUDE_KM)
     )
@@ -58,32 +69,30 @@ def track_satellite_altitude_change(
         f"|-- [{event_date.date()}] {last_tle.get(TLE.NORAD_CAT_ID)} Testing after effects..."
     )
 
-    # Record of the EVENT DATE
-    CSV_logger(
-        {
+    with RecordWriter(out_filename) as writer:
+
+        # Record of the EVENT DATE
+        writer.write({
             "CAT_ID": last_tle.get(TLE.NORAD_CAT_ID),
             "DAYS": 0,
             "EPOCH": last_tle.get(TLE.EPOCH),
             "MEDIAN_BEFORE": median_altitude_before_event,
             "ALTITUDE_CHANGE_KM": altitude_change,
             "nT": get_records_by_date(
-                df_dst, DST.TIMESTAMP, event_date
+                dst_days, DST.TIMESTAMP, event_date
             )[DST.NANOTESLA].max(),
-        },
-        out_filename
-    )
-
-    # Record of after effects in next few days from the EVENT DATE
-    # Timestamps of each date for next obervation window
-    for day_id in range(1, next_observation_days+1):
-        after_effect_date = event_date+pd.Timedelta(days=day_id)
-
-        # Get the first TLEs of the satellite after each next days
-        # And measure the altitude changes from the EVENT DATE
-        tle_after = get_first_TLE_after_the_date(df_tles, after_effect_date)
-        if tle_after is not None:
-            CSV_logger(
-                {
+        })
+
+        # Record of after effects in next few days from the EVENT DATE
+        # Timestamps of each date for next obervation window
+        for day_id in range(1, next_observation_days+1):
+            after_effect_date = event_date+pd.Timedelta(days=day_id)
+
+            # Get the first TLEs of the satellite after each next days
+            # And measure the altitude changes from the EVENT DATE
+            tle_after = get_first_TLE_after_the_date(df_tles, after_effect_date)
+            if tle_after is not None:
+                writer.write({
                     "CAT_ID": tle_after.get(TLE.NORAD_CAT_ID),
                     "DAYS": day_id,
                     "EPOCH": tle_after.get(TLE.EPOCH),
@@ -93,21 +102,113 @@ def track_satellite_altitude_change(
                         tle_after.get(TLE.ALTITUDE_KM)
                     ),
                     "nT": get_records_by_date(
-                        df_dst, DST.TIMESTAMP, after_effect_date
+                        dst_days, DST.TIMESTAMP, after_effect_date
                     )[DST.NANOTESLA].max(),
-                },
-                out_filename
+                })
+
+
+def track_constellation_altitude_change(
+    out_filename: str,
+    tles: TLEStore,
+
+    df_dst: pd.DataFrame | DayIndex,
+    event_date: pd.Timestamp,
+    next_observation_days: int,
+
+    change_thershold: float = 5.0,
+    baseline_days: float | None = BASELINE_FULL_HISTORY
+):
+    '''track_satellite_altitude_change() for every satellite of a TLEStore at once
+
+    The last TLE before the event and the first TLE after each of the next
+    days are looked up for all the satellites in one batched query
+    (TLEStore.asof), the records are written as the per satellite calls do.
+
+    Params
+    ------
+    out_filename: str
+        Output CSV file name
+    tles: TLEStore
+        TLEs of the constellation (e.g., TLEStore.from_column_store)
+    df_dst: pd.DataFrame | DayIndex
+        DataFrame of Dst indices, or its DayIndex of TIMESTAMP to reuse
+        across calls
+    event_date: pd.Timestamp
+        Solar event Timestamp
+    next_observation_days: int
+        Obervation window from solar event date
+    change_thershold: float, optional
+        Altitude change thershold (Default 0.5 KM)
+    baseline_days: float | None, optional
+        Median altitude before the event over the TLEs of the trailing
+        window of this many days, or of the full history (Default None)
+    '''
+
+    cat_ids = np.asarray(tles.catalog_numbers(), dtype=np.int64)
+    days = np.arange(next_observation_days+1)
+
+    # Day 0: last TLE before the event, day N: first TLE after event date + N days
+    df_asof = tles.asof(
+        np.repeat(cat_ids, len(days)),
+        np.tile(event_date+pd.to_timedelta(days, unit='D'), len(cat_ids)),
+        np.tile(np.where(days == 0, ASOF_BACKWARD, ASOF_FORWARD), len(cat_ids)),
+        [TLE.EPOCH, TLE.ALTITUDE_KM]
+    )
+    found = df_asof["FOUND"].to_numpy().reshape(len(cat_ids), len(days))
+    epochs = np.reshape(df_asof[TLE.EPOCH].tolist(), (len(cat_ids), len(days)))
+    altitudes = df_asof[TLE.ALTITUDE_KM].to_numpy().reshape(len(cat_ids), len(days))
+
+    # Median altitude before the event, computed once per store (altitude_baseline)
+    median_altitudes = altitude_baseline(tles, baseline_days).at(event_date, cat_ids)["MEDIAN"].to_numpy()
+
+    # Maximum Dst of each day, once for all the satellites
+    dst_days = as_day_index(df_dst, DST.TIMESTAMP)
+    nanotesla = [
+        get_records_by_date(dst_days, DST.TIMESTAMP, event_date+pd.Timedelta(days=int(day)))[DST.NANOTESLA].max()
+        for day in days
+    ]
+
+    with RecordWriter(out_filename) as writer:
+        for sat_id, cat_id in enumerate(cat_ids.tolist()):
+
+            # Skip the satellite if already started decay (no TLE found before the date)
+            if not found[sat_id, 0]:
+                continue
+
+            median_altitude_before_event = float(median_altitudes[sat_id])
+            altitude_change = abs(
+                median_altitude_before_event-altitudes[sat_id, 0]
             )
 
+            # Skip if already started decay
+            if altitude_change >= change_thershold:
+                print(f"|-- [{event_date.date()}] {cat_id} Natural decay.")
+                continue
+
+            print(f"|-- [{event_date.date()}] {cat_id} Testing after effects...")
+
+            for day_id in days[found[sat_id]].tolist():
+                writer.write({
+                    "CAT_ID": cat_id,
+                    "DAYS": day_id,
+                    "EPOCH": epochs[sat_id, day_id],
+                    "MEDIAN_BEFORE": median_altitude_before_event,
+                    "ALTITUDE_CHANGE_KM": abs(
+                        median_altitude_before_event-altitudes[sat_id, day_id]
+                    ),
+                    "nT": nanotesla[day_id],
+                })
+
 
 def maximum_altitude_difference(
     event_date: pd.Timestamp,
     observation_days: list[int],
 
-    tle_filename: str,
+    tle_filename: str | pd.DataFrame | StoreSatellite | TLEStore,
     out_filename: str,
 
-    change_thershold: float = 5.0
+    change_thershold: float = 5.0,
+    baseline_days: float | None = BASELINE_FULL_HISTORY
 ):
     '''Measure maximum altitude difference observed of a given satellite by next a few observation days
 
@@ -117,23 +218,30 @@ def maximum_altitude_difference(
         Timestamp of start date
     observation_days: list[int]
         Observation window length in days from start date
-    tle_filename: str
-        TLE CSV file name
+    tle_filename: str | pd.DataFrame | StoreSatellite | TLEStore
+        TLE CSV file name, TLEs of the satellite, reference into the
+        column store or TLEStore of the satellite
     out_filename: str
         Output CSV file name
     change_thershold: float, optional
         Altitude change thershold (Default 0.5 KM)
+    baseline_days: float | None, optional
+        Median altitude before the event over the TLEs of the trailing
+        window of this many days, or of the full history (Default None)
 
     '''
 
-    df_tle = read_TLEs_in_CSV(tle_filename)
+    df_tle = read_satellite_TLE_store(tle_filename)
     tle_before_dict = get_last_TLE_before_the_date(df_tle, event_date)
 
     # If not last TLE not found skip this satellite
     # If already altitude changed (way below median) a lot then skip this satellite
     if tle_before_dict is None:
         return
-    median_altitude_before_event = get_median_altitude(df_tle, event_date)
+    if baseline_days is BASELINE_FULL_HISTORY:
+        median_altitude_before_event = get_median_altitude(df_tle, event_date)
+    else:
+        median_altitude_before_event = altitude_baseline(df_tle, baseline_days).median_at(event_date)
     if math.isnan(median_altitude_before_event):
         return
     if abs(median_altitude_before_event-tle_before_dict.get(TLE.ALTITUDE_KM)) >= change_thershold:
@@ -156,6 +264,7 @@ def maximum_altitude_difference(
         # The satellite disappeared i.e, no TLEs after end_date
         if tle_after_dict is None:
             record[f"KM_after_DAY_{day_count}"] = 0
+            record[f"DRAG_after_DAY_{day_count}"] = 0
             print(
                 f"""|- {tle_before_dict.get(TLE.NORAD_CAT_ID)} Gone after {event_date}"""
             )
@@ -178,7 +287,48 @@ def maximum_altitude_difference(
         record[f"KM_after_DAY_{day_count}"] = absolute_altitude_change.max()
         record[f"DRAG_after_DAY_{day_count}"] = absolute_drag.max()
 
-    CSV_logger(record, out_filename)
+    with RecordWriter(out_filename) as writer:
+        writer.write(record)
+
+
+def maximum_altitude_differences(
+    event_dates: list[pd.Timestamp] | pd.Series,
+    observation_days: list[int],
+
+    tle_filename: str | pd.DataFrame | StoreSatellite | TLEStore,
+    out_filename: str,
+
+    change_thershold: float = 5.0,
+    baseline_days: float | None = BASELINE_FULL_HISTORY
+):
+    '''maximum_altitude_difference() of a satellite after every event date,
+    the TLEs are read into one TLEStore so its altitude baseline is computed
+    once for all the events
+
+    Params
+    ------
+    event_dates: list[pd.Timestamp] | pd.Series
+        Timestamps of start dates
+    observation_days: list[int]
+        Observation window length in days from start date
+    tle_filename: str | pd.DataFrame | StoreSatellite | TLEStore
+        TLE CSV file name, TLEs of the satellite, reference into the
+        column store or TLEStore of the satellite
+    out_filename: str
+        Output CSV file name
+    change_thershold: float, optional
+        Altitude change thershold (Default 0.5 KM)
+    baseline_days: float | None, optional
+        Median altitude before the event over the TLEs of the trailing
+        window of this many days, or of the full history (Default None)
+    '''
+
+    df_tle = read_satellite_TLE_store(tle_filename)
+    for event_date in event_dates:
+        maximum_altitude_difference(
+            event_date, observation_days, df_tle, out_filename,
+            change_thershold, baseline_days
+        )
 
 
 def generate_tracking_insight(
@@ -202,31 +352,28 @@ def generate_tracking_insight(
     '''
 
     unique_cat_ids = get_unique_cat_ids(df)
+    store = TLEStore(df[[TLE.NORAD_CAT_ID, TLE.EPOCH]])
 
     print(
         f'''|- [{query_date}] #TLEs: {len(df)} #Sats: {len(unique_cat_ids)}'''
     )
 
     # Total number of satellite tracked on that day (query_date)
-    CSV_logger(
-        {
+    with RecordWriter(sat_tracked_csv) as writer:
+        writer.write({
             "DAY": query_date,
             "TOTAL_TLE_UPDATE": len(df),
             "UNIQUE_SAT": len(unique_cat_ids)
-        },
-        sat_tracked_csv
-    )
+        })
 
     # Total number of TLEs per satellite on that day (query_date)
-    for cat_id in unique_cat_ids:
-        CSV_logger(
-            {
+    with RecordWriter(tle_per_sat_csv) as writer:
+        for cat_id in unique_cat_ids:
+            writer.write({
                 "DAY": query_date,
                 "NORAD_CAT_ID": cat_id,
-                "TOTAL_TLE": len(df[df[TLE.NORAD_CAT_ID] == cat_id])
-            },
-            tle_per_sat_csv
-        )
+                "TOTAL_TLE": store.count(cat_id)
+            })
 
 
 def generate_drag_insight(
@@ -260,26 +407,22 @@ def generate_drag_insight(
     )
 
     # Total positive and negative drag observations
-    CSV_logger(
-        {
+    with RecordWriter(drag_observation_csv) as writer:
+        writer.write({
             "DAY": query_date,
             "TOTAL_TLE": len(df),
             "POSITIVE_DRAG": len(df_positive),
             "NEGATIVE_DRAG": len(df_negative),
             "ZERO_DRAG": len(df_zero),
-        },
-        drag_observation_csv
-    )
+        })
 
     # Statistics of positive drag observations
-    CSV_logger(
-        {
+    with RecordWriter(positive_drag_stats_csv) as writer:
+        writer.write({
             "DAY": query_date,
             "MEDIAN": df_positive["DRAG"].median(),
             "MEAN": df_positive["DRAG"].mean(),
             "MAX": df_positive["DRAG"].max(),
             "MIN": df_positive["DRAG"].min(),
             "P95": percentile(df_positive[TLE.DRAG], 95),
-        },
-        positive_drag_stats_csv
-    )
+        })
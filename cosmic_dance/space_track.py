@@ -0,0 +1,255 @@
+import threading
+import time
+
+import requests
+
+SPACE_TRACK_URL = "https://www.space-track.org"
+
+# space-track API throttle: requests per minute per account
+SPACE_TRACK_RATE_LIMIT = 30
+
+
+class TokenBucket:
+    '''Token bucket rate limiter
+
+    Tokens refill continuously at `rate_per_minute` and at most `capacity`
+    tokens can be held, i.e., `capacity` is the largest allowed burst.
+    Thread-safe, one bucket is shared by all requests of a credential.
+
+    Params
+    ------
+    rate_per_minute: float, optional
+        Sustained request rate (Default 30 requests/minute)
+    capacity: int, optional
+        Maximum burst size (Default 1 request)
+    '''
+
+    def __init__(self, rate_per_minute: float = SPACE_TRACK_RATE_LIMIT, capacity: int = 1):
+        self.rate = rate_per_minute / 60
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        '''Block until a token is available and take it
+
+        Returns
+        -------
+        float: seconds spent waiting
+        '''
+
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+
+                delay = (1 - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+
+class RateLimitedSession(requests.Session):
+    '''requests.Session that takes a token from the limiter before every request
+
+    Params
+    ------
+    limiter: TokenBucket | None, optional
+        Rate limiter of the credential, no limit if None
+    '''
+
+    def __init__(self, limiter: TokenBucket | None = None):
+        super().__init__()
+        self.limiter = limiter
+
+    def request(self, *args, **kwargs) -> requests.Response:
+        if self.limiter is not None:
+            self.limiter.acquire()
+        return super().request(*args, **kwargs)
+
+
+class AuthenticatedSession(RateLimitedSession):
+    '''Rate limited session bound to a credential, logs in again on 401
+
+    Params
+    ------
+    credential: dict[str, str]
+        space-track identity and password
+    limiter: TokenBucket | None, optional
+        Rate limiter of the credential
+    base_url: str, optional
+        space-track host
+    pool: SessionPool | None, optional
+        Pool keeping the login counters
+    '''
+
+    def __init__(
+        self,
+        credential: dict[str, str],
+        limiter: TokenBucket | None = None,
+        base_url: str = SPACE_TRACK_URL,
+        pool: 'SessionPool | None' = None
+    ):
+        super().__init__(limiter)
+        self.credential = credential
+        self.login_url = f"{base_url}/ajaxauth/login"
+        self.pool = pool
+
+    def login(self) -> bool:
+        '''POST the credential to the login endpoint
+
+        Returns
+        -------
+        bool: True if logged in
+        '''
+
+        response = super().request(
+            "POST",
+            self.login_url,
+            data={
+                "identity": self.credential.get('identity'),
+                "password": self.credential.get('password')
+            }
+        )
+        if self.pool is not None:
+            self.pool.count("logins")
+        return response.ok
+
+    def request(self, method: str, url: str, *args, **kwargs) -> requests.Response:
+        response = super().request(method, url, *args, **kwargs)
+
+        # Cookie expired or session logged out, login again and retry once
+        if response.status_code == 401 and url != self.login_url:
+            response.close()
+            if self.pool is not None:
+                self.pool.count("reauths")
+            if self.login():
+                response = super().request(method, url, *args, **kwargs)
+
+        return response
+
+
+class SessionPool:
+    '''Keeps one authenticated keep-alive session per credential
+
+    Sessions are created (login) on first use and reused across satellites,
+    a session logs in again only when a query comes back with 401.
+
+    Params
+    ------
+    base_url: str, optional
+        space-track host
+    rate_per_minute: float, optional
+        Request rate limit of each credential
+    '''
+
+    def __init__(self, base_url: str = SPACE_TRACK_URL, rate_per_minute: float = SPACE_TRACK_RATE_LIMIT):
+        self.base_url = base_url
+        self.rate_per_minute = rate_per_minute
+        self.sessions: dict[str, AuthenticatedSession] = dict()
+        self.counters = {"logins": 0, "reuses": 0, "reauths": 0}
+        self.lock = threading.Lock()
+
+    def count(self, counter: str):
+        '''Increment one of the counters: logins, reuses, reauths'''
+
+        with self.lock:
+            self.counters[counter] += 1
+
+    def get(self, credential: dict[str, str]) -> AuthenticatedSession | None:
+        '''Authenticated session of the credential, login on first use
+
+        Params
+        ------
+        credential: dict[str, str]
+            space-track identity and password
+
+        Returns
+        -------
+        AuthenticatedSession | None: None if the login failed
+        '''
+
+        identity = credential.get('identity')
+
+        with self.lock:
+            session = self.sessions.get(identity)
+        if session is not None:
+            self.count("reuses")
+            return session
+
+        session = AuthenticatedSession(
+            credential,
+            TokenBucket(self.rate_per_minute),
+            self.base_url,
+            self
+        )
+        try:
+            if not session.login():
+                print(f"|- Session creation failed for {identity}")
+                session.close()
+                return None
+        except requests.exceptions.RequestException as e:
+            print(f"Session creation error: {str(e)}")
+            session.close()
+            return None
+
+        with self.lock:
+            self.sessions[identity] = session
+        return session
+
+    def close(self):
+        '''Close all the sessions'''
+
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def stats(self) -> dict[str, int]:
+        '''Counters of logins, reuses and re-authentications'''
+
+        with self.lock:
+            return dict(self.counters)
+
+
+class AdaptiveBatchSize:
+    '''Number of satellites per bulk query, halved on a failed or truncated
+    response and grown back additively after successful ones
+
+    Params
+    ------
+    maximum: int
+        Initial and largest batch size
+    minimum: int, optional
+        Smallest batch size (Default 1)
+    '''
+
+    def __init__(self, maximum: int, minimum: int = 1):
+        self.maximum = maximum
+        self.minimum = minimum
+        self.size = maximum
+        self.lock = threading.Lock()
+
+    def shrink(self) -> int:
+        '''Halve the batch size after a failure'''
+
+        with self.lock:
+            self.size = max(self.minimum, self.size // 2)
+            return self.size
+
+    def grow(self) -> int:
+        '''Increase the batch size by 10% of maximum after a success'''
+
+        with self.lock:
+            self.size = min(self.maximum, self.size + max(1, self.maximum // 10))
+            return self.size
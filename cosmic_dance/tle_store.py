@@ -0,0 +1,387 @@
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+
+from cosmic_dance.column_store import STORE_COLUMNS, STORE_LAUNCH_DATE, TLEColumnStore
+
+# Directions of the batched as-of queries (TLEStore.asof)
+ASOF_FORWARD = "forward"
+ASOF_BACKWARD = "backward"
+
+
+class TLERecord:
+    '''A TLE of a TLEStore, read on access instead of copied into a dict
+
+    Params
+    ------
+    store: TLEStore
+        Store holding the TLE
+    row: int
+        Row of the TLE in the store
+    '''
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store: "TLEStore", row: int):
+        self.store = store
+        self.row = row
+
+    def get(self, column: str, default=None):
+        '''Value of a column of the TLE
+
+        Params
+        ------
+        column: str
+            Column name
+        default: optional
+            Returned if the store has no such column (Default None)
+
+        Returns
+        -------
+        EPOCH and other datetime columns as pd.Timestamp, the rest as stored
+        '''
+
+        if column not in self.store.columns:
+            return default
+        value = self.store.columns[column][self.row]
+        if isinstance(value, np.datetime64):
+            return pd.Timestamp(value)
+        return value
+
+    def __getitem__(self, column: str):
+        if column not in self.store.columns:
+            raise KeyError(column)
+        return self.get(column)
+
+    def to_dict(self) -> dict:
+        '''All the columns of the TLE'''
+
+        return {column: self.get(column) for column in self.store.columns}
+
+    def __repr__(self) -> str:
+        return f"TLERecord({self.to_dict()})"
+
+
+class TLEStore:
+    '''TLEs held as column arrays sorted by NORAD Catalog Number and EPOCH,
+    with the row range of every satellite
+
+    As-of lookups (first_after, last_before) and windows (between) are binary
+    searches on the EPOCH of a satellite, whatever the row order of the frame
+    the store is built from (space-track output is ordered by TLE_LINE1).
+    Ties in EPOCH keep the frame order.
+
+    Params
+    ------
+    df: pd.DataFrame
+        TLEs with NORAD_CAT_ID and EPOCH (typed or strings)
+    '''
+
+    def __init__(self, df: pd.DataFrame):
+        epoch = df["EPOCH"]
+        if not pd.api.types.is_datetime64_any_dtype(epoch):
+            epoch = pd.to_datetime(epoch, format='mixed')
+        if epoch.dt.tz is not None:
+            epoch = epoch.dt.tz_convert('UTC').dt.tz_localize(None)
+        epoch = epoch.to_numpy(dtype='datetime64[ns]')
+
+        cat_id = df["NORAD_CAT_ID"].to_numpy(dtype=np.int64)
+        order = np.lexsort((epoch, cat_id))
+
+        self.columns: dict[str, np.ndarray] = {
+            column: (epoch if column == "EPOCH" else df[column].to_numpy())[order]
+            for column in df.columns
+        }
+        self.epoch = self.columns["EPOCH"].view(np.int64)
+        self.catalog, offsets = np.unique(cat_id[order], return_index=True)
+        self.offsets = np.append(offsets, len(order)).astype(np.int64)
+
+    @classmethod
+    def from_column_store(cls, column_store: TLEColumnStore, columns: list[str] | None = None) -> "TLEStore":
+        '''Store over the memory-mapped columns of a column store, already
+        sorted by NORAD Catalog Number and EPOCH (no sort, no copy)
+
+        Params
+        ------
+        column_store: TLEColumnStore
+            Opened column store (open_column_store)
+        columns: list[str] | None, optional
+            Columns to hold, NORAD_CAT_ID and EPOCH are always held (Default all)
+
+        Returns
+        -------
+        TLEStore
+        '''
+
+        if columns is None:
+            columns = [STORE_LAUNCH_DATE] + list(STORE_COLUMNS)
+        columns = ["NORAD_CAT_ID", "EPOCH"] + [
+            column for column in columns if column not in ("NORAD_CAT_ID", "EPOCH")
+        ]
+
+        store = cls.__new__(cls)
+        store.columns = dict()
+        for column in columns:
+            if column == STORE_LAUNCH_DATE:
+                store.columns[column] = np.repeat(
+                    column_store.launch_date, np.diff(column_store.offsets)
+                ).astype('datetime64[ns]')
+            elif column == "EPOCH":
+                store.columns[column] = column_store.columns[column].view('datetime64[ns]')
+            else:
+                store.columns[column] = column_store.columns[column]
+        store.epoch = column_store.columns["EPOCH"]
+        store.catalog = column_store.catalog
+        store.offsets = column_store.offsets
+        return store
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    def catalog_numbers(self) -> list[int]:
+        '''NORAD Catalog Numbers in the store (ascending)'''
+
+        return self.catalog.tolist()
+
+    def bounds(self, cat_id: int | None = None) -> tuple[int, int]:
+        '''Row range [start, end) of a satellite, empty if not in the store
+
+        Params
+        ------
+        cat_id: int | None, optional
+            NORAD Catalog Number, may be omitted if the store holds a single
+            satellite
+
+        Returns
+        -------
+        tuple[int, int]: start and end row
+        '''
+
+        if cat_id is None:
+            if len(self.catalog) > 1:
+                raise ValueError(
+                    f"TLEs of {len(self.catalog)} satellites, pass the NORAD Catalog Number"
+                )
+            return 0, len(self)
+
+        index = np.searchsorted(self.catalog, cat_id)
+        if index == len(self.catalog) or self.catalog[index] != cat_id:
+            return 0, 0
+        return int(self.offsets[index]), int(self.offsets[index + 1])
+
+    def count(self, cat_id: int | None = None) -> int:
+        '''Number of TLEs of a satellite'''
+
+        start, end = self.bounds(cat_id)
+        return end - start
+
+    def search(self, date: pd.Timestamp, cat_id: int | None = None, side: str = 'left') -> int:
+        '''Row where `date` would be inserted in the EPOCHs of a satellite
+
+        Params
+        ------
+        date: pd.Timestamp
+            Query date
+        cat_id: int | None, optional
+            NORAD Catalog Number
+        side: str, optional
+            'left' (first EPOCH >= date) or 'right' (first EPOCH > date)
+
+        Returns
+        -------
+        int: row in the store
+        '''
+
+        start, end = self.bounds(cat_id)
+        value = pd.Timestamp(date).as_unit('ns').value
+        return start + int(np.searchsorted(self.epoch[start:end], value, side=side))
+
+    def first_after(self, date: pd.Timestamp, cat_id: int | None = None) -> TLERecord | None:
+        '''Immediate first TLE after the date (EPOCH > date)
+
+        Params
+        ------
+        date: pd.Timestamp
+            Query date
+        cat_id: int | None, optional
+            NORAD Catalog Number
+
+        Returns
+        -------
+        TLERecord | None: None if there is no TLE after the date
+        '''
+
+        row = self.search(date, cat_id, side='right')
+        if row < self.bounds(cat_id)[1]:
+            return TLERecord(self, row)
+        return None
+
+    def last_before(self, date: pd.Timestamp, cat_id: int | None = None) -> TLERecord | None:
+        '''Immediate last TLE before the date (EPOCH < date)
+
+        Params
+        ------
+        date: pd.Timestamp
+            Query date
+        cat_id: int | None, optional
+            NORAD Catalog Number
+
+        Returns
+        -------
+        TLERecord | None: None if there is no TLE before the date
+        '''
+
+        row = self.search(date, cat_id, side='left')
+        if row > self.bounds(cat_id)[0]:
+            return TLERecord(self, row - 1)
+        return None
+
+    def rows_between(self, sdate: pd.Timestamp, edate: pd.Timestamp, cat_id: int | None = None) -> slice:
+        '''Rows of the TLEs of a satellite with sdate <= EPOCH <= edate'''
+
+        return slice(
+            self.search(sdate, cat_id, side='left'),
+            self.search(edate, cat_id, side='right')
+        )
+
+    def between(self, sdate: pd.Timestamp, edate: pd.Timestamp, cat_id: int | None = None) -> pd.DataFrame | None:
+        '''TLEs of a satellite within the time window (both dates included)
+
+        Params
+        ------
+        sdate: pd.Timestamp
+            Start date
+        edate: pd.Timestamp
+            End date
+        cat_id: int | None, optional
+            NORAD Catalog Number
+
+        Returns
+        -------
+        pd.DataFrame | None: TLEs sorted by EPOCH, None if there is none
+        '''
+
+        rows = self.rows_between(sdate, edate, cat_id)
+        if rows.stop <= rows.start:
+            return None
+        return pd.DataFrame({column: values[rows] for column, values in self.columns.items()})
+
+    def values(self, column: str, cat_id: int | None = None, end_date: pd.Timestamp | None = None) -> np.ndarray:
+        '''Values of a column of a satellite sorted by EPOCH, only the TLEs
+        before `end_date` if given (no copy)'''
+
+        start, end = self.bounds(cat_id)
+        if end_date is not None:
+            end = self.search(end_date, cat_id, side='left')
+        return self.columns[column][start:end]
+
+    def median_altitude(self, end_date: pd.Timestamp | None = None, cat_id: int | None = None) -> float:
+        '''Median altitude of a satellite from the TLEs before the date (NaN if none)'''
+
+        altitude = self.values("ALTITUDE_KM", cat_id, end_date).astype(np.float64)
+        altitude = altitude[~np.isnan(altitude)]
+        if len(altitude) == 0:
+            return np.nan
+        return float(np.median(altitude))
+
+    def asof_rows(
+        self,
+        cat_ids: np.ndarray | list[int],
+        dates: pd.Timestamp | np.ndarray | pd.Series | list[pd.Timestamp],
+        direction: str | np.ndarray | list[str] = ASOF_FORWARD
+    ) -> np.ndarray:
+        '''Rows of the batched as-of lookups (asof), -1 where no TLE is found
+
+        Params
+        ------
+        cat_ids: np.ndarray | list[int]
+            NORAD Catalog Number of every query
+        dates: pd.Timestamp | np.ndarray | pd.Series | list[pd.Timestamp]
+            Date of every query, or one date for all
+        direction: str | np.ndarray | list[str], optional
+            ASOF_FORWARD or ASOF_BACKWARD, of every query or one for all (Default forward)
+
+        Returns
+        -------
+        np.ndarray: row in the store of every query
+        '''
+
+        cat_ids = np.asarray(cat_ids, dtype=np.int64)
+        query_epoch = np.broadcast_to(
+            pd.to_datetime(np.atleast_1d(np.asarray(dates))).as_unit('ns').to_numpy(), cat_ids.shape
+        ).view(np.int64)
+        direction = np.broadcast_to(np.asarray(direction), cat_ids.shape)
+        if not np.isin(direction, [ASOF_FORWARD, ASOF_BACKWARD]).all():
+            raise ValueError(f"direction must be '{ASOF_FORWARD}' or '{ASOF_BACKWARD}'")
+        forward = direction == ASOF_FORWARD
+
+        index = np.searchsorted(self.catalog, cat_ids)
+        known = index < len(self.catalog)
+        known[known] = self.catalog[index[known]] == cat_ids[known]
+
+        # Queries of a satellite together, one search per satellite
+        rows = np.full(len(cat_ids), -1, dtype=np.int64)
+        order = np.flatnonzero(known)
+        order = order[np.argsort(index[order], kind='stable')]
+        groups, group_starts = np.unique(index[order], return_index=True)
+
+        for group, queries in zip(groups, np.split(order, group_starts[1:])):
+            start, end = int(self.offsets[group]), int(self.offsets[group + 1])
+            epochs = self.epoch[start:end]
+
+            row = np.where(
+                forward[queries],
+                np.searchsorted(epochs, query_epoch[queries], side='right'),
+                np.searchsorted(epochs, query_epoch[queries], side='left') - 1
+            )
+            rows[queries] = np.where((row >= 0) & (row < end - start), start + row, -1)
+
+        return rows
+
+    def asof(
+        self,
+        cat_ids: np.ndarray | list[int],
+        dates: pd.Timestamp | np.ndarray | pd.Series | list[pd.Timestamp],
+        direction: str | np.ndarray | list[str] = ASOF_FORWARD,
+        columns: list[str] | None = None
+    ) -> pd.DataFrame:
+        '''Batched as-of lookups, one per (NORAD Catalog Number, date) pair
+
+        The queries are grouped by satellite and resolved with one binary
+        search per satellite. Forward finds the first TLE after the date
+        (EPOCH > date, first_after), backward the last TLE before the date
+        (EPOCH < date, last_before), exact matches are not taken.
+
+        Params
+        ------
+        cat_ids: np.ndarray | list[int]
+            NORAD Catalog Number of every query
+        dates: pd.Timestamp | np.ndarray | pd.Series | list[pd.Timestamp]
+            Date of every query, or one date for all
+        direction: str | np.ndarray | list[str], optional
+            ASOF_FORWARD or ASOF_BACKWARD, of every query or one for all (Default forward)
+        columns: list[str] | None, optional
+            Columns of the TLEs to return (Default all)
+
+        Returns
+        -------
+        pd.DataFrame: one row per query in the query order, NORAD_CAT_ID,
+        QUERY_DATE, FOUND and the TLE columns (NaN/NaT if not found)
+        '''
+
+        rows = self.asof_rows(cat_ids, dates, direction)
+        cat_ids = np.asarray(cat_ids, dtype=np.int64)
+        dates = np.broadcast_to(
+            pd.to_datetime(np.atleast_1d(np.asarray(dates))).as_unit('ns').to_numpy(), cat_ids.shape
+        )
+
+        result = {
+            "NORAD_CAT_ID": cat_ids,
+            "QUERY_DATE": dates,
+            "FOUND": rows >= 0,
+        }
+        for column in (self.columns if columns is None else columns):
+            if column != "NORAD_CAT_ID":
+                result[column] = take(np.asarray(self.columns[column]), rows, allow_fill=True)
+
+        return pd.DataFrame(result)
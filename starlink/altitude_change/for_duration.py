@@ -4,7 +4,7 @@ import concurrent.futures
 
 from cosmic_dance.dst_index import *
 from cosmic_dance.io import *
-from cosmic_dance.measurement import maximum_altitude_difference
+from cosmic_dance.measurement import maximum_altitude_differences
 from cosmic_dance.TLEs import *
 
 PARALLEL_MODE = False
@@ -29,11 +29,17 @@ DST_TIMESPAN = "artifacts/OUTPUT/Starlink/timespans/percentile/merged_above_ptil
 
 ONSERVATION_DAYS = [1, 5, 10]
 
+# Median altitude before the event: None (full history) or trailing window in days
+BASELINE_DAYS = None
+
 
 df_timespan = read_timespan_CSV(DST_TIMESPAN)
 
 # df_timespan = df_timespan[df_timespan[DST.DURATION_HOURS] < 9]
 df_timespan = df_timespan[df_timespan[DST.DURATION_HOURS] > 9]
+EVENT_DATES = df_timespan[DST.STARTTIME].tolist()
+
+TLE_FILES = get_file_names(TLE_CSV_DIR)
 
 
 # ------------------------------------------------------------------
@@ -46,37 +52,36 @@ input(f"{OUTPUT_CSV} is empty ?")
 if PARALLEL_MODE:
     with concurrent.futures.ProcessPoolExecutor() as executor:
 
-        for id, event_date in enumerate(df_timespan[DST.STARTTIME]):
-            print(
-                f"|- [{id+1}/{len(df_timespan)}]  Starting from {event_date}..."
-            )
-
-            for filename in get_file_names(TLE_CSV_DIR):
+        # One task per satellite for all the events (TLEs read once)
+        for filename in TLE_FILES:
 
-                executor.submit(
-                    maximum_altitude_difference,
-                    event_date,
-                    ONSERVATION_DAYS,
-                    f"{TLE_CSV_DIR}/{filename}",
-                    OUTPUT_CSV
-                )
+            executor.submit(
+                maximum_altitude_differences,
+                EVENT_DATES,
+                ONSERVATION_DAYS,
+                f"{TLE_CSV_DIR}/{filename}",
+                OUTPUT_CSV,
+                baseline_days=BASELINE_DAYS
+            )
 
         executor.shutdown()
 
 # Serial mode
 else:
 
-    for id, event_date in enumerate(df_timespan[DST.STARTTIME]):
+    print(f"| - {len(EVENT_DATES)} event(s)...  ")
+
+    for id, filename in enumerate(TLE_FILES):
         print(
-            f"| - [{id+1}/{len(df_timespan)}]  Starting from {event_date}...  "
+            f"| - [{id+1}/{len(TLE_FILES)}]  Satellite {filename}...  "
         )
 
-        for filename in get_file_names(TLE_CSV_DIR):
-            maximum_altitude_difference(
-                event_date,
-                ONSERVATION_DAYS,
-                f"{TLE_CSV_DIR}/{filename}",
-                OUTPUT_CSV
-            )
+        maximum_altitude_differences(
+            EVENT_DATES,
+            ONSERVATION_DAYS,
+            f"{TLE_CSV_DIR}/{filename}",
+            OUTPUT_CSV,
+            baseline_days=BASELINE_DAYS
+        )
 
 print('|\n|- Complete.')
@@ -4,7 +4,7 @@ import concurrent.futures
 
 from cosmic_dance.dst_index import *
 from cosmic_dance.io import *
-from cosmic_dance.measurement import maximum_altitude_difference
+from cosmic_dance.measurement import maximum_altitude_differences
 from cosmic_dance.TLEs import *
 
 PARALLEL_MODE = False
@@ -28,6 +28,8 @@ OUTPUT_CSV = f"{OUTPUT_DIR}/event_day_after_1_5_10.csv"
 
 # TLEs
 TLE_CSV_DIR = "artifacts/OUTPUT/Starlink/TLEs"
+TLE_DATASET_DIR = "artifacts/OUTPUT/TLE_dataset"
+TLE_STORE_DIR = "artifacts/OUTPUT/Starlink/TLE_store"
 
 # Dst index
 # DST_TIMESPAN = "artifacts/OUTPUT/Starlink/timespans/quiet_day/merged_below_ptile_80.csv"
@@ -36,6 +38,9 @@ DST_TIMESPAN = "artifacts/OUTPUT/Starlink/timespans/percentile/merged_above_ptil
 
 ONSERVATION_DAYS = [1, 5, 10]
 
+# Median altitude before the event: None (full history) or trailing window in days
+BASELINE_DAYS = None
+
 # ------------------------------------------------------------------
 
 create_directories(OUTPUT_DIR)
@@ -45,41 +50,45 @@ input(f" OUTPUT FILE: ({OUTPUT_CSV}) is empty ?")
 
 
 df_timespan = read_timespan_CSV(DST_TIMESPAN)
+EVENT_DATES = df_timespan[DST.STARTTIME].tolist()
+
+# Memory-mapped TLE store, rewritten only if its source files changed
+build_TLE_column_store(TLE_CSV_DIR, TLE_DATASET_DIR, "Starlink", TLE_STORE_DIR)
+SATELLITES = open_column_store(TLE_STORE_DIR).satellites()
 
 if PARALLEL_MODE:
     with concurrent.futures.ProcessPoolExecutor() as executor:
 
-        for id, event_date in enumerate(df_timespan[DST.STARTTIME]):
-            print(
-                f"|- [{id+1}/{len(df_timespan)}]  Starting from {event_date}..."
-            )
+        # One task per satellite for all the events (TLEs read once)
+        for satellite in SATELLITES:
 
-            for filename in get_file_names(TLE_CSV_DIR):
-
-                executor.submit(
-                    maximum_altitude_difference,
-                    event_date,
-                    ONSERVATION_DAYS,
-                    f"{TLE_CSV_DIR}/{filename}",
-                    OUTPUT_CSV
-                )
+            executor.submit(
+                maximum_altitude_differences,
+                EVENT_DATES,
+                ONSERVATION_DAYS,
+                satellite,
+                OUTPUT_CSV,
+                baseline_days=BASELINE_DAYS
+            )
 
         executor.shutdown()
 
 # Serial mode
 else:
 
-    for id, event_date in enumerate(df_timespan[DST.STARTTIME]):
+    print(f"| - {len(EVENT_DATES)} event(s)...  ")
+
+    for id, satellite in enumerate(SATELLITES):
         print(
-            f"| - [{id+1}/{len(df_timespan)}]  Starting from {event_date}...  "
+            f"| - [{id+1}/{len(SATELLITES)}]  Satellite {satellite.NORAD_catalog_number}...  "
         )
 
-        for filename in get_file_names(TLE_CSV_DIR):
-            maximum_altitude_difference(
-                event_date,
-                ONSERVATION_DAYS,
-                f"{TLE_CSV_DIR}/{filename}",
-                OUTPUT_CSV
-            )
+        maximum_altitude_differences(
+            EVENT_DATES,
+            ONSERVATION_DAYS,
+            satellite,
+            OUTPUT_CSV,
+            baseline_days=BASELINE_DAYS
+        )
 
 print('|\n|- Complete.')
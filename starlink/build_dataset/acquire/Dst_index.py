@@ -2,10 +2,12 @@
 Auto fetch all the Dst index values from the Geomagnetic Equatorial Dst index Home Page: 
 https://wdc.kugi.kyoto-u.ac.jp/dstdir/index.html
 
-- Fetch the raw text from the URLs
+- Fetch the raw text of each month (best available data tier, cached on disk)
 - Parse WDC-like format
 - Create a DataFrame of hourly values (nT)
-- Export to a CSV file
+- Merge new months and better data tiers into the CSV file, the data tier of
+  each month and the changed hour ranges are saved next to it (appended,
+  kept until every timespan script processed them)
 '''
 
 from cosmic_dance.dst_index import *
@@ -17,93 +19,27 @@ from cosmic_dance.io import *
 
 OUTPUT_FILE = "artifacts/DST/Dst_index.csv"
 
+# Data tier of each month and hour ranges changed by the runs (kept until processed)
+TIERS_FILE, CHANGES_FILE = dst_store_files(OUTPUT_FILE)
+
 # ------------------------------------------------------------------
 # INPUT FILE(s)
 # ------------------------------------------------------------------
 
-# URLs for Jan 2024 - March 2025
-urls = [
-
-    # Year 2020
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_final/202001/dst2001.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_final/202002/dst2002.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_final/202003/dst2003.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_final/202004/dst2004.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_final/202005/dst2005.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_final/202006/dst2006.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_final/202007/dst2007.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_final/202008/dst2008.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_final/202009/dst2009.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_final/202010/dst2010.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_final/202011/dst2011.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_final/202012/dst2012.for.request",
-
-    # Year 2021
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202101/dst2101.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202102/dst2102.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202103/dst2103.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202104/dst2104.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202105/dst2105.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202106/dst2106.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202107/dst2107.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202108/dst2108.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202109/dst2109.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202110/dst2110.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202111/dst2111.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202112/dst2112.for.request",
-
-    # Year 2022
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202201/dst2201.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202202/dst2202.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202203/dst2203.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202204/dst2204.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202205/dst2205.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202206/dst2206.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202207/dst2207.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202208/dst2208.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202209/dst2209.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202210/dst2210.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202211/dst2211.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202212/dst2212.for.request",
-
-    # Year 2023
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202301/dst2301.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202302/dst2302.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202303/dst2303.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202304/dst2304.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202305/dst2305.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202306/dst2306.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202307/dst2307.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202308/dst2308.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202309/dst2309.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202310/dst2310.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202311/dst2311.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202312/dst2312.for.request",
-
-    # Year 2024 (Provisional & Realtime)
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202401/dst2401.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202402/dst2402.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202403/dst2403.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202404/dst2404.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202405/dst2405.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_provisional/202406/dst2406.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_realtime/202407/dst2407.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_realtime/202408/dst2408.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_realtime/202409/dst2409.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_realtime/202410/dst2410.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_realtime/202411/dst2411.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_realtime/202412/dst2412.for.request",
+# Months of Dst index, the data tier (final, provisional, realtime) of
+# each month is picked automatically
+START_MONTH = "2020-01"
+END_MONTH = "2025-03"
 
-    # Year 2025 (Realtime)
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_realtime/202501/dst2501.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_realtime/202502/dst2502.for.request",
-    "https://wdc.kugi.kyoto-u.ac.jp/dst_realtime/202503/dst2503.for.request",
-]
+# HTTP cache of the monthly files, unchanged months are not fetched again
+CACHE_DIR = "artifacts/OUTPUT/DST_cache"
 
 # ------------------------------------------------------------------
 
 input(f"Confirm output file ({OUTPUT_FILE})? ")
 
-# Parse the dataset and save into CSV
-df_dst_index = parse_dst_index(urls)
-export_as_csv(df_dst_index, OUTPUT_FILE)
+# Fetch the monthly files concurrently, parse and merge into CSV
+months = fetch_dst_index(START_MONTH, END_MONTH, CACHE_DIR)
+create_directories(os.path.dirname(OUTPUT_FILE))
+df_changes = update_dst_store(OUTPUT_FILE, months)
+print(f"Changed hour ranges: {df_changes.shape[0]}")
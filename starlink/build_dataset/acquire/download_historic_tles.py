@@ -1,7 +1,9 @@
 '''
 Fetch all TLEs (from START_DATE to END_DATE) from https://www.space-track.org API by a satellite NORAD Catalog Number
-- Requests are distributed across multiple credentials
-- Each credential respects a 2-second delay between requests (max 30 requests/minute)
+- Requests are distributed concurrently across multiple credentials (one worker lane per credential)
+- Each credential is held at max 30 requests/minute by its own token bucket
+- Satellites are fetched in bulk queries (BATCH_SIZE) and split into per satellite files
+- DELTA_MODE only fetches TLEs newer than the last download and appends them to the JSON and CSV files (and the Parquet dataset)
 - Saves JSON files into the specified directory
 '''
 
@@ -17,6 +19,11 @@ from cosmic_dance.TLEs import *
 
 TLE_DOWNLOAD_DIR = "artifacts/OUTPUT/Starlink/RAW_TLEs_2"
 
+# CSV files and Parquet dataset updated in DELTA_MODE
+TLE_CSV_DIR = "artifacts/OUTPUT/Starlink/TLEs"
+TLE_DATASET_DIR = "artifacts/OUTPUT/TLE_dataset"
+CONSTELLATION = "Starlink"
+
 # ------------------------------------------------------------------
 # INPUT FILE(s)
 # ------------------------------------------------------------------
@@ -33,59 +40,16 @@ CREDENTIALS = [
     "credentials/credentials_2.json"
 ]
 
-# ------------------------------------------------------------------
+# Satellites per gp_history query (1: one query per satellite)
+BATCH_SIZE = 100
+
+# Only fetch TLEs published after the newest EPOCH held (daily refresh)
+DELTA_MODE = False
 
-def find_missing_satellites(catalog_numbers: list[int], output_dir: str) -> list[int]:
-    """Find satellites that:
-    1. Don't have JSON files
-    2. Have empty JSON files
-    3. Have JSON files containing error messages
-    """
-    missing = []
-    for sat_num in catalog_numbers:
-        json_file = f"{output_dir}/{sat_num}.json"
-        
-        # Check if file exists
-        if not os.path.exists(json_file):
-            print(f"File missing for satellite {sat_num}")
-            missing.append(sat_num)
-            continue
-            
-        # Check if file is empty
-        if os.path.getsize(json_file) == 0:
-            print(f"Empty file for satellite {sat_num}")
-            missing.append(sat_num)
-            continue
-            
-        # Check file contents for errors
-        try:
-            with open(json_file, 'r') as f:
-                content = f.read()
-                # Check for various error indicators
-                if any(error_text in content for error_text in [
-                    '"error":', 
-                    'You\'ve exceeded', 
-                    'rate limit'
-                ]):
-                    print(f"Error in file for satellite {sat_num}")
-                    missing.append(sat_num)
-                    continue
-                
-                # Also check if it's valid JSON and has actual data
-                data = json.loads(content)
-                if not data or (isinstance(data, list) and len(data) == 0):
-                    print(f"Empty JSON data for satellite {sat_num}")
-                    missing.append(sat_num)
-                    continue
-                    
-        except json.JSONDecodeError:
-            print(f"Invalid JSON for satellite {sat_num}")
-            missing.append(sat_num)
-        except Exception as e:
-            print(f"Error checking satellite {sat_num}: {str(e)}")
-            missing.append(sat_num)
-            
-    return missing
+# Re-parse every raw file (in parallel) instead of trusting the manifest
+DEEP_VERIFY = False
+
+# ------------------------------------------------------------------
 
 # Confirm directory and create if needed
 input(f"Confirm download directory ({TLE_DOWNLOAD_DIR})? ")
@@ -98,8 +62,11 @@ catalog_numbers = read_catalog_number_list(
     in_order=True
 )
 
-# Find missing satellites
-missing_numbers = find_missing_satellites(catalog_numbers, TLE_DOWNLOAD_DIR)
+# Find missing satellites (manifest lookup)
+if DEEP_VERIFY:
+    missing_numbers = verify_raw_files(catalog_numbers, TLE_DOWNLOAD_DIR)
+else:
+    missing_numbers = find_missing_satellites(catalog_numbers, TLE_DOWNLOAD_DIR)
 
 if missing_numbers:
     print(f"\nFound {len(missing_numbers)} satellites needing download:")
@@ -121,7 +88,25 @@ if missing_numbers:
         credentials,
         START_DATE,
         END_DATE,
-        TLE_DOWNLOAD_DIR
+        TLE_DOWNLOAD_DIR,
+        batch_size=BATCH_SIZE
     )
 else:
-    print("No missing satellites found! All files exist.")
\ No newline at end of file
+    print("No missing satellites found! All files exist.")
+
+if DELTA_MODE:
+    missing = set(missing_numbers)
+    existing_numbers = [cat_num for cat_num in catalog_numbers if cat_num not in missing]
+
+    input(f"Press Enter to fetch new TLEs of {len(existing_numbers)} satellites...")
+
+    download_TLE_updates(
+        existing_numbers,
+        credentials,
+        START_DATE,
+        TLE_DOWNLOAD_DIR,
+        TLE_CSV_DIR,
+        batch_size=BATCH_SIZE,
+        dataset_dir=TLE_DATASET_DIR,
+        constellation=CONSTELLATION
+    )
\ No newline at end of file
@@ -9,6 +9,10 @@ G4 (Severe)
 G5 (Extreme)
 
 Source: https://www.swpc.noaa.gov/noaa-scales-explanation
+
+When the windows were extracted before, only the windows around the hour
+ranges changed by the Dst index updates not yet processed by this script are
+recomputed.
 '''
 
 
@@ -32,6 +36,9 @@ OUTPUT_SUPER_FILE = f"{OUTPUT_DIR}/EXTREME.csv"
 
 DST_CSV = "artifacts/DST/Dst_index.csv"
 
+# Name under which the processed Dst index updates are recorded
+CONSUMER = "timespan_NOAA"
+
 
 MILD_LB = 50
 MILD_UB = 100
@@ -51,11 +58,20 @@ create_directories(OUTPUT_DIR)
 
 # Create the time windows of different scale
 df_dst = read_dst_index_CSV(DST_CSV)
+df_changes = pending_dst_changes(DST_CSV, CONSUMER)
+
 for lb, ub, filename in [
     (MILD_LB, MILD_UB, OUTPUT_MILD_FILE),
     (MODERERATE_LB, MODERERATE_UB, OUTPUT_MODERERATE_FILE),
     (SEVERE_LB, SEVERE_UB, OUTPUT_INTENSE_FILE),
     (EXTREME_LB, EXTREME_UB, OUTPUT_SUPER_FILE),
 ]:
-    df = extract_timespan_between_nT_intensity(df_dst, lb, ub)
+    if os.path.isfile(filename):
+        df = update_timespan_between_nT_intensity(
+            df_dst, read_timespan_CSV(filename), df_changes, lb, ub
+        )
+    else:
+        df = extract_timespan_between_nT_intensity(df_dst, lb, ub)
     export_as_csv(df, filename)
+
+mark_dst_changes_processed(DST_CSV, CONSUMER, df_changes)
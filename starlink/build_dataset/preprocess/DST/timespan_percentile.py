@@ -3,9 +3,15 @@
 - Above X %tile
 - Merging two duration closer then Y days
 
+The percentiles depend on the whole time series, the windows are recomputed
+in full whenever a Dst index update not yet processed by this script changed
+any hour.
+
 '''
 
 
+import sys
+
 from cosmic_dance.dst_index import *
 from cosmic_dance.io import *
 from cosmic_dance.stats import *
@@ -33,11 +39,20 @@ MERGED_DST_TIMESPAN_PTILE_99 = f"{OUTPUT_DIR}/merged_above_ptile_99.csv"
 
 DST_CSV = "artifacts/DST/Dst_index.csv"
 
+# Name under which the processed Dst index updates are recorded
+CONSUMER = "timespan_percentile"
+
 # ------------------------------------------------------------------
 
 
 create_directories(OUTPUT_DIR)
 
+# Nothing changed since the windows were extracted
+df_changes = pending_dst_changes(DST_CSV, CONSUMER)
+if df_changes.empty and os.path.isfile(MERGED_DST_TIMESPAN_PTILE_99):
+    mark_dst_changes_processed(DST_CSV, CONSUMER, df_changes)
+    print("Dst index unchanged, skipping")
+    sys.exit()
 
 # Above 80, 95, 99 %tile
 df_dst = read_dst_index_CSV(DST_CSV)
@@ -61,4 +76,6 @@ for unmerged_fname, merged_fname in [
 ]:
     df = read_timespan_CSV(unmerged_fname)
     df = merge_window(df, 10)
-    export_as_csv(df, merged_fname)
\ No newline at end of file
+    export_as_csv(df, merged_fname)
+
+mark_dst_changes_processed(DST_CSV, CONSUMER, df_changes)
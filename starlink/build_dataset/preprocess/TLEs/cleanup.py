@@ -24,8 +24,7 @@ def clean_up(filename: str) -> None:
         remove_file(filename)
         return
 
-    # For consistent date and time formating
-    df[TLE.EPOCH] = pd.to_datetime(df[TLE.EPOCH])
+    df[TLE.EPOCH] = parse_epochs(df[TLE.EPOCH])
 
     # Removing file with satellite age below 30 days
     if satellite_age_in_days(df) < 30:
@@ -38,7 +37,8 @@ def clean_up(filename: str) -> None:
     if len(_df) < len(df):
         print(f"|- Invalid TLEs: {filename}: {len(df)-len(_df)}")
 
-    export_as_csv(_df, filename)
+    # For consistent date and time formating
+    write_TLEs_to_CSV(_df, filename)
 
 
 if __name__ == "__main__":
@@ -51,6 +51,9 @@ if __name__ == "__main__":
 
     TLE_CSV_DIR = "artifacts/OUTPUT/Starlink/TLEs"
 
+    # Parquet TLE dataset (partitioned by constellation and epoch year)
+    DATASET_DIR = "artifacts/OUTPUT/TLE_dataset"
+
     # ------------------------------------------------------------------
     # INPUT FILE(s)
     # ------------------------------------------------------------------
@@ -82,4 +85,7 @@ if __name__ == "__main__":
 
             clean_up(file_path)
 
+    # Rebuild the dataset from the altered CSV files
+    build_TLE_dataset(TLE_CSV_DIR, DATASET_DIR, "Starlink")
+
     print(f'|\n|- Complete.')
@@ -32,7 +32,7 @@ def strip_orbit_raise_maneuver(filename: str, orbit_raise_df: pd.DataFrame):
         maneuver_complete_date = row.iloc[-1]["ORBIT_RAISE_COMEPLETE"]
 
         df_TLE = df_TLE[df_TLE[TLE.EPOCH] > maneuver_complete_date]
-        export_as_csv(df_TLE, filename)
+        write_TLEs_to_CSV(df_TLE, filename)
 
         print(f'|- UPDATED:{launch_date} > {filename}')
 
@@ -53,6 +53,9 @@ if __name__ == "__main__":
 
     TLE_CSV_DIR = "artifacts/OUTPUT/Starlink/TLEs"
 
+    # Parquet TLE dataset (partitioned by constellation and epoch year)
+    DATASET_DIR = "artifacts/OUTPUT/TLE_dataset"
+
     # ------------------------------------------------------------------
     # INPUT FILE(s)
     # ------------------------------------------------------------------
@@ -92,4 +95,7 @@ if __name__ == "__main__":
         for sat_TLEs_in_CSV in list_of_sat_TLEs_in_CSV:
             strip_orbit_raise_maneuver(sat_TLEs_in_CSV, orbit_raise_df)
 
+    # Rebuild the dataset from the altered CSV files
+    build_TLE_dataset(TLE_CSV_DIR, DATASET_DIR, "Starlink")
+
     print('|\n|- Comeplete.')
@@ -8,7 +8,7 @@ import concurrent.futures
 
 from cosmic_dance.dst_index import *
 from cosmic_dance.io import *
-from cosmic_dance.measurement import track_satellite_altitude_change
+from cosmic_dance.measurement import track_constellation_altitude_change, track_satellite_altitude_change
 from cosmic_dance.TLEs import *
 
 PARALLEL_MODE = False
@@ -36,19 +36,29 @@ EVENT_DATES_CSV = "artifacts/OUTPUT/Starlink/timespans/quiet_day/below_ptile_80.
 
 # TLEs and DST files
 TLE_CSV_DIR = "artifacts/OUTPUT/Starlink/TLEs"
+TLE_DATASET_DIR = "artifacts/OUTPUT/TLE_dataset"
+TLE_STORE_DIR = "artifacts/OUTPUT/Starlink/TLE_store"
 DST_CSV = "artifacts/DST/Dst_index.csv"
 
 # DAYS = 15
 DAYS = 15
 
+# Median altitude before the event: None (full history) or trailing window in days
+BASELINE_DAYS = None
+
 # ------------------------------------------------------------------
 
 
 recreate_directories(OUTPUT_DIR)
 
-# Read DST index and Get TLEs CSV file of each satellites and event dates
+# Memory-mapped TLE store, rewritten only if its source files changed
+build_TLE_column_store(TLE_CSV_DIR, TLE_DATASET_DIR, "Starlink", TLE_STORE_DIR)
+
+# Read DST index and Get TLEs of each satellites and event dates
+# Day index of the Dst timestamps, built once for all the events
 DF_DST = read_dst_index_CSV(DST_CSV)
-CAT_ID_CSVS = get_file_names(TLE_CSV_DIR)
+DST_DAYS = DayIndex(DF_DST, DST.TIMESTAMP)
+SATELLITES = open_column_store(TLE_STORE_DIR).satellites()
 EVENT_DATES = read_timespan_CSV(EVENT_DATES_CSV)[DST.STARTTIME]
 
 
@@ -59,31 +69,33 @@ if PARALLEL_MODE:
 
         for event_date in EVENT_DATES:
             print(f"|- Starting: {event_date.date()}")
-            for cat_id_csv in CAT_ID_CSVS:
+            for satellite in SATELLITES:
 
                 executor.submit(
                     track_satellite_altitude_change,
 
                     f"{OUTPUT_DIR}/{event_date.date()}.csv",
-                    f"{TLE_CSV_DIR}/{cat_id_csv}",
-                    DF_DST,
+                    satellite,
+                    DST_DAYS,
                     event_date,
-                    DAYS
+                    DAYS,
+                    baseline_days=BASELINE_DAYS
                 )
 
         executor.shutdown()
 
-# Serial mode
+# Serial mode: all the satellites of an event in one batched lookup
 else:
+    TLE_STORE = TLEStore.from_column_store(open_column_store(TLE_STORE_DIR))
+
     for event_date in EVENT_DATES:
-        for cat_id_csv in CAT_ID_CSVS:
-
-            track_satellite_altitude_change(
-                f"{OUTPUT_DIR}/{event_date.date()}.csv",
-                f"{TLE_CSV_DIR}/{cat_id_csv}",
-                DF_DST,
-                event_date,
-                DAYS
-            )
+        track_constellation_altitude_change(
+            f"{OUTPUT_DIR}/{event_date.date()}.csv",
+            TLE_STORE,
+            DST_DAYS,
+            event_date,
+            DAYS,
+            baseline_days=BASELINE_DAYS
+        )
 
 print('|\n|- Complete.')
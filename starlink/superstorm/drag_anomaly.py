@@ -27,6 +27,10 @@ POSITIVE_DRAG_OBSERVED_CSV = f"{OUTPUT_DIR}/positive_drag_observed.csv"
 # ------------------------------------------------------------------
 
 TLE_DIR_CSV = "artifacts/OUTPUT/Starlink/TLEs"
+TLE_DATASET_DIR = "artifacts/OUTPUT/TLE_dataset"
+
+# Merged TLE frames of earlier runs (without the dataset)
+TLE_CACHE_DIR = "artifacts/CACHE/TLEs"
 
 # Event start date and next observation days
 START_DATE = pd.to_datetime("2024-10-01 00:00:00")
@@ -36,7 +40,17 @@ UPTO_NEXT_DAYS = 30
 
 recreate_directories(OUTPUT_DIR)
 
-df_tles = get_merged_TLEs_from_all_CSVs(TLE_DIR_CSV)
+# Only the observation window is read
+df_tles = load_TLEs(
+    TLE_DIR_CSV, TLE_DATASET_DIR, "Starlink",
+    columns=[TLE.EPOCH, TLE.DRAG],
+    start=START_DATE,
+    end=START_DATE+pd.Timedelta(days=UPTO_NEXT_DAYS+1),
+    cache_dir=TLE_CACHE_DIR
+)
+
+# Day index of the EPOCHs, built once for all the query dates
+TLE_DAYS = DayIndex(df_tles, TLE.EPOCH)
 
 if PARALLEL_MODE:
     with concurrent.futures.ProcessPoolExecutor() as executor:
@@ -46,7 +60,7 @@ if PARALLEL_MODE:
 
             executor.submit(
                 generate_drag_insight,
-                get_records_by_date(df_tles, TLE.EPOCH, query_date),
+                get_records_by_date(TLE_DAYS, TLE.EPOCH, query_date),
                 query_date,
                 DRAG_OBSERVED_CSV,
                 POSITIVE_DRAG_OBSERVED_CSV
@@ -60,7 +74,7 @@ else:
         query_date = START_DATE+pd.Timedelta(days=i)
 
         generate_drag_insight(
-            get_records_by_date(df_tles, TLE.EPOCH, query_date),
+            get_records_by_date(TLE_DAYS, TLE.EPOCH, query_date),
             query_date,
             DRAG_OBSERVED_CSV,
             POSITIVE_DRAG_OBSERVED_CSV
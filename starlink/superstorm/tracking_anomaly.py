@@ -29,6 +29,10 @@ TLE_PER_SAT_CSV = f"{OUTPUT_DIR}/tle_per_sat.csv"
 
 # TLEs
 TLE_DIR_CSV = "artifacts/OUTPUT/Starlink/TLEs"
+TLE_DATASET_DIR = "artifacts/OUTPUT/TLE_dataset"
+
+# Merged TLE frames of earlier runs (without the dataset)
+TLE_CACHE_DIR = "artifacts/CACHE/TLEs"
 
 # Event start date and next observation days
 START_DATE = pd.to_datetime("2024-10-01 00:00:00")
@@ -40,7 +44,17 @@ UPTO_NEXT_DAYS = 30
 
 recreate_directories(OUTPUT_DIR)
 
-df_tles = get_merged_TLEs_from_all_CSVs(TLE_DIR_CSV)
+# Only the observation window is read
+df_tles = load_TLEs(
+    TLE_DIR_CSV, TLE_DATASET_DIR, "Starlink",
+    columns=[TLE.NORAD_CAT_ID, TLE.EPOCH],
+    start=START_DATE,
+    end=START_DATE+pd.Timedelta(days=UPTO_NEXT_DAYS+1),
+    cache_dir=TLE_CACHE_DIR
+)
+
+# Day index of the EPOCHs, built once for all the query dates
+TLE_DAYS = DayIndex(df_tles, TLE.EPOCH)
 
 if PARALLEL_MODE:
     with concurrent.futures.ProcessPoolExecutor() as executor:
@@ -50,7 +64,7 @@ if PARALLEL_MODE:
 
             executor.submit(
                 generate_tracking_insight,
-                get_records_by_date(df_tles, TLE.EPOCH, query_date),
+                get_records_by_date(TLE_DAYS, TLE.EPOCH, query_date),
                 query_date,
                 SAT_TRACKED_CSV,
                 TLE_PER_SAT_CSV
@@ -64,7 +78,7 @@ else:
         query_date = START_DATE+pd.Timedelta(days=i)
 
         generate_tracking_insight(
-            get_records_by_date(df_tles, TLE.EPOCH, query_date),
+            get_records_by_date(TLE_DAYS, TLE.EPOCH, query_date),
             query_date,
             SAT_TRACKED_CSV,
             TLE_PER_SAT_CSV